@@ -0,0 +1,94 @@
+# app/config.py
+import os
+
+# Spot search result cache (per process). Its size is counted in candidate spots, about 250 bytes each,
+# so the default holds up to ~25MB per process; encoded responses count one candidate per 250 bytes.
+SPOT_SEARCH_CACHE_CANDIDATES = int(os.getenv("SPOT_SEARCH_CACHE_CANDIDATES", "100000"))
+SPOT_SEARCH_CACHE_TTL = float(os.getenv("SPOT_SEARCH_CACHE_TTL", "60"))
+SPOT_SEARCH_CACHE_MAX_CANDIDATES = int(os.getenv("SPOT_SEARCH_CACHE_MAX_CANDIDATES", "2000"))  # Larger search areas query MongoDB directly
+
+# Map marker clustering (precomputed per zoom level)
+CLUSTER_MAX_ZOOM = int(os.getenv("CLUSTER_MAX_ZOOM", "16"))
+CLUSTER_CELLS_PER_TILE = int(os.getenv("CLUSTER_CELLS_PER_TILE", "4"))  # 64px cells on 256px tiles
+CLUSTER_MAX_CELLS_PER_REQUEST = int(os.getenv("CLUSTER_MAX_CELLS_PER_REQUEST", "20000"))
+
+# Vector tiles
+TILE_MAX_ZOOM = int(os.getenv("TILE_MAX_ZOOM", "22"))
+SPOT_TILE_MIN_ZOOM = int(os.getenv("SPOT_TILE_MIN_ZOOM", "10"))  # Lower zooms are served from clusters
+TILE_EXTENT = 4096
+TILE_BUFFER = 64  # In tile units, so edge markers are not clipped
+TILE_MAX_FEATURES = int(os.getenv("TILE_MAX_FEATURES", "5000"))
+TILE_CACHE_SIZE = int(os.getenv("TILE_CACHE_SIZE", "4096"))
+TILE_CACHE_TTL = float(os.getenv("TILE_CACHE_TTL", "300"))
+
+# Firebase ID token verification
+FIREBASE_CHECK_REVOKED = os.getenv("FIREBASE_CHECK_REVOKED", "false").lower() in ("1", "true", "yes")
+AUTH_TOKEN_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "10000"))
+AUTH_TOKEN_EXPIRY_LEEWAY = float(os.getenv("AUTH_TOKEN_EXPIRY_LEEWAY", "30"))  # Drop cached tokens this many seconds before exp
+AUTH_REVOCATION_CHECK_INTERVAL = float(os.getenv("AUTH_REVOCATION_CHECK_INTERVAL", "300"))  # Re-verify cached tokens when FIREBASE_CHECK_REVOKED is on
+
+# Thread pool for blocking Firebase Admin SDK calls
+FIREBASE_EXECUTOR_WORKERS = int(os.getenv("FIREBASE_EXECUTOR_WORKERS", "16"))
+FIREBASE_EXECUTOR_MAX_QUEUE = int(os.getenv("FIREBASE_EXECUTOR_MAX_QUEUE", "256"))  # Calls waiting for a worker before new ones get 503
+FIREBASE_CALL_TIMEOUT = float(os.getenv("FIREBASE_CALL_TIMEOUT", "10"))
+FIREBASE_UPLOAD_TIMEOUT = float(os.getenv("FIREBASE_UPLOAD_TIMEOUT", "60"))
+
+# Current user cache used by get_current_user (per process)
+USER_CACHE_SIZE = int(os.getenv("USER_CACHE_SIZE", "10000"))
+USER_CACHE_TTL = float(os.getenv("USER_CACHE_TTL", "30"))
+
+# Firebase UIDs allowed to use admin endpoints, in addition to tokens with the `admin` custom claim
+ADMIN_UIDS = {uid.strip() for uid in os.getenv("ADMIN_UIDS", "").split(",") if uid.strip()}
+
+# Delta sync (GET /v1/spots/changes)
+SPOT_SYNC_SETTLE_SECONDS = float(os.getenv("SPOT_SYNC_SETTLE_SECONDS", "5"))  # Changes younger than this wait for the next sync, so in-flight writes are not skipped
+SPOT_TOMBSTONE_RETENTION_DAYS = float(os.getenv("SPOT_TOMBSTONE_RETENTION_DAYS", "30"))  # Older watermarks must reload all spots
+
+# Bulk export
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "2000"))  # Documents per cursor batch and per output chunk
+
+# HTTP caching of public GETs (get_spot, get_review); clients and CDNs revalidate with ETags
+PUBLIC_CACHE_MAX_AGE = int(os.getenv("PUBLIC_CACHE_MAX_AGE", "30"))
+PUBLIC_CACHE_S_MAXAGE = int(os.getenv("PUBLIC_CACHE_S_MAXAGE", "60"))
+
+# Photo uploads
+MAX_PHOTO_BYTES = int(os.getenv("MAX_PHOTO_BYTES", str(25 * 1024 * 1024)))
+MAX_UPLOAD_REQUEST_BYTES = int(os.getenv("MAX_UPLOAD_REQUEST_BYTES", str(100 * 1024 * 1024)))  # Whole request body, checked while it streams in
+UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", str(1024 * 1024)))  # Resumable upload chunk; a multiple of 256 KiB
+PHOTO_UPLOAD_CONCURRENCY = int(os.getenv("PHOTO_UPLOAD_CONCURRENCY", "4"))  # Parallel uploads per multi-photo request
+STORAGE_DELETE_BATCH_SIZE = 100  # Files per batch delete request; the Cloud Storage batch API maximum
+PHOTO_DELETE_GRACE = float(os.getenv("PHOTO_DELETE_GRACE", "600"))  # Seconds an upload's claim keeps a photo from being deleted
+
+# Photo storage, content-addressed: identical photos are stored once
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "firebase")  # "firebase": Firebase Storage bucket, "local": LOCAL_STORAGE_DIR
+LOCAL_STORAGE_DIR = os.getenv("LOCAL_STORAGE_DIR", "storage")
+LOCAL_STORAGE_URL = os.getenv("LOCAL_STORAGE_URL", "http://localhost:8000/media")  # main.py serves LOCAL_STORAGE_DIR at this URL's path
+
+# Photo derivatives (thumbnail/medium/full WebP), rendered in a process pool
+IMAGE_WORKERS = int(os.getenv("IMAGE_WORKERS", "2"))
+PHOTO_THUMBNAIL_SIZE = int(os.getenv("PHOTO_THUMBNAIL_SIZE", "320"))  # Longest edge in pixels
+PHOTO_MEDIUM_SIZE = int(os.getenv("PHOTO_MEDIUM_SIZE", "1280"))
+PHOTO_FULL_MAX_SIZE = int(os.getenv("PHOTO_FULL_MAX_SIZE", "4096"))
+PHOTO_WEBP_QUALITY = int(os.getenv("PHOTO_WEBP_QUALITY", "80"))
+
+# Background jobs for post-write side effects. Jobs that change ratings drop the spot search and tile
+# caches only in the process that runs them. In mongo mode that is often another API replica or
+# scripts/run_job_worker.py, so the other processes keep serving the old ratings until their entries
+# expire (SPOT_SEARCH_CACHE_TTL, TILE_CACHE_TTL); lower those TTLs if that staleness matters.
+JOB_QUEUE_MODE = os.getenv("JOB_QUEUE_MODE", "memory")  # "memory": in-process asyncio queue, "mongo": durable jobs collection
+JOB_WORKER_CONCURRENCY = int(os.getenv("JOB_WORKER_CONCURRENCY", "4"))  # Jobs run at once per process; 0 only enqueues (mongo mode)
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "5"))
+JOB_RETRY_BASE_DELAY = float(os.getenv("JOB_RETRY_BASE_DELAY", "1"))  # Doubled after every failed attempt
+JOB_RETRY_MAX_DELAY = float(os.getenv("JOB_RETRY_MAX_DELAY", "300"))
+JOB_LEASE_SECONDS = float(os.getenv("JOB_LEASE_SECONDS", "120"))  # A claimed job not finished by then is run again
+JOB_POLL_INTERVAL = float(os.getenv("JOB_POLL_INTERVAL", "1"))  # Idle workers check the jobs collection this often
+JOB_RETENTION_HOURS = float(os.getenv("JOB_RETENTION_HOURS", "24"))  # Finished jobs, and their idempotency keys, are kept this long
+JOB_SHUTDOWN_TIMEOUT = float(os.getenv("JOB_SHUTDOWN_TIMEOUT", "10"))  # Time given to running and queued jobs on shutdown
+
+# Cleanup after a spot is deleted (reviews, photos, favorites)
+SPOT_PURGE_BATCH_SIZE = int(os.getenv("SPOT_PURGE_BATCH_SIZE", "500"))  # Reviews per delete batch
+
+# Bulk spot import (POST /v1/admin/spots/import, scripts/import_spots.py)
+SPOT_IMPORT_BATCH_SIZE = int(os.getenv("SPOT_IMPORT_BATCH_SIZE", "1000"))  # Rows per insert_many
+SPOT_IMPORT_DUPLICATE_RADIUS = float(os.getenv("SPOT_IMPORT_DUPLICATE_RADIUS", "25"))  # Rows this close (meters) to an existing spot are skipped
+SPOT_IMPORT_MAX_REPORTED_ROWS = int(os.getenv("SPOT_IMPORT_MAX_REPORTED_ROWS", "1000"))  # Failed and skipped rows listed in the report
@@ -1,11 +1,11 @@
 # app/dependencies/__init__.py
-from .auth import get_current_user, verify_token, upload_file_to_firebase
+from .auth import get_current_user, get_admin_user, verify_token
 from .database import get_database, connect_to_mongodb, close_mongodb_connection
 
 __all__ = [
     'get_current_user',
+    'get_admin_user',
     'verify_token', 
-    'upload_file_to_firebase',
     'get_database',
     'connect_to_mongodb',
     'close_mongodb_connection'
@@ -1,46 +1,140 @@
 # app/dependencies/auth.py
+import asyncio
+import hashlib
+import time
 from fastapi import Depends, HTTPException, Request
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from firebase_admin import auth
 from datetime import datetime
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from app.config import (
+    FIREBASE_CHECK_REVOKED, AUTH_TOKEN_CACHE_SIZE, AUTH_TOKEN_EXPIRY_LEEWAY, AUTH_REVOCATION_CHECK_INTERVAL,
+    USER_CACHE_SIZE, USER_CACHE_TTL, ADMIN_UIDS
+)
 from app.models.user import User
-from app.utils.firebase import verify_firebase_token, get_firebase_user, upload_file_to_storage
+from app.utils.firebase import verify_firebase_token, run_firebase_call
+from app.utils.helpers.cache import TTLCache
+from app.utils.metrics import metrics
 
 # Security utilities
 security = HTTPBearer()
 
+# Verified token claims keyed by a hash of the token, each entry expiring with the token
+_token_cache = TTLCache(AUTH_TOKEN_CACHE_SIZE, AUTH_REVOCATION_CHECK_INTERVAL)
+metrics.register_gauge("auth_token_cache", _token_cache.stats)
+
+# Raw user documents keyed by firebase_uid, shared across requests for a short TTL
+_user_cache = TTLCache(USER_CACHE_SIZE, USER_CACHE_TTL)
+metrics.register_gauge("user_cache", _user_cache.stats)
+
+# Verifications in progress, so concurrent requests with the same new token verify it once
+_pending_verifications = {}
+
+
+async def _verify_and_cache(token: str, key: str) -> dict:
+    """Verify a token in a worker thread and cache its claims until shortly before exp"""
+    start = time.perf_counter()
+    try:
+        claims = await run_firebase_call(verify_firebase_token, token, FIREBASE_CHECK_REVOKED)
+    finally:
+        metrics.observe("auth.verify_token", time.perf_counter() - start)
+
+    ttl = claims.get("exp", 0) - time.time() - AUTH_TOKEN_EXPIRY_LEEWAY
+    if FIREBASE_CHECK_REVOKED:
+        # Revocation can only be noticed by re-verifying, so bound how long a revoked token is honored
+        ttl = min(ttl, AUTH_REVOCATION_CHECK_INTERVAL)
+    if ttl > 0:
+        _token_cache.set(key, claims, ttl)
+
+    return claims
+
+
 async def verify_token(credentials: HTTPAuthorizationCredentials = Depends(security)):
     """Verify Firebase ID token and return decoded token data"""
     token = credentials.credentials
-    return verify_firebase_token(token)
+    key = hashlib.sha256(token.encode()).hexdigest()
+
+    claims = _token_cache.get(key)
+    if claims is not None:
+        return claims
+
+    task = _pending_verifications.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_verify_and_cache(token, key))
+        _pending_verifications[key] = task
+        task.add_done_callback(lambda _: _pending_verifications.pop(key, None))
+
+    # Shield so one cancelled request does not cancel the verification others are waiting on
+    return await asyncio.shield(task)
+
+def invalidate_cached_user(firebase_uid: str):
+    """Drop a user from the get_current_user cache after their document changed"""
+    _user_cache.pop(firebase_uid)
+
+async def update_user_document(user_id, firebase_uid: str, update: dict):
+    """
+    Apply an update operator document to a user, bump updated_at and drop the cached copy.
+    Targeted updates keep concurrent writers (request handlers and background jobs) from
+    overwriting each other's fields the way saving a whole cached document would.
+    """
+    update = dict(update)
+    update["$set"] = {"updated_at": datetime.now(), **update.get("$set", {})}
+    await User.get_motor_collection().update_one({"_id": user_id}, update)
+    invalidate_cached_user(firebase_uid)
+
+async def _upsert_user(token_data: dict) -> dict:
+    """Return the user document for a token, creating it atomically on first sign-in"""
+    uid = token_data["uid"]
+    # Profile fields for new users come straight from the ID token claims,
+    # so first sign-in needs no extra Firebase round-trip
+    new_user = User(
+        firebase_uid=uid,
+        email=token_data.get("email") or "",
+        username=token_data.get("name") or f"user_{uid[:8]}",
+        profile_photo=token_data.get("picture"),
+        created_at=datetime.now()
+    )
+    new_fields = new_user.dict(exclude={"id", "revision_id", "firebase_uid"})
+
+    collection = User.get_motor_collection()
+    for attempt in range(2):
+        try:
+            return await collection.find_one_and_update(
+                {"firebase_uid": uid},
+                {"$setOnInsert": new_fields},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+        except DuplicateKeyError:
+            # A concurrent first request inserted the user between our match and insert
+            if attempt:
+                raise
 
 async def get_current_user(token_data: dict = Depends(verify_token)):
     """Get current user document based on Firebase UID"""
     try:
-        # Find user in MongoDB by firebase_uid
-        user = await User.find_one({"firebase_uid": token_data["uid"]})
+        uid = token_data["uid"]
         
-        if not user:
-            # Create new user if not found
-            firebase_user = get_firebase_user(token_data["uid"])
-            
-            user = User(
-                firebase_uid=token_data["uid"],
-                email=firebase_user.email or "",
-                username=firebase_user.display_name or f"user_{token_data['uid'][:8]}",
-                profile_photo=firebase_user.photo_url,
-                created_at=datetime.now()
-            )
-            
-            await user.insert()
+        # The cache holds raw documents so every request gets its own User instance
+        doc = _user_cache.get(uid)
+        if doc is None:
+            # Find the user by the unique firebase_uid index, or create them if not found
+            doc = await _upsert_user(token_data)
+            _user_cache.set(uid, doc)
         
-        return user
+        return User.parse_obj(doc)
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Error retrieving user: {str(e)}"
         )
 
-async def upload_file_to_firebase(file_data: bytes, path: str, content_type: str = "image/jpeg"):
-    """Upload a file to Firebase Storage and return the public URL"""
-    return upload_file_to_storage(file_data, path, content_type)
\ No newline at end of file
+async def get_admin_user(
+    token_data: dict = Depends(verify_token),
+    current_user: User = Depends(get_current_user)
+):
+    """Require an admin: a token with the `admin` custom claim or a UID listed in ADMIN_UIDS"""
+    if token_data.get("admin") is not True and token_data["uid"] not in ADMIN_UIDS:
+        raise HTTPException(status_code=403, detail="Admin access required")
+    return current_user
@@ -6,6 +6,10 @@ from fastapi import HTTPException
 from ..models.hammock_spot import HammockSpot
 from ..models.user import User
 from ..models.review import Review
+from ..models.spot_cluster import SpotCluster
+from ..models.spot_tombstone import SpotTombstone
+from ..models.job import Job
+from ..models.photo import PhotoClaim
 
 # Database client instances
 db_client = None
@@ -29,7 +33,7 @@ async def connect_to_mongodb():
         # Initialize Beanie with the document models
         await init_beanie(
             database=db,
-            document_models=[HammockSpot, User, Review]
+            document_models=[HammockSpot, User, Review, SpotCluster, SpotTombstone, Job, PhotoClaim]
         )
         
         print("Connected to MongoDB!")
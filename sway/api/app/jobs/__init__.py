@@ -0,0 +1,20 @@
+# app/jobs/__init__.py
+from .queue import enqueue, job_handler, start_job_workers, stop_job_workers
+from .tasks import (
+    SpotCreated, ImportedSpot, SpotsImported, SpotMoved, SpotDeleted, ReviewRatingChanged, PruneUserSpots, DeletePhotos
+)
+
+__all__ = [
+    'enqueue',
+    'job_handler',
+    'start_job_workers',
+    'stop_job_workers',
+    'SpotCreated',
+    'ImportedSpot',
+    'SpotsImported',
+    'SpotMoved',
+    'SpotDeleted',
+    'ReviewRatingChanged',
+    'PruneUserSpots',
+    'DeletePhotos'
+]
\ No newline at end of file
@@ -0,0 +1,245 @@
+# app/jobs/queue.py
+"""
+Background job queue.
+
+Write endpoints store their primary change and enqueue the follow-up work as a
+typed job (a Pydantic model registered with @job_handler), so their latency is
+that of the primary write alone. JOB_QUEUE_MODE picks the backend:
+
+- memory: an asyncio queue drained by workers in the API process. Nothing to run
+  besides the API, but queued jobs are lost when the process stops.
+- mongo: the `jobs` collection. Jobs survive restarts and are shared by every API
+  process and scripts/run_job_worker.py. A worker claims the oldest due job with
+  a lease; a job whose worker died is claimed again once the lease expires.
+
+Failed jobs are retried with exponential backoff up to JOB_MAX_ATTEMPTS times.
+Jobs run at least once, so a handler must be safe to run again: its steps are
+idempotent, or its one non-idempotent step runs last or is guarded by the job id
+(stable across retries). Enqueueing with an idempotency key that was already
+used within JOB_RETENTION_HOURS is a no-op.
+"""
+import asyncio
+import random
+import uuid
+from datetime import datetime, timedelta
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple, Type
+from pydantic import BaseModel
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from app.config import (
+    JOB_QUEUE_MODE, JOB_WORKER_CONCURRENCY, JOB_MAX_ATTEMPTS, JOB_RETRY_BASE_DELAY, JOB_RETRY_MAX_DELAY,
+    JOB_LEASE_SECONDS, JOB_POLL_INTERVAL, JOB_RETENTION_HOURS, JOB_SHUTDOWN_TIMEOUT
+)
+from app.models.job import Job, JobStatus
+from app.utils.helpers.cache import TTLCache
+from app.utils.metrics import metrics
+
+JobHandler = Callable[[BaseModel, str], Awaitable[None]]
+
+# Job type name -> (payload class, handler)
+_handlers: Dict[str, Tuple[Type[BaseModel], JobHandler]] = {}
+
+# Idempotency keys remembered by the in-process queue
+_MEMORY_KEY_CACHE_SIZE = 100000
+
+
+def job_handler(job_type: Type[BaseModel]):
+    """
+    Register the handler of a job type
+
+    The handler is called with the validated job and its job id, which stays the
+    same across retries.
+    """
+    def register(handler: JobHandler) -> JobHandler:
+        _handlers[job_type.__name__] = (job_type, handler)
+        return handler
+    return register
+
+
+def retry_delay(attempts: int) -> float:
+    """Backoff before the next attempt, with jitter so failed jobs do not retry in lockstep"""
+    delay = min(JOB_RETRY_MAX_DELAY, JOB_RETRY_BASE_DELAY * 2 ** (attempts - 1))
+    return delay * random.uniform(0.5, 1.0)
+
+
+async def run_job(job_type: str, payload: dict, job_id: str):
+    """Validate a payload and run its handler"""
+    model, handler = _handlers[job_type]
+    with metrics.timer(f"jobs.{job_type}"):
+        await handler(model.parse_obj(payload), job_id)
+
+
+class InProcessJobQueue:
+    """Jobs held in an asyncio queue and run by tasks of the current process"""
+
+    def __init__(self):
+        self._queue: "asyncio.Queue[tuple]" = asyncio.Queue()
+        self._keys = TTLCache(_MEMORY_KEY_CACHE_SIZE, JOB_RETENTION_HOURS * 3600)
+        self._workers: List[asyncio.Task] = []
+
+    async def enqueue(self, job: BaseModel, idempotency_key: Optional[str] = None) -> bool:
+        if idempotency_key is not None:
+            if self._keys.get(idempotency_key):
+                return False
+            self._keys.set(idempotency_key, True)
+        job_id = idempotency_key or uuid.uuid4().hex
+        self._queue.put_nowait((type(job).__name__, job.dict(), job_id, 0))
+        return True
+
+    async def _work(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            job_type, payload, job_id, attempts = await self._queue.get()
+            try:
+                await run_job(job_type, payload, job_id)
+                metrics.increment("jobs.completed")
+            except Exception as e:
+                attempts += 1
+                if attempts >= JOB_MAX_ATTEMPTS:
+                    metrics.increment("jobs.failed")
+                    print(f"Job {job_type} {job_id} failed after {attempts} attempts: {e}")
+                else:
+                    metrics.increment("jobs.retried")
+                    loop.call_later(
+                        retry_delay(attempts), self._queue.put_nowait, (job_type, payload, job_id, attempts)
+                    )
+            finally:
+                self._queue.task_done()
+
+    async def start(self, concurrency: int):
+        # Nothing else would run the queued jobs, so there is always at least one worker
+        self._workers = [asyncio.create_task(self._work()) for _ in range(max(concurrency, 1))]
+
+    async def stop(self):
+        try:
+            await asyncio.wait_for(self._queue.join(), JOB_SHUTDOWN_TIMEOUT)
+        except asyncio.TimeoutError:
+            print(f"Stopping with {self._queue.qsize()} background jobs still queued")
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def stats(self) -> dict:
+        return {"mode": "memory", "queued": self._queue.qsize(), "workers": len(self._workers)}
+
+
+class MongoJobQueue:
+    """Jobs stored in the `jobs` collection and claimed by workers of any process"""
+
+    def __init__(self):
+        self._workers: List[asyncio.Task] = []
+        self._wake = asyncio.Event()
+        self._stopping = False
+
+    async def enqueue(self, job: BaseModel, idempotency_key: Optional[str] = None) -> bool:
+        try:
+            await Job(type=type(job).__name__, payload=job.dict(), idempotency_key=idempotency_key).insert()
+        except DuplicateKeyError:
+            return False
+        # Local workers pick the job up right away instead of at their next poll
+        self._wake.set()
+        return True
+
+    async def _claim(self) -> Optional[dict]:
+        """Lease the oldest due job, or a running job whose worker's lease expired"""
+        now = datetime.now()
+        return await Job.get_motor_collection().find_one_and_update(
+            {"$or": [
+                {"status": JobStatus.PENDING, "run_at": {"$lte": now}},
+                {"status": JobStatus.RUNNING, "locked_until": {"$lte": now}}
+            ]},
+            {
+                "$set": {"status": JobStatus.RUNNING, "locked_until": now + timedelta(seconds=JOB_LEASE_SECONDS)},
+                "$inc": {"attempts": 1}
+            },
+            sort=[("run_at", 1)],
+            return_document=ReturnDocument.AFTER
+        )
+
+    async def _run(self, doc: dict):
+        job_id = doc.get("idempotency_key") or str(doc["_id"])
+        try:
+            await run_job(doc["type"], doc["payload"], job_id)
+            update = {"status": JobStatus.DONE, "finished_at": datetime.now()}
+            metrics.increment("jobs.completed")
+        except Exception as e:
+            if doc["attempts"] >= doc.get("max_attempts", JOB_MAX_ATTEMPTS):
+                update = {"status": JobStatus.FAILED, "finished_at": datetime.now()}
+                metrics.increment("jobs.failed")
+                print(f"Job {doc['type']} {job_id} failed after {doc['attempts']} attempts: {e}")
+            else:
+                run_at = datetime.now() + timedelta(seconds=retry_delay(doc["attempts"]))
+                update = {"status": JobStatus.PENDING, "run_at": run_at}
+                metrics.increment("jobs.retried")
+            update["last_error"] = str(e)[:1000]
+        update["locked_until"] = None
+
+        # Matching the attempt leaves the job alone if our lease expired and another worker took it
+        await Job.get_motor_collection().update_one(
+            {"_id": doc["_id"], "attempts": doc["attempts"]}, {"$set": update}
+        )
+
+    async def _work(self):
+        while not self._stopping:
+            self._wake.clear()
+            try:
+                doc = await self._claim()
+            except Exception as e:
+                print(f"Failed to claim a background job: {e}")
+                doc = None
+            if doc is None:
+                try:
+                    await asyncio.wait_for(self._wake.wait(), JOB_POLL_INTERVAL)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._run(doc)
+
+    async def start(self, concurrency: int):
+        self._stopping = False
+        self._workers = [asyncio.create_task(self._work()) for _ in range(concurrency)]
+
+    async def stop(self):
+        # Jobs being run get to finish; queued ones stay in the collection for the next start
+        self._stopping = True
+        self._wake.set()
+        if self._workers:
+            _, pending = await asyncio.wait(self._workers, timeout=JOB_SHUTDOWN_TIMEOUT)
+            for worker in pending:
+                worker.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        self._workers = []
+
+    def stats(self) -> dict:
+        return {"mode": "mongo", "workers": len(self._workers)}
+
+
+job_queue = MongoJobQueue() if JOB_QUEUE_MODE == "mongo" else InProcessJobQueue()
+metrics.register_gauge("jobs", job_queue.stats)
+
+
+async def enqueue(job: BaseModel, idempotency_key: Optional[str] = None) -> bool:
+    """
+    Queue a job for a background worker
+
+    Args:
+        job: Payload, an instance of a type registered with @job_handler
+        idempotency_key: Drop the job if this key was already enqueued
+
+    Returns:
+        bool: False if the job was dropped as a duplicate
+    """
+    queued = await job_queue.enqueue(job, idempotency_key)
+    metrics.increment("jobs.enqueued" if queued else "jobs.duplicates")
+    return queued
+
+
+async def start_job_workers(concurrency: int = JOB_WORKER_CONCURRENCY):
+    """Start consuming jobs in this process"""
+    await job_queue.start(concurrency)
+
+
+async def stop_job_workers():
+    """Stop consuming jobs, giving running and queued jobs JOB_SHUTDOWN_TIMEOUT to finish"""
+    await job_queue.stop()
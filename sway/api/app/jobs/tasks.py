@@ -0,0 +1,158 @@
+# app/jobs/tasks.py
+"""
+Follow-up work of spot, review and user writes, run by the background job queue.
+
+Cluster counts are not idempotent, so they are updated by the last step of a
+handler: a retry only repeats them when they were what failed. Rating deltas
+are guarded by the review's rating version instead (see apply_rating_delta), and spot purges by
+their tombstone (see purge_spot). Handlers drop the cached searches and tiles
+around their spots once the clusters are updated, so a tile rendered between
+the request and the job does not keep the old counts.
+"""
+from typing import Dict, List, Tuple
+from bson.objectid import ObjectId
+from pydantic import BaseModel
+from app.dependencies.auth import update_user_document
+from app.utils.helpers.clustering import (
+    add_spot_to_clusters, add_spots_to_clusters, move_spot_in_clusters, update_spot_rating_in_clusters
+)
+from app.utils.helpers.ratings import apply_rating_delta
+from app.utils.helpers.spot_purge import purge_spot
+from app.utils.helpers.spot_search_cache import invalidate_spot_search
+from app.utils.helpers.spot_tiles import invalidate_spot_tiles
+from app.utils.storage.photos import delete_unreferenced_photos
+from .queue import job_handler
+
+
+class SpotCreated(BaseModel):
+    spot_id: str
+    creator_id: str  # User _id
+    creator_uid: str  # firebase_uid, for the user cache
+    latitude: float
+    longitude: float
+    avg_rating: float = 0
+
+
+class ImportedSpot(BaseModel):
+    spot_id: str
+    latitude: float
+    longitude: float
+
+
+class SpotsImported(BaseModel):
+    creator_id: str  # User _id
+    creator_uid: str  # firebase_uid, for the user cache
+    spots: List[ImportedSpot]  # One insert_many batch
+
+
+class SpotMoved(BaseModel):
+    spot_id: str
+    old_latitude: float
+    old_longitude: float
+    latitude: float
+    longitude: float
+    avg_rating: float = 0
+
+
+class SpotDeleted(BaseModel):
+    spot_id: str  # What to purge is recorded on the spot's tombstone
+
+
+class ReviewRatingChanged(BaseModel):
+    spot_id: str
+    count_delta: int  # +1 new review, -1 deleted review, 0 edited rating
+    delta: Dict[str, float]  # Per-dimension change of the rating sums
+    review_id: str
+    version: int  # rating_version of the review after the change
+    counted: bool = False  # The review predates rating_version, so its previous version is counted unrecorded
+
+
+class PruneUserSpots(BaseModel):
+    user_id: str
+    firebase_uid: str
+    field: str  # favorite_spots or created_spots
+    spot_ids: List[str]
+
+
+class DeletePhotos(BaseModel):
+    urls: List[str]  # Public URLs of original photos; their variants go with them
+
+
+def _invalidate_cached_listings(points: List[Tuple[float, float]]):
+    """Drop cached searches and map tiles covering any of the (lat, lng) points"""
+    # Only this process's caches; with JOB_QUEUE_MODE=mongo other processes wait out the TTL (see config)
+    invalidate_spot_search(points)
+    invalidate_spot_tiles(points)
+
+
+@job_handler(SpotCreated)
+async def count_new_spot(job: SpotCreated, job_id: str):
+    """Add a new spot to its creator's created_spots and to the map clusters"""
+    await update_user_document(ObjectId(job.creator_id), job.creator_uid, {
+        "$addToSet": {"created_spots": job.spot_id}
+    })
+    await add_spot_to_clusters(job.spot_id, job.latitude, job.longitude, job.avg_rating)
+    _invalidate_cached_listings([(job.latitude, job.longitude)])
+
+
+@job_handler(SpotsImported)
+async def count_imported_spots(job: SpotsImported, job_id: str):
+    """Add a batch of imported spots to their creator's created_spots and to the map clusters, in one write each"""
+    await update_user_document(ObjectId(job.creator_id), job.creator_uid, {
+        "$addToSet": {"created_spots": {"$each": [spot.spot_id for spot in job.spots]}}
+    })
+    await add_spots_to_clusters([(spot.spot_id, spot.latitude, spot.longitude, 0) for spot in job.spots])
+    _invalidate_cached_listings([(spot.latitude, spot.longitude) for spot in job.spots])
+
+
+@job_handler(SpotMoved)
+async def move_spot(job: SpotMoved, job_id: str):
+    """Move a spot between map clusters after its coordinates changed"""
+    await move_spot_in_clusters(
+        job.spot_id, job.old_latitude, job.old_longitude, job.latitude, job.longitude, job.avg_rating
+    )
+    _invalidate_cached_listings([(job.old_latitude, job.old_longitude), (job.latitude, job.longitude)])
+
+
+@job_handler(SpotDeleted)
+async def purge_deleted_spot(job: SpotDeleted, job_id: str):
+    """Delete a deleted spot's reviews, photos and user references and uncount it from the map clusters"""
+    purge = await purge_spot(job.spot_id)
+    if purge is not None:
+        _invalidate_cached_listings([(purge["latitude"], purge["longitude"])])
+
+
+@job_handler(ReviewRatingChanged)
+async def apply_review_rating(job: ReviewRatingChanged, job_id: str):
+    """Add a review's rating change to the spot aggregates and propagate a new avg_rating"""
+    aggregate = await apply_rating_delta(
+        job.spot_id, job.count_delta, job.delta, job.review_id, job.version, job.counted
+    )
+    if aggregate is None:
+        return
+
+    coordinates = aggregate["coordinates"]
+    point = (coordinates["latitude"], coordinates["longitude"])
+    _invalidate_cached_listings([point])
+    if aggregate["avg_rating"] != aggregate["previous_rating"]:
+        await update_spot_rating_in_clusters(
+            job.spot_id,
+            coordinates["latitude"],
+            coordinates["longitude"],
+            aggregate["avg_rating"],
+            aggregate["previous_rating"]
+        )
+
+
+@job_handler(PruneUserSpots)
+async def prune_user_spots(job: PruneUserSpots, job_id: str):
+    """Remove IDs of deleted spots from one of a user's spot lists"""
+    await update_user_document(ObjectId(job.user_id), job.firebase_uid, {
+        "$pull": {job.field: {"$in": job.spot_ids}}
+    })
+
+
+@job_handler(DeletePhotos)
+async def delete_photos(job: DeletePhotos, job_id: str):
+    """Delete photos that are no longer referenced"""
+    await delete_unreferenced_photos(job.urls, best_effort=False)
@@ -4,22 +4,42 @@ from beanie import init_beanie
 from motor.motor_asyncio import AsyncIOMotorClient
 import os
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.staticfiles import StaticFiles
+from urllib.parse import urlparse
 
 # Import models and routers
 from app.models.hammock_spot import HammockSpot
 from app.models.user import User
 from app.models.review import Review
+from app.models.spot_cluster import SpotCluster
+from app.models.spot_tombstone import SpotTombstone
+from app.models.job import Job
+from app.models.photo import PhotoClaim
 from app.routes.spots.router import spot_router
 from app.routes.users.router import user_router
 from app.routes.reviews.router import review_router
+from app.routes.admin.router import admin_router
+from app.utils.metrics import metrics
+from app.utils.responses import FastJSONResponse
+from app.utils.body_limit import BodySizeLimitMiddleware
+from app.utils.helpers.cursor import NEXT_CURSOR_HEADER
+from app.config import MAX_UPLOAD_REQUEST_BYTES, STORAGE_BACKEND, LOCAL_STORAGE_DIR, LOCAL_STORAGE_URL
+from app.utils.firebase import initialize_firebase, run_firebase_call, shutdown_firebase_executor
+from app.utils.helpers.images import shutdown_image_pool
+from app.jobs import start_job_workers, stop_job_workers
 
 # Create FastAPI app
 app = FastAPI(
     title="Hammock Spots API",
     description="API for finding perfect hammock spots",
     version="1.0.0",
+    default_response_class=FastJSONResponse,
 )
 
+# Reject oversized request bodies (photo uploads) while they stream in. Added before CORS so
+# CORS wraps it and its 413 responses carry the CORS headers.
+app.add_middleware(BodySizeLimitMiddleware, max_body_size=MAX_UPLOAD_REQUEST_BYTES)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -27,6 +47,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 # Create a versioned API router
@@ -36,10 +57,16 @@ v1_router = APIRouter(prefix="/v1")
 v1_router.include_router(spot_router)
 v1_router.include_router(user_router)
 v1_router.include_router(review_router)
+v1_router.include_router(admin_router)
 
 # Add versioned router to app
 app.include_router(v1_router)
 
+# Serve photos stored on local disk
+if STORAGE_BACKEND == "local":
+    os.makedirs(LOCAL_STORAGE_DIR, exist_ok=True)
+    app.mount(urlparse(LOCAL_STORAGE_URL).path, StaticFiles(directory=LOCAL_STORAGE_DIR), name="photos")
+
 @app.on_event("startup")
 async def startup_db_client():
     """Initialize database connection and Beanie ODM"""
@@ -52,7 +79,7 @@ async def startup_db_client():
         # Initialize Beanie with the document models
         await init_beanie(
             database=client.get_default_database(),
-            document_models=[HammockSpot, User, Review]
+            document_models=[HammockSpot, User, Review, SpotCluster, SpotTombstone, Job, PhotoClaim]
         )
         
         print("Connected to MongoDB!")
@@ -60,6 +87,34 @@ async def startup_db_client():
         print(f"Failed to connect to MongoDB: {e}")
         raise
 
+@app.on_event("startup")
+async def startup_firebase():
+    """Load Firebase credentials on the Firebase thread pool before the first request needs them"""
+    try:
+        await run_firebase_call(initialize_firebase)
+    except Exception as e:
+        print(f"Failed to initialize Firebase: {e}")
+
+@app.on_event("startup")
+async def startup_jobs():
+    """Start the background job workers once the database is connected"""
+    await start_job_workers()
+
+@app.on_event("shutdown")
+async def shutdown_jobs():
+    """Let queued jobs finish before the Firebase pool and database go away"""
+    await stop_job_workers()
+
+@app.on_event("shutdown")
+async def shutdown_firebase():
+    """Stop the Firebase thread pool"""
+    shutdown_firebase_executor()
+
+@app.on_event("shutdown")
+async def shutdown_images():
+    """Stop the image worker processes"""
+    shutdown_image_pool()
+
 @app.get("/")
 async def root():
     """Root endpoint for health check"""
@@ -68,4 +123,9 @@ async def root():
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    return {"status": "healthy"}
\ No newline at end of file
+    return {"status": "healthy"}
+
+@app.get("/metrics")
+async def get_metrics():
+    """Process-local cache, latency and queue metrics"""
+    return metrics.snapshot()
\ No newline at end of file
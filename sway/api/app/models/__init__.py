@@ -1,13 +1,23 @@
 # app/models/__init__.py
-from .hammock_spot import HammockSpot, Coordinates, TreeType, Amenities, Rating
+from .hammock_spot import HammockSpot, Coordinates, GeoPoint, TreeType, Amenities, Rating
 from .user import User
 from .review import Review
+from .spot_cluster import SpotCluster
+from .spot_tombstone import SpotTombstone
+from .job import Job, JobStatus
+from .photo import PhotoClaim
 
 __all__ = [
     'HammockSpot', 
     'User', 
     'Review', 
+    'SpotCluster', 
+    'SpotTombstone', 
+    'Job', 
+    'JobStatus', 
+    'PhotoClaim', 
     'Coordinates', 
+    'GeoPoint', 
     'TreeType', 
     'Amenities', 
     'Rating'
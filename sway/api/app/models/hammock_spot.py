@@ -1,9 +1,11 @@
 # api/app/models/hammock_spot.py
 from datetime import datetime
-from typing import List, Optional
+from typing import Dict, List, Optional
 from pydantic import BaseModel, Field
-from beanie import Document, Link
+from beanie import Document
+from pymongo import IndexModel, GEOSPHERE, ASCENDING, DESCENDING
 from enum import Enum
+from .photo import PhotoVariants, select_photo_urls
 
 
 class Coordinates(BaseModel):
@@ -11,6 +13,17 @@ class Coordinates(BaseModel):
     longitude: float
 
 
+class GeoPoint(BaseModel):
+    """GeoJSON Point used for 2dsphere queries. Coordinates are [longitude, latitude]."""
+    type: str = "Point"
+    coordinates: List[float]
+
+    @classmethod
+    def from_coordinates(cls, coordinates: Coordinates) -> "GeoPoint":
+        """Build a GeoJSON Point from a lat/lng Coordinates object"""
+        return cls(coordinates=[coordinates.longitude, coordinates.latitude])
+
+
 class TreeType(str, Enum):
     PINE = "pine"
     OLIVE = "olive"
@@ -38,42 +51,93 @@ class Rating(BaseModel):
     overall: float = 0  # 1-5
 
 
-class Review(Document):
-    spot_id: str
-    user_id: str
-    username: str
-    rating: Rating
-    comment: Optional[str] = None
-    photos: List[str] = []  # URLs to Firebase Storage
-    created_at: datetime = Field(default_factory=datetime.now)
-    updated_at: Optional[datetime] = None
+# Top-level fields of HammockSpot.to_response_model, selectable with ?fields=
+SPOT_RESPONSE_FIELDS = (
+    "id", "name", "description", "coordinates", "tree_types", "distance_between_trees",
+    "amenities", "photos", "creator_id", "is_private", "is_verified", "avg_rating",
+    "review_count", "created_at", "updated_at"
+)
 
 
 class HammockSpot(Document):
     name: str
     description: Optional[str] = None
     coordinates: Coordinates
+    location: Optional[GeoPoint] = None  # GeoJSON mirror of coordinates, backs the 2dsphere index
     tree_types: List[TreeType] = []
     distance_between_trees: Optional[float] = None  # in meters
     amenities: Amenities = Field(default_factory=Amenities)
     photos: List[str] = []  # URLs to Firebase Storage
+    photo_variants: List[PhotoVariants] = []  # Resized WebP URLs of each photo
     creator_id: str
     is_private: bool = False  # Whether this is on private property
     is_verified: bool = False  # Admin-verified location
     avg_rating: float = 0
-    reviews: List[Link[Review]] = []
+    review_count: int = 0
+    rating_totals: Rating = Field(default_factory=Rating)  # Running sums per dimension, not averages
+    rating_versions: Dict[str, int] = {}  # Last rating_version counted in rating_totals per review ID
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: Optional[datetime] = None
 
+    class Settings:
+        indexes = [
+            IndexModel([("location", GEOSPHERE)], name="location_2dsphere"),
+            # Keyset pagination for rating-sorted listings
+            IndexModel([("avg_rating", DESCENDING), ("_id", DESCENDING)], name="avg_rating_id"),
+            # Delta sync: every write path sets updated_at
+            IndexModel([("updated_at", ASCENDING), ("_id", ASCENDING)], name="updated_at_id"),
+            # Photos are stored once per content; checked before one is deleted
+            IndexModel("photos", name="photos"),
+        ]
+
+    def set_coordinates(self, coordinates: Coordinates):
+        """Update coordinates and keep the GeoJSON location in sync"""
+        self.coordinates = coordinates
+        self.location = GeoPoint.from_coordinates(coordinates)
+
+    def to_response_model(self, photo_size: str = "original") -> dict:
+        """Convert to a dictionary that can be used in API responses, with photos at photo_size"""
+        return {
+            "id": str(self.id),  # Convert ObjectId to string
+            "name": self.name,
+            "description": self.description,
+            "coordinates": self.coordinates.dict(),
+            "tree_types": [tt.value for tt in self.tree_types],
+            "distance_between_trees": self.distance_between_trees,
+            "amenities": self.amenities.dict(),
+            "photos": select_photo_urls(self.photos, [v.dict() for v in self.photo_variants], photo_size),
+            "creator_id": self.creator_id,
+            "is_private": self.is_private,
+            "is_verified": self.is_verified,
+            "avg_rating": self.avg_rating,
+            "review_count": self.review_count,
+            "created_at": self.created_at,
+            "updated_at": self.updated_at
+        }
+
+    @staticmethod
+    def response_from_doc(doc: dict, photo_size: str = "original") -> dict:
+        """
+        Same as to_response_model, built straight from a raw (possibly projected)
+        document so listings skip model construction. Trim the result to the
+        projected fields with trim_fields. Project photo_variants along with photos
+        for photo_size to take effect.
+        """
+        return {
+            "id": str(doc["_id"]),
+            "name": doc.get("name"),
+            "description": doc.get("description"),
+            "coordinates": doc.get("coordinates"),
+            "tree_types": doc.get("tree_types", []),
+            "distance_between_trees": doc.get("distance_between_trees"),
+            "amenities": doc.get("amenities") or Amenities().dict(),
+            "photos": select_photo_urls(doc.get("photos", []), doc.get("photo_variants"), photo_size),
+            "creator_id": doc.get("creator_id"),
+            "is_private": doc.get("is_private", False),
+            "is_verified": doc.get("is_verified", False),
+            "avg_rating": doc.get("avg_rating", 0),
+            "review_count": doc.get("review_count", 0),
+            "created_at": doc.get("created_at"),
+            "updated_at": doc.get("updated_at")
+        }
 
-class User(Document):
-    firebase_uid: str
-    username: str
-    email: str
-    profile_photo: Optional[str] = None
-    bio: Optional[str] = None
-    favorite_spots: List[str] = []  # HammockSpot IDs
-    created_spots: List[str] = []  # HammockSpot IDs
-    is_premium: bool = False
-    created_at: datetime = Field(default_factory=datetime.now)
-    updated_at: Optional[datetime] = None
\ No newline at end of file
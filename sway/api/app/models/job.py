@@ -0,0 +1,49 @@
+# app/models/job.py
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+from pydantic import Field
+from beanie import Document
+from pymongo import IndexModel, ASCENDING
+from app.config import JOB_MAX_ATTEMPTS, JOB_RETENTION_HOURS
+
+
+class JobStatus(str, Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class Job(Document):
+    """A side effect of a write, queued in the durable (JOB_QUEUE_MODE=mongo) job queue"""
+    type: str = Field(..., description="Class name of the job payload")
+    payload: dict = Field(default_factory=dict, description="Job fields, validated by the payload class when run")
+    idempotency_key: Optional[str] = Field(default=None, description="Enqueueing the same key again is a no-op")
+    status: JobStatus = Field(default=JobStatus.PENDING)
+    attempts: int = Field(default=0, description="Times the job was claimed by a worker")
+    max_attempts: int = Field(default=JOB_MAX_ATTEMPTS)
+    run_at: datetime = Field(default_factory=datetime.now, description="Not claimed before this time (retry backoff)")
+    locked_until: Optional[datetime] = Field(default=None, description="Lease of the worker running the job")
+    last_error: Optional[str] = None
+    created_at: datetime = Field(default_factory=datetime.now)
+    finished_at: Optional[datetime] = None
+
+    class Settings:
+        name = "jobs"
+        indexes = [
+            # Workers claim the oldest due job
+            IndexModel([("status", ASCENDING), ("run_at", ASCENDING)], name="status_run_at"),
+            IndexModel(
+                "idempotency_key",
+                name="idempotency_key_unique",
+                unique=True,
+                partialFilterExpression={"idempotency_key": {"$type": "string"}}
+            ),
+            # Finished jobs are kept for inspection, and to dedupe late duplicates, then expire
+            IndexModel(
+                "finished_at",
+                name="finished_at_ttl",
+                expireAfterSeconds=int(JOB_RETENTION_HOURS * 3600)
+            ),
+        ]
@@ -0,0 +1,59 @@
+# app/models/photo.py
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel, Field
+from beanie import Document
+from pymongo import IndexModel
+from app.config import PHOTO_DELETE_GRACE
+
+# Values of the photo_size query parameter, smallest first
+PHOTO_SIZES = ("thumbnail", "medium", "full", "original")
+
+
+class PhotoVariants(BaseModel):
+    """URLs of an uploaded photo and its resized, EXIF-stripped WebP derivatives"""
+    original: str  # As uploaded
+    thumbnail: Optional[str] = None
+    medium: Optional[str] = None
+    full: Optional[str] = None  # Full resolution WebP
+
+
+class PhotoClaim(Document):
+    """
+    Coordination between uploads and deletes of one content-addressed photo.
+    An upload sets used_at before it looks for the stored photo; a delete sets
+    deleting_at, only while no upload used the photo within PHOTO_DELETE_GRACE,
+    and clears it once the blobs are gone. Both times are UTC, which the TTL
+    indexes expire by.
+    """
+    path: str = Field(..., description="Storage path of the original photo")
+    used_at: Optional[datetime] = None
+    deleting_at: Optional[datetime] = None
+
+    class Settings:
+        name = "photo_claims"
+        indexes = [
+            IndexModel("path", name="path", unique=True),
+            # Claims older than the grace period no longer protect anything
+            IndexModel("used_at", name="used_at_ttl", expireAfterSeconds=int(PHOTO_DELETE_GRACE)),
+            # Left behind by a delete that crashed
+            IndexModel("deleting_at", name="deleting_at_ttl", expireAfterSeconds=int(PHOTO_DELETE_GRACE)),
+        ]
+
+
+def select_photo_urls(photos: List[str], variants: Optional[List[dict]], size: str) -> List[str]:
+    """
+    Map original photo URLs to one variant size
+
+    Args:
+        photos: Original URLs, in display order
+        variants: Raw PhotoVariants documents of the same photos
+        size: One of PHOTO_SIZES
+
+    Returns:
+        list: URL of the requested size per photo, or the original where no variant exists
+    """
+    if size == "original" or not variants:
+        return photos
+    by_original = {v["original"]: v for v in variants}
+    return [(by_original.get(url) or {}).get(size) or url for url in photos]
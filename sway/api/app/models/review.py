@@ -2,8 +2,16 @@
 from datetime import datetime
 from typing import List, Optional
 from pydantic import Field
-from beanie import Document, Link
+from beanie import Document
+from pymongo import IndexModel, ASCENDING, DESCENDING
 from .hammock_spot import Rating
+from .photo import PhotoVariants, select_photo_urls
+
+# Top-level fields of Review.to_response_model, selectable with ?fields=
+REVIEW_RESPONSE_FIELDS = (
+    "id", "spot_id", "user_id", "username", "rating", "comment", "photos", "created_at", "updated_at"
+)
+
 
 class Review(Document):
     spot_id: str = Field(..., description="ID of the HammockSpot being reviewed")
@@ -12,14 +20,31 @@ class Review(Document):
     rating: Rating = Field(..., description="User's rating for this spot")
     comment: Optional[str] = Field(default=None, description="Review comment")
     photos: List[str] = Field(default_factory=list, description="URLs to Firebase Storage for review photos")
+    photo_variants: List[PhotoVariants] = Field(default_factory=list, description="Resized WebP URLs of each photo")
+    rating_version: int = Field(default=0, description="Number of rating updates, for exactly-once spot aggregates")
     created_at: datetime = Field(default_factory=datetime.now)
     updated_at: Optional[datetime] = None
 
     class Settings:
         name = "reviews"
+        indexes = [
+            # Reviews of a spot, newest or highest rated first (keyset pagination)
+            IndexModel(
+                [("spot_id", ASCENDING), ("created_at", DESCENDING), ("_id", DESCENDING)],
+                name="spot_created_at"
+            ),
+            IndexModel(
+                [("spot_id", ASCENDING), ("rating.overall", DESCENDING), ("_id", DESCENDING)],
+                name="spot_rating"
+            ),
+            # One review per user and spot
+            IndexModel([("spot_id", ASCENDING), ("user_id", ASCENDING)], name="spot_user_unique", unique=True),
+            # Photos are stored once per content; checked before one is deleted
+            IndexModel("photos", name="photos"),
+        ]
     
-    def to_response_model(self) -> dict:
-        """Convert to a dictionary that can be used in API responses"""
+    def to_response_model(self, photo_size: str = "original") -> dict:
+        """Convert to a dictionary that can be used in API responses, with photos at photo_size"""
         return {
             "id": str(self.id),  # Convert ObjectId to string
             "spot_id": self.spot_id,
@@ -27,11 +52,26 @@ class Review(Document):
             "username": self.username,
             "rating": self.rating.dict(),
             "comment": self.comment,
-            "photos": self.photos,
+            "photos": select_photo_urls(self.photos, [v.dict() for v in self.photo_variants], photo_size),
             "created_at": self.created_at,
             "updated_at": self.updated_at
         }
 
+    @staticmethod
+    def response_from_doc(doc: dict, photo_size: str = "original") -> dict:
+        """Same as to_response_model, built straight from a raw (possibly projected) document"""
+        return {
+            "id": str(doc["_id"]),
+            "spot_id": doc.get("spot_id"),
+            "user_id": doc.get("user_id"),
+            "username": doc.get("username"),
+            "rating": doc.get("rating"),
+            "comment": doc.get("comment"),
+            "photos": select_photo_urls(doc.get("photos", []), doc.get("photo_variants"), photo_size),
+            "created_at": doc.get("created_at"),
+            "updated_at": doc.get("updated_at")
+        }
+
     class Config:
         schema_extra = {
             "example": {
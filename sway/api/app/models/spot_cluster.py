@@ -0,0 +1,38 @@
+# app/models/spot_cluster.py
+from typing import Optional
+from pydantic import Field
+from beanie import Document
+from pymongo import IndexModel, ASCENDING
+
+
+class SpotCluster(Document):
+    zoom: int = Field(..., description="Map zoom level of this grid")
+    cell_x: int = Field(..., description="Web Mercator grid column")
+    cell_y: int = Field(..., description="Web Mercator grid row")
+    spot_count: int = Field(default=0, description="Number of spots in the cell")
+    sum_lat: float = Field(default=0, description="Sum of spot latitudes, for the centroid")
+    sum_lng: float = Field(default=0, description="Sum of spot longitudes, for the centroid")
+    top_spot_id: Optional[str] = Field(default=None, description="Highest rated spot in the cell")
+    top_rating: float = Field(default=0, description="avg_rating of top_spot_id")
+
+    class Settings:
+        name = "spot_clusters"
+        indexes = [
+            IndexModel(
+                [("zoom", ASCENDING), ("cell_x", ASCENDING), ("cell_y", ASCENDING)],
+                name="zoom_cell",
+                unique=True
+            ),
+        ]
+
+    def to_response_model(self) -> dict:
+        """Convert to a dictionary that can be used in API responses"""
+        return {
+            "count": self.spot_count,
+            "latitude": self.sum_lat / self.spot_count if self.spot_count else 0,
+            "longitude": self.sum_lng / self.spot_count if self.spot_count else 0,
+            "top_spot": {
+                "id": self.top_spot_id,
+                "avg_rating": self.top_rating
+            } if self.top_spot_id else None
+        }
@@ -0,0 +1,44 @@
+# app/models/spot_tombstone.py
+from datetime import datetime
+from typing import List, Optional
+from pydantic import BaseModel, Field
+from beanie import Document
+from pymongo import IndexModel, ASCENDING
+from app.config import SPOT_TOMBSTONE_RETENTION_DAYS
+
+
+class SpotPurge(BaseModel):
+    """What is left to clean up after a spot was deleted, and how far the cleanup got"""
+    creator_id: str
+    creator_uid: str
+    latitude: float
+    longitude: float
+    photo_urls: List[str] = []  # Spot photos; their variants are deleted with them
+    status: str = "pending"  # pending, running or done
+    reviews_deleted: int = 0
+    photos_deleted: int = 0
+    favorites_removed: int = 0  # Users whose favorite_spots listed the spot
+    unclustered: bool = False  # Removed from the map clusters
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class SpotTombstone(Document):
+    """Record of a deleted spot, so delta sync clients can drop it locally"""
+    spot_id: str = Field(..., description="ID of the deleted HammockSpot")
+    deleted_at: datetime = Field(default_factory=datetime.now)
+    purge: Optional[SpotPurge] = Field(default=None, description="Cleanup of the spot's reviews, photos and references")
+
+    class Settings:
+        name = "spot_tombstones"
+        indexes = [
+            # Keyset pagination of GET /v1/spots/changes
+            IndexModel([("deleted_at", ASCENDING), ("_id", ASCENDING)], name="deleted_at_id"),
+            # Clients that have not synced within the retention window reload everything
+            IndexModel(
+                "deleted_at",
+                name="deleted_at_ttl",
+                expireAfterSeconds=int(SPOT_TOMBSTONE_RETENTION_DAYS * 86400)
+            ),
+            IndexModel("spot_id", name="spot_id"),
+        ]
@@ -3,12 +3,15 @@ from datetime import datetime
 from typing import List, Optional
 from pydantic import Field
 from beanie import Document
+from pymongo import IndexModel
+from .photo import PhotoVariants
 
 class User(Document):
     firebase_uid: str = Field(..., description="Firebase User ID")
     username: str = Field(..., description="User's display name")
     email: str = Field(..., description="User's email address")
     profile_photo: Optional[str] = Field(default=None, description="URL to profile photo in Firebase Storage")
+    profile_photo_variants: Optional[PhotoVariants] = Field(default=None, description="Resized WebP URLs of the profile photo")
     bio: Optional[str] = Field(default=None, description="User's bio or description")
     favorite_spots: List[str] = Field(default_factory=list, description="List of favorite HammockSpot IDs")
     created_spots: List[str] = Field(default_factory=list, description="List of HammockSpot IDs created by user")
@@ -18,15 +21,25 @@ class User(Document):
 
     class Settings:
         name = "users"
+        indexes = [
+            IndexModel("firebase_uid", name="firebase_uid_unique", unique=True),
+            # Removing a deleted spot from everyone's favorites
+            IndexModel("favorite_spots", name="favorite_spots"),
+            # Photos are stored once per content; checked before one is deleted
+            IndexModel("profile_photo", name="profile_photo", sparse=True),
+        ]
         
-    def to_response_model(self) -> dict:
-        """Convert to a dictionary that can be used in API responses"""
+    def to_response_model(self, photo_size: str = "original") -> dict:
+        """Convert to a dictionary that can be used in API responses, with the profile photo at photo_size"""
+        profile_photo = self.profile_photo
+        if profile_photo and self.profile_photo_variants and self.profile_photo_variants.original == profile_photo:
+            profile_photo = getattr(self.profile_photo_variants, photo_size) or profile_photo
         return {
             "id": str(self.id),  # Convert ObjectId to string
             "firebase_uid": self.firebase_uid,
             "username": self.username,
             "email": self.email,
-            "profile_photo": self.profile_photo,
+            "profile_photo": profile_photo,
             "bio": self.bio,
             "favorite_spots": self.favorite_spots,
             "created_spots": self.created_spots,
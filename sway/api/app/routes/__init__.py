@@ -2,5 +2,6 @@
 from .spots.router import spot_router
 from .users.router import user_router
 from .reviews.router import review_router
+from .admin.router import admin_router
 
-__all__ = ['spot_router', 'user_router', 'review_router']
\ No newline at end of file
+__all__ = ['spot_router', 'user_router', 'review_router', 'admin_router']
\ No newline at end of file
@@ -0,0 +1,4 @@
+# app/routes/admin/__init__.py
+from .router import admin_router
+
+__all__ = ['admin_router']
\ No newline at end of file
@@ -0,0 +1,90 @@
+# app/routes/admin/router.py
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from typing import Optional
+from bson.objectid import ObjectId
+from app.models.user import User
+from app.models.spot_tombstone import SpotTombstone
+from app.dependencies.auth import get_admin_user
+from app.jobs import enqueue, SpotDeleted
+from app.utils.responses import json_response
+from app.utils.helpers.export import EXPORT_COLLECTIONS, iter_export_chunks
+from app.utils.helpers.spot_import import import_spots
+from app.config import EXPORT_BATCH_SIZE, SPOT_IMPORT_DUPLICATE_RADIUS
+
+# Initialize router
+admin_router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+@admin_router.get("/export/{collection}")
+async def export_collection(
+    collection: str,
+    after: Optional[str] = Query(None, description="Resume after this _id (the last one already received)"),
+    gzip: bool = Query(False, description="Gzip-compress the stream"),
+    batch_size: int = Query(EXPORT_BATCH_SIZE, ge=100, le=10000, description="Documents per cursor batch"),
+    current_user: User = Depends(get_admin_user)
+):
+    """
+    Stream a whole collection as newline-delimited JSON, ordered by _id.
+    If the transfer is interrupted, request again with `after` set to the _id of
+    the last complete line.
+    """
+    if collection not in EXPORT_COLLECTIONS:
+        raise HTTPException(status_code=404, detail=f"Unknown collection, expected one of: {', '.join(EXPORT_COLLECTIONS)}")
+    if after is not None and not ObjectId.is_valid(after):
+        raise HTTPException(status_code=400, detail="after must be a document _id")
+    
+    filename = f"{collection}.ndjson.gz" if gzip else f"{collection}.ndjson"
+    return StreamingResponse(
+        iter_export_chunks(collection, ObjectId(after) if after else None, batch_size, compress=gzip),
+        media_type="application/gzip" if gzip else "application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'}
+    )
+
+
+async def _find_purge(spot_id: str) -> dict:
+    tombstone = await SpotTombstone.get_motor_collection().find_one(
+        {"spot_id": spot_id, "purge": {"$ne": None}}, {"purge.photo_urls": 0}
+    )
+    if tombstone is None:
+        raise HTTPException(status_code=404, detail="No purge recorded for this spot")
+    return {"spot_id": spot_id, "deleted_at": tombstone["deleted_at"], **tombstone["purge"]}
+
+
+@admin_router.get("/spots/{spot_id}/purge", response_model=dict)
+async def get_spot_purge(
+    spot_id: str,
+    current_user: User = Depends(get_admin_user)
+):
+    """Progress of the cleanup of a deleted spot's reviews, photos and references"""
+    return json_response(await _find_purge(spot_id))
+
+
+@admin_router.post("/spots/{spot_id}/purge", response_model=dict)
+async def rerun_spot_purge(
+    spot_id: str,
+    current_user: User = Depends(get_admin_user)
+):
+    """Queue the cleanup of a deleted spot again, e.g. after it ran out of retries"""
+    purge = await _find_purge(spot_id)
+    await enqueue(SpotDeleted(spot_id=spot_id))
+    return json_response(purge)
+
+
+@admin_router.post("/spots/import", response_model=dict)
+async def import_spots_file(
+    request: Request,
+    format: str = Query(..., pattern="^(geojson|csv)$", description="Format of the request body"),
+    duplicate_radius: float = Query(
+        SPOT_IMPORT_DUPLICATE_RADIUS, ge=0, le=1000,
+        description="Skip rows this close (meters) to an existing spot or an earlier row; 0 imports all"
+    ),
+    current_user: User = Depends(get_admin_user)
+):
+    """
+    Bulk import spots from a GeoJSON FeatureCollection or CSV request body, read as it streams in.
+    The spots are created by the calling admin. Returns counts and per-row errors; if the body
+    stops being readable, `aborted` says why and the rows before it stay imported.
+    """
+    report = await import_spots(request.stream(), format, current_user, duplicate_radius=duplicate_radius)
+    return json_response(report.dict())
@@ -1,12 +1,25 @@
 # app/routes/reviews/router.py
-from fastapi import APIRouter, Depends, HTTPException, Body, File, UploadFile, Form
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Body, File, UploadFile, Form, Query, Request
+from typing import List, Optional, Set
 import json
+from datetime import datetime
 from bson.objectid import ObjectId
-from app.models.review import Review
+from pymongo import ReturnDocument
+from pymongo.errors import DuplicateKeyError
+from app.models.review import Review, REVIEW_RESPONSE_FIELDS
 from app.models.hammock_spot import HammockSpot, Rating
 from app.models.user import User
-from app.dependencies.auth import get_current_user, upload_file_to_firebase
+from app.dependencies.auth import get_current_user
+from app.jobs import enqueue, ReviewRatingChanged, DeletePhotos
+from app.utils.helpers.uploads import check_image_upload
+from app.utils.storage.photos import upload_photo, upload_photos
+from app.utils.helpers.ratings import rating_delta
+from app.utils.helpers.fields import sparse_fields, fields_projection, trim_fields
+from app.utils.responses import json_response
+from app.utils.helpers.http_cache import (
+    VERSION_FIELDS, document_etag, matches_if_none_match, cache_headers, not_modified
+)
+
 
 # Initialize router
 review_router = APIRouter(prefix="/reviews", tags=["reviews"])
@@ -29,7 +42,7 @@ async def create_review(
     if not spot:
         raise HTTPException(status_code=404, detail="Spot not found")
     
-    # Check if user already reviewed this spot
+    # Check if user already reviewed this spot (served by the unique spot_id/user_id index)
     existing_review = await Review.find_one({
         "spot_id": spot_id,
         "user_id": str(current_user.id)
@@ -53,18 +66,12 @@ async def create_review(
         overall=overall_rating
     )
     
-    # Upload photos if any
-    photo_urls = []
-    for i, photo in enumerate(photos):
-        if photo.filename:
-            file_content = await photo.read()
-            path = f"review_photos/{spot_id}/{current_user.id}/{ObjectId()}-{i}"
-            url = await upload_file_to_firebase(
-                file_content, 
-                path, 
-                photo.content_type or "image/jpeg"
-            )
-            photo_urls.append(url)
+    # Reject oversized or non-image files before anything is uploaded
+    photos = [photo for photo in photos if photo.filename]
+    content_types = [await check_image_upload(photo) for photo in photos]
+    
+    # Upload photos and their variants if any, concurrently and streamed from the spooled upload files
+    uploaded = await upload_photos(list(zip(photos, content_types)))
     
     # Create review
     review = Review(
@@ -73,41 +80,59 @@ async def create_review(
         username=current_user.username,
         rating=rating,
         comment=comment,
-        photos=photo_urls
+        photos=[photo.original for photo in uploaded],
+        photo_variants=uploaded
     )
     
-    # Save to database
-    await review.insert()
-    
-    # Update spot's reviews and average rating
-    if spot.reviews is None:
-        spot.reviews = []
-    
-    spot.reviews.append(review)
-    
-    # Recalculate average rating
-    total_rating = 0
-    for r in spot.reviews:
-        total_rating += r.rating.overall
-    
-    spot.avg_rating = total_rating / len(spot.reviews)
+    # Save to database; the unique (spot_id, user_id) index catches concurrent duplicates
+    try:
+        await review.insert()
+    except DuplicateKeyError:
+        await enqueue(DeletePhotos(urls=[photo.original for photo in uploaded]))
+        raise HTTPException(
+            status_code=400, 
+            detail="You have already reviewed this spot. Please update your existing review."
+        )
     
-    # Save spot changes
-    await spot.save()
+    # Add the review to the spot's rating aggregates in the background
+    await enqueue(
+        ReviewRatingChanged(
+            spot_id=spot_id, count_delta=1, delta=rating_delta(None, rating), review_id=str(review.id), version=0
+        ),
+        idempotency_key=f"review-created:{review.id}"
+    )
     
-    return review.to_response_model()
+    return json_response(review.to_response_model())
 
 
 @review_router.get("/{review_id}", response_model=dict)
-async def get_review(review_id: str):
+async def get_review(
+    review_id: str,
+    request: Request,
+    fields: Optional[Set[str]] = Depends(sparse_fields(REVIEW_RESPONSE_FIELDS)),
+    photo_size: str = Query(
+        "original",
+        pattern="^(thumbnail|medium|full|original)$",
+        description="Size of the returned photo URLs: thumbnail, medium, full (WebP) or original"
+    ),
+):
     """Get a specific review by ID"""
     try:
-        review = await Review.get(review_id)
-        if not review:
-            raise HTTPException(status_code=404, detail="Review not found")
-        return review.to_response_model()
+        doc = await Review.get_motor_collection().find_one(
+            {"_id": ObjectId(review_id)}, fields_projection(fields, required=VERSION_FIELDS)
+        )
     except Exception as e:
         raise HTTPException(status_code=404, detail=f"Review not found: {str(e)}")
+    if not doc:
+        raise HTTPException(status_code=404, detail="Review not found")
+    
+    etag = document_etag(
+        doc["_id"], doc.get("updated_at"), doc.get("created_at"), (*(fields or ()), f"photo_size={photo_size}")
+    )
+    headers = cache_headers(etag, public=True)
+    if matches_if_none_match(request, etag):
+        return not_modified(headers)
+    return json_response(trim_fields(Review.response_from_doc(doc, photo_size), fields), headers=headers)
 
 
 @review_router.put("/{review_id}", response_model=dict)
@@ -127,6 +152,7 @@ async def update_review(
         raise HTTPException(status_code=403, detail="You don't have permission to update this review")
     
     # Update rating if provided
+    updates = {}
     if "rating" in review_update:
         rating_data = review_update["rating"]
         
@@ -144,30 +170,45 @@ async def update_review(
             privacy=privacy,
             overall=overall
         )
+        updates["rating"] = review.rating.dict()
     
     # Update comment if provided
     if "comment" in review_update:
         review.comment = review_update["comment"]
+        updates["comment"] = review.comment
     
-    # Save changes
-    await review.save()
-    
-    # Update spot's average rating
-    spot = await HammockSpot.get(review.spot_id)
-    if spot:
-        # Recalculate average rating
-        total_rating = 0
-        for r in spot.reviews:
-            if str(r.id) == review_id:
-                # Use updated rating
-                total_rating += review.rating.overall
-            else:
-                total_rating += r.rating.overall
-        
-        spot.avg_rating = total_rating / len(spot.reviews)
-        await spot.save()
+    # Save changes, reading back the stored rating so the spot gets the exact delta
+    review.updated_at = datetime.now()
+    updates["updated_at"] = review.updated_at
+    update = {"$set": updates}
+    if "rating" in updates:
+        update["$inc"] = {"rating_version": 1}
+    before = await Review.get_motor_collection().find_one_and_update(
+        {"_id": review.id},
+        update,
+        projection={"rating": 1, "rating_version": 1},
+        return_document=ReturnDocument.BEFORE
+    )
+    if before is None:
+        raise HTTPException(status_code=404, detail="Review not found")
+    
+    # Apply the rating change to the spot's aggregates in the background. Every version is
+    # enqueued, unchanged ratings included, so the spot sees them without gaps.
+    if "rating" in updates:
+        version = before.get("rating_version", 0) + 1
+        await enqueue(
+            ReviewRatingChanged(
+                spot_id=review.spot_id,
+                count_delta=0,
+                delta=rating_delta(Rating(**before["rating"]), review.rating),
+                review_id=str(review.id),
+                version=version,
+                counted="rating_version" not in before
+            ),
+            idempotency_key=f"review-rated:{review.id}:{version}"
+        )
     
-    return review.to_response_model()
+    return json_response(review.to_response_model())
 
 
 @review_router.delete("/{review_id}")
@@ -185,26 +226,24 @@ async def delete_review(
     if review.user_id != str(current_user.id):
         raise HTTPException(status_code=403, detail="You don't have permission to delete this review")
     
-    # Get spot for updating ratings
-    spot_id = review.spot_id
-    spot = await HammockSpot.get(spot_id)
-    
-    # Delete review
-    await review.delete()
+    # Delete review; only the request that actually removed it updates the spot, with the
+    # rating and version it was deleted at
+    deleted = await Review.get_motor_collection().find_one_and_delete(
+        {"_id": review.id}, projection={"spot_id": 1, "rating": 1, "rating_version": 1}
+    )
     
-    # Update spot's reviews and average rating
-    if spot:
-        # Remove review from spot
-        spot.reviews = [r for r in spot.reviews if str(r.id) != review_id]
-        
-        # Recalculate average rating
-        if spot.reviews:
-            total_rating = sum(r.rating.overall for r in spot.reviews)
-            spot.avg_rating = total_rating / len(spot.reviews)
-        else:
-            spot.avg_rating = 0
-        
-        await spot.save()
+    if deleted is not None:
+        await enqueue(
+            ReviewRatingChanged(
+                spot_id=deleted["spot_id"],
+                count_delta=-1,
+                delta=rating_delta(Rating(**deleted["rating"]), None),
+                review_id=str(review.id),
+                version=deleted.get("rating_version", 0) + 1,
+                counted="rating_version" not in deleted
+            ),
+            idempotency_key=f"review-deleted:{review.id}"
+        )
     
     return {"message": "Review deleted successfully"}
 
@@ -226,19 +265,15 @@ async def upload_review_photo(
         raise HTTPException(status_code=403, detail="You don't have permission to add photos to this review")
     
     # Upload photo
-    file_content = await file.read()
-    path = f"review_photos/{review.spot_id}/{current_user.id}/{ObjectId()}"
-    url = await upload_file_to_firebase(
-        file_content, 
-        path, 
-        file.content_type or "image/jpeg"
-    )
+    photo = await upload_photo(file)
     
-    # Add to review's photos
-    if review.photos is None:
-        review.photos = []
-    
-    review.photos.append(url)
-    await review.save()
+    # Add to review's photos without writing back a rating update_review may be changing
+    await Review.get_motor_collection().update_one(
+        {"_id": review.id},
+        {
+            "$push": {"photos": photo.original, "photo_variants": photo.dict()},
+            "$set": {"updated_at": datetime.now()}
+        }
+    )
     
-    return {"url": url}
\ No newline at end of file
+    return {"url": photo.original, "variants": photo.dict()}
\ No newline at end of file
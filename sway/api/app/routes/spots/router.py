@@ -1,47 +1,243 @@
 # app/routes/spots/router.py
-from fastapi import APIRouter, Depends, HTTPException, Query, Body, File, UploadFile, Form
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Body, File, UploadFile, Form, Request, Response
+from typing import List, Optional, Set
 import json
+from datetime import datetime, timedelta
 from bson.objectid import ObjectId
-from app.models.hammock_spot import HammockSpot, TreeType, Coordinates, Amenities
-from app.models.review import Review
+from app.models.hammock_spot import HammockSpot, TreeType, Coordinates, GeoPoint, Amenities, SPOT_RESPONSE_FIELDS
+from app.models.review import Review, REVIEW_RESPONSE_FIELDS
 from app.models.user import User
-from app.dependencies.auth import get_current_user, upload_file_to_firebase
+from app.models.spot_tombstone import SpotTombstone, SpotPurge
+from app.dependencies.auth import get_current_user
+from app.jobs import enqueue, SpotCreated, SpotMoved, SpotDeleted
+from app.utils.helpers.uploads import check_image_upload
+from app.utils.storage.photos import upload_photo, upload_photos
+from app.utils.helpers.cursor import decode_cursor, build_page, next_cursor_headers, NUMBER
+from app.utils.helpers.fields import sparse_fields, fields_projection, trim_fields
+from app.utils.responses import json_response, dump_json
+from app.utils.helpers.http_cache import (
+    VERSION_FIELDS, document_etag, matches_if_none_match, cache_headers, not_modified
+)
+from app.utils.helpers.geo import EARTH_RADIUS_METERS, haversine_meters
+from app.utils.helpers.clustering import find_clusters, count_viewport_cells
+from app.config import (
+    CLUSTER_MAX_ZOOM, CLUSTER_MAX_CELLS_PER_REQUEST, TILE_MAX_ZOOM, SPOT_TOMBSTONE_RETENTION_DAYS,
+    SPOT_SEARCH_CACHE_MAX_CANDIDATES
+)
+from app.utils.helpers.spot_changes import find_spot_changes
+from app.utils.helpers.spot_purge import photo_urls
+from app.utils.helpers.spot_tiles import get_spot_tile, invalidate_spot_tiles
+from app.utils.helpers.spot_search_cache import (
+    snap_search_area, get_cached_search, cache_search, get_cached_candidates, cache_candidates,
+    invalidate_spot_search, SearchArea, Candidate
+)
 
 # Initialize router
 spot_router = APIRouter(prefix="/spots", tags=["spots"])
 
 
+def _invalidate_cached_listings(points):
+    """Drop cached searches and map tiles covering any of the (lat, lng) points"""
+    invalidate_spot_search(points)
+    invalidate_spot_tiles(points)
+
+
+async def _find_spots_by_distance(
+    lng: float,
+    lat: float,
+    radius: float,
+    query: dict,
+    limit: int,
+    cursor: Optional[str],
+    projection: Optional[dict] = None
+):
+    """
+    Page through spots ordered by (distance, _id) using $geoNear.
+
+    The cursor's distance becomes $geoNear's minDistance, so every page is an
+    index walk that starts where the previous page ended instead of a skip().
+    """
+    last_distance, last_id = decode_cursor(cursor, "distance", (NUMBER, ObjectId)) if cursor else (None, None)
+
+    def pipeline(min_distance, max_distance, fetch):
+        geo_near = {
+            "near": {"type": "Point", "coordinates": [lng, lat]},
+            "key": "location",
+            "distanceField": "distance",
+            "maxDistance": max_distance,
+            "spherical": True,
+            "query": query
+        }
+        stages = [{"$geoNear": geo_near}]
+        if min_distance is not None:
+            geo_near["minDistance"] = min_distance
+            if min_distance == last_distance:
+                # minDistance is inclusive, so only ties with the last item need the _id tiebreak
+                stages.append({"$match": {"$or": [
+                    {"distance": {"$gt": last_distance}},
+                    {"_id": {"$gt": last_id}}
+                ]}})
+        if fetch is not None:
+            stages.append({"$limit": fetch})
+        if projection:
+            stages.append({"$project": projection})
+        return stages
+
+    collection = HammockSpot.get_motor_collection()
+    docs = await collection.aggregate(pipeline(last_distance, radius, limit + 1)).to_list(length=None)
+    docs.sort(key=lambda d: (d["distance"], d["_id"]))
+
+    # $geoNear does not order exact distance ties by _id. If the page boundary falls
+    # inside a tie, load the whole tie group so no tied spot is skipped or repeated.
+    if len(docs) > limit and docs[limit]["distance"] == docs[limit - 1]["distance"]:
+        boundary = docs[limit]["distance"]
+        ties = await collection.aggregate(pipeline(boundary, boundary, None)).to_list(length=None)
+        docs = [d for d in docs if d["distance"] < boundary] + sorted(ties, key=lambda d: d["_id"])
+
+    return build_page(docs, limit, "distance", lambda d: d["distance"])
+
+
+async def _find_spots_by_rating(
+    query: dict,
+    limit: int,
+    cursor: Optional[str],
+    projection: Optional[dict] = None
+):
+    """Page through spots ordered by (avg_rating, _id) descending using the compound index"""
+    if cursor:
+        last_rating, last_id = decode_cursor(cursor, "rating", (NUMBER, ObjectId))
+        query = {"$and": [query, {"$or": [
+            {"avg_rating": {"$lt": last_rating}},
+            {"avg_rating": last_rating, "_id": {"$lt": last_id}}
+        ]}]}
+
+    docs = await HammockSpot.get_motor_collection().find(query, projection) \
+        .sort([("avg_rating", -1), ("_id", -1)]) \
+        .limit(limit + 1) \
+        .to_list(length=None)
+
+    return build_page(docs, limit, "rating", lambda d: d["avg_rating"])
+
+
+async def _load_search_candidates(area: SearchArea, query: dict) -> Optional[List[Candidate]]:
+    """Location, rating and _id of the spots matching query in a search area, or None if too many"""
+    docs = await HammockSpot.get_motor_collection().find(
+        {**query, "location": {
+            "$geoWithin": {"$centerSphere": [[area.lng, area.lat], area.radius / EARTH_RADIUS_METERS]}
+        }},
+        {"coordinates": 1, "avg_rating": 1}
+    ).limit(SPOT_SEARCH_CACHE_MAX_CANDIDATES + 1).to_list(length=None)
+    if len(docs) > SPOT_SEARCH_CACHE_MAX_CANDIDATES:
+        return None
+    return [
+        (doc["coordinates"]["latitude"], doc["coordinates"]["longitude"], doc.get("avg_rating", 0), doc["_id"])
+        for doc in docs
+    ]
+
+
+async def _page_search_candidates(
+    candidates: List[Candidate],
+    lat: float,
+    lng: float,
+    radius: float,
+    sort: str,
+    limit: int,
+    cursor: Optional[str],
+    projection: Optional[dict] = None
+):
+    """
+    Page through the cached candidates of a search area within radius of (lat, lng),
+    in the same order and with the same cursors as _find_spots_by_distance and
+    _find_spots_by_rating. Only the spots of the page are read from MongoDB.
+    """
+    matches = []
+    for spot_lat, spot_lng, avg_rating, spot_id in candidates:
+        distance = haversine_meters(lat, lng, spot_lat, spot_lng)
+        if distance <= radius:
+            matches.append({"_id": spot_id, "distance": distance, "avg_rating": avg_rating})
+
+    sort_field = "distance" if sort == "distance" else "avg_rating"
+    key = lambda d: (d[sort_field], d["_id"])
+    # Distances ascend, ratings descend, both with _id as the tiebreak
+    matches.sort(key=key, reverse=sort != "distance")
+    if cursor:
+        last = tuple(decode_cursor(cursor, sort, (NUMBER, ObjectId)))
+        if sort == "distance":
+            matches = [d for d in matches if key(d) > last]
+        else:
+            matches = [d for d in matches if key(d) < last]
+    page, next_cursor = build_page(matches[:limit + 1], limit, sort, lambda d: d[sort_field])
+
+    docs = await HammockSpot.get_motor_collection().find(
+        {"_id": {"$in": [d["_id"] for d in page]}}, projection
+    ).to_list(length=None)
+    by_id = {doc["_id"]: doc for doc in docs}
+    results = []
+    for match in page:
+        doc = by_id.get(match["_id"])
+        if doc is None:
+            # Deleted since the candidates were cached
+            continue
+        if sort == "distance":
+            doc["distance"] = match["distance"]
+        results.append(doc)
+    return results, next_cursor
+
+
 @spot_router.get("/", response_model=List[dict])
 async def get_spots(
     lat: Optional[float] = Query(None, description="Latitude coordinate for center of search"),
     lng: Optional[float] = Query(None, description="Longitude coordinate for center of search"),
     radius: Optional[float] = Query(5000.0, description="Search radius in meters"),
-    limit: int = Query(20, ge=1, le=100, description="Maximum number of results to return"),
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of results per page"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header of the previous page"),
+    sort: Optional[str] = Query(
+        None,
+        pattern="^(distance|rating)$",
+        description="Sort by distance (default when lat/lng are given) or rating"
+    ),
     tree_type: Optional[str] = Query(None, description="Filter by tree type"),
     min_rating: Optional[float] = Query(None, description="Minimum average rating"),
     has_amenity: Optional[List[str]] = Query(None, description="Filter by amenities"),
+    fields: Optional[Set[str]] = Depends(sparse_fields(SPOT_RESPONSE_FIELDS + ("distance",))),
+    photo_size: str = Query(
+        "thumbnail",
+        pattern="^(thumbnail|medium|full|original)$",
+        description="Size of the returned photo URLs: thumbnail, medium, full (WebP) or original"
+    ),
     current_user: User = Depends(get_current_user)
 ):
     """
     Get hammock spots with optional filtering by location, ratings, and amenities.
     If lat and lng are provided, returns spots within the specified radius.
+    The body is a list of spots. When more follow, the X-Next-Cursor response header
+    holds an opaque cursor to pass back as `cursor` for the following page. `fields` limits each item to the listed fields.
+    Photo URLs are thumbnails unless another `photo_size` is requested.
     """
-    query = {}
+    has_location = lat is not None and lng is not None
+    sort = sort or ("distance" if has_location else "rating")
+    if sort == "distance" and not has_location:
+        raise HTTPException(status_code=400, detail="Sorting by distance requires lat and lng")
+
+    # Serve repeated searches without a location from the response cache
+    cache_key = None
+    if not has_location:
+        cache_key = (
+            tree_type,
+            min_rating,
+            tuple(sorted(has_amenity or [])),
+            sort,
+            limit,
+            cursor,
+            tuple(sorted(fields)) if fields else None,
+            photo_size
+        )
+        cached = get_cached_search(cache_key)
+        if cached is not None:
+            body, next_cursor = cached
+            return json_response(body, headers=next_cursor_headers(next_cursor))
     
-    # Add location-based filtering if coordinates are provided
-    if lat is not None and lng is not None:
-        # Use MongoDB geospatial query with $nearSphere
-        # First ensure there's a geospatial index on the coordinates field
-        query["location"] = {
-            "$nearSphere": {
-                "$geometry": {
-                    "type": "Point",
-                    "coordinates": [lng, lat]  # Note: GeoJSON format is [longitude, latitude]
-                },
-                "$maxDistance": radius
-            }
-        }
+    query = {}
     
     # Add tree type filter
     if tree_type:
@@ -56,11 +252,49 @@ async def get_spots(
         for amenity in has_amenity:
             query[f"amenities.{amenity}"] = True
     
-    # Execute query
-    spots = await HammockSpot.find(query).limit(limit).to_list()
+    # Radius searches share one cached candidate list per tile and radius bucket
+    candidates = None
+    area = snap_search_area(lat, lng, radius) if has_location else None
+    if area:
+        candidates_key = (area.tile, area.bucket, tree_type, min_rating, tuple(sorted(has_amenity or [])))
+        cached, candidates = get_cached_candidates(candidates_key)
+        if not cached:
+            candidates = await _load_search_candidates(area, query)
+            cache_candidates(candidates_key, area, candidates)
+    
+    # Execute query, reading only the requested fields plus the keyset sort key
+    if candidates is not None:
+        projection = fields_projection(fields, computed=["distance"])
+        docs, next_cursor = await _page_search_candidates(
+            candidates, lat, lng, radius, sort, limit, cursor, projection
+        )
+    elif sort == "distance":
+        # $geoNear is served by the 2dsphere index on the GeoJSON location field
+        projection = fields_projection(fields, required=["distance"], computed=["distance"])
+        docs, next_cursor = await _find_spots_by_distance(lng, lat, radius, query, limit, cursor, projection)
+    else:
+        if has_location:
+            # Note: GeoJSON format is [longitude, latitude]
+            query["location"] = {
+                "$geoWithin": {"$centerSphere": [[lng, lat], radius / EARTH_RADIUS_METERS]}
+            }
+        projection = fields_projection(fields, required=["avg_rating"], computed=["distance"])
+        docs, next_cursor = await _find_spots_by_rating(query, limit, cursor, projection)
     
     # Convert to response format
-    return [spot.to_response_model() for spot in spots]
+    items = []
+    for doc in docs:
+        item = HammockSpot.response_from_doc(doc, photo_size)
+        if "distance" in doc:
+            item["distance"] = doc["distance"]
+        items.append(trim_fields(item, fields))
+    
+    # Cache the encoded body so hits skip serialization too
+    body = dump_json(items)
+    if cache_key is not None:
+        cache_search(cache_key, body, next_cursor)
+    
+    return json_response(body, headers=next_cursor_headers(next_cursor))
 
 
 @spot_router.post("/", response_model=dict)
@@ -105,55 +339,203 @@ async def create_spot(
         swimming=amenities_dict.get("swimming", False)
     )
     
-    # Upload photos if any
-    photo_urls = []
-    for i, photo in enumerate(photos):
-        if photo.filename:
-            file_content = await photo.read()
-            path = f"spot_photos/{current_user.id}/{ObjectId()}-{i}"
-            url = await upload_file_to_firebase(
-                file_content, 
-                path, 
-                photo.content_type or "image/jpeg"
-            )
-            photo_urls.append(url)
+    # Reject oversized or non-image files before anything is uploaded
+    photos = [photo for photo in photos if photo.filename]
+    content_types = [await check_image_upload(photo) for photo in photos]
+    
+    # Upload photos and their variants if any, concurrently and streamed from the spooled upload files
+    uploaded = await upload_photos(list(zip(photos, content_types)))
     
     # Create spot
+    now = datetime.now()
     spot = HammockSpot(
         name=name,
         description=description,
         coordinates=coordinates,
+        location=GeoPoint.from_coordinates(coordinates),
         tree_types=valid_tree_types,
         distance_between_trees=distance_between_trees,
         amenities=amenities_obj,
-        photos=photo_urls,
+        photos=[photo.original for photo in uploaded],
+        photo_variants=uploaded,
         creator_id=str(current_user.id),
         creator_username=current_user.username,
-        is_private=is_private
+        is_private=is_private,
+        created_at=now,
+        updated_at=now
     )
     
     # Save to database
     await spot.insert()
+    _invalidate_cached_listings([(latitude, longitude)])
     
-    # Update user's created spots
-    if current_user.created_spots is None:
-        current_user.created_spots = []
-    current_user.created_spots.append(str(spot.id))
-    await current_user.save()
+    # Clusters and the user's created spots are updated in the background
+    await enqueue(SpotCreated(
+        spot_id=str(spot.id),
+        creator_id=str(current_user.id),
+        creator_uid=current_user.firebase_uid,
+        latitude=latitude,
+        longitude=longitude,
+        avg_rating=spot.avg_rating
+    ), idempotency_key=f"spot-created:{spot.id}")
     
-    return spot.to_response_model()
+    return json_response(spot.to_response_model())
+
+
+@spot_router.get("/clusters", response_model=dict)
+async def get_spot_clusters(
+    bbox: str = Query(..., description="Viewport as minLng,minLat,maxLng,maxLat"),
+    zoom: int = Query(..., ge=0, description="Map zoom level"),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get precomputed spot clusters for a map viewport.
+    Each cluster has a spot count, centroid and its top-rated spot.
+    Zoom levels above the deepest precomputed level use that level.
+    """
+    try:
+        min_lng, min_lat, max_lng, max_lat = [float(v) for v in bbox.split(",")]
+    except ValueError:
+        raise HTTPException(status_code=400, detail="bbox must be minLng,minLat,maxLng,maxLat")
+    
+    if not (-90 <= min_lat <= max_lat <= 90) or not (-180 <= min_lng <= 180 and -180 <= max_lng <= 180):
+        raise HTTPException(status_code=400, detail="bbox is out of range")
+    
+    zoom = min(zoom, CLUSTER_MAX_ZOOM)
+    if count_viewport_cells(min_lng, min_lat, max_lng, max_lat, zoom) > CLUSTER_MAX_CELLS_PER_REQUEST:
+        raise HTTPException(status_code=400, detail="bbox is too large for this zoom level")
+    
+    clusters = await find_clusters(min_lng, min_lat, max_lng, max_lat, zoom)
+    
+    return json_response({
+        "zoom": zoom,
+        "clusters": [cluster.to_response_model() for cluster in clusters if cluster.spot_count > 0]
+    })
+
+
+@spot_router.get("/changes", response_model=dict)
+async def get_spot_changes(
+    since: datetime = Query(..., description="watermark from the previous sync"),
+    limit: int = Query(500, ge=1, le=1000, description="Maximum number of changes per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor value from the previous page"),
+    photo_size: str = Query(
+        "thumbnail",
+        pattern="^(thumbnail|medium|full|original)$",
+        description="Size of the returned photo URLs: thumbnail, medium, full (WebP) or original"
+    ),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Get spots created, updated or deleted since a watermark, oldest change first.
+    Page with `next_cursor` until it is null, then keep `watermark` for the next
+    sync. A watermark older than the tombstone retention gets 410: reload all spots.
+    """
+    if since.tzinfo is not None:
+        # Stored timestamps are naive local time
+        since = since.astimezone().replace(tzinfo=None)
+    if since < datetime.now() - timedelta(days=SPOT_TOMBSTONE_RETENTION_DAYS):
+        raise HTTPException(status_code=410, detail="Watermark is too old, reload all spots")
+    
+    changes, next_cursor, watermark = await find_spot_changes(since, limit, cursor, photo_size)
+    
+    return json_response({
+        "items": changes,
+        "next_cursor": next_cursor,
+        "watermark": watermark if next_cursor is None else None
+    })
+
+
+@spot_router.get("/tiles/{z}/{x}/{y}.mvt")
+async def get_spot_tile_mvt(z: int, x: int, y: int):
+    """
+    Get a Mapbox Vector Tile of hammock spots.
+    Zoomed-out tiles contain a "clusters" layer, closer tiles a "spots" layer.
+    """
+    if not 0 <= z <= TILE_MAX_ZOOM:
+        raise HTTPException(status_code=400, detail=f"Zoom must be between 0 and {TILE_MAX_ZOOM}")
+    if not (0 <= x < 2 ** z and 0 <= y < 2 ** z):
+        raise HTTPException(status_code=400, detail="Tile coordinates are out of range")
+    
+    tile = await get_spot_tile(z, x, y)
+    
+    return Response(content=tile, media_type="application/vnd.mapbox-vector-tile")
 
 
 @spot_router.get("/{spot_id}", response_model=dict)
-async def get_spot(spot_id: str):
+async def get_spot(
+    spot_id: str,
+    request: Request,
+    fields: Optional[Set[str]] = Depends(sparse_fields(SPOT_RESPONSE_FIELDS)),
+    photo_size: str = Query(
+        "original",
+        pattern="^(thumbnail|medium|full|original)$",
+        description="Size of the returned photo URLs: thumbnail, medium, full (WebP) or original"
+    ),
+):
     """Get a specific hammock spot by ID"""
     try:
-        spot = await HammockSpot.get(spot_id)
-        if not spot:
-            raise HTTPException(status_code=404, detail="Spot not found")
-        return spot.to_response_model()
+        doc = await HammockSpot.get_motor_collection().find_one(
+            {"_id": ObjectId(spot_id)}, fields_projection(fields, required=VERSION_FIELDS)
+        )
     except Exception as e:
         raise HTTPException(status_code=404, detail=f"Spot not found: {str(e)}")
+    if not doc:
+        raise HTTPException(status_code=404, detail="Spot not found")
+    
+    # Repeat views are answered from the version alone, without serializing the spot
+    etag = document_etag(
+        doc["_id"], doc.get("updated_at"), doc.get("created_at"), (*(fields or ()), f"photo_size={photo_size}")
+    )
+    headers = cache_headers(etag, public=True)
+    if matches_if_none_match(request, etag):
+        return not_modified(headers)
+    return json_response(trim_fields(HammockSpot.response_from_doc(doc, photo_size), fields), headers=headers)
+
+
+@spot_router.get("/{spot_id}/reviews", response_model=dict)
+async def get_spot_reviews(
+    spot_id: str,
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of reviews per page"),
+    cursor: Optional[str] = Query(None, description="next_cursor value from the previous page"),
+    sort: str = Query("recent", pattern="^(recent|rating)$", description="Newest first or highest rated first"),
+    fields: Optional[Set[str]] = Depends(sparse_fields(REVIEW_RESPONSE_FIELDS)),
+    photo_size: str = Query(
+        "thumbnail",
+        pattern="^(thumbnail|medium|full|original)$",
+        description="Size of the returned photo URLs: thumbnail, medium, full (WebP) or original"
+    ),
+):
+    """Get the reviews of a hammock spot, paginated with opaque cursors"""
+    if not ObjectId.is_valid(spot_id) or not await HammockSpot.get_motor_collection().count_documents(
+        {"_id": ObjectId(spot_id)}, limit=1
+    ):
+        raise HTTPException(status_code=404, detail="Spot not found")
+    
+    # Both orderings are served by (spot_id, <sort field>, _id) indexes on reviews
+    if sort == "rating":
+        sort_field, sort_value, sort_type = "rating.overall", lambda d: d["rating"]["overall"], NUMBER
+    else:
+        sort_field, sort_value, sort_type = "created_at", lambda d: d["created_at"], datetime
+    
+    query = {"spot_id": spot_id}
+    if cursor:
+        last_value, last_id = decode_cursor(cursor, sort, (sort_type, ObjectId))
+        query["$or"] = [
+            {sort_field: {"$lt": last_value}},
+            {sort_field: last_value, "_id": {"$lt": last_id}}
+        ]
+    
+    projection = fields_projection(fields, required=[sort_field])
+    docs = await Review.get_motor_collection().find(query, projection) \
+        .sort([(sort_field, -1), ("_id", -1)]) \
+        .limit(limit + 1) \
+        .to_list(length=None)
+    docs, next_cursor = build_page(docs, limit, sort, sort_value)
+    
+    return json_response({
+        "items": [trim_fields(Review.response_from_doc(doc, photo_size), fields) for doc in docs],
+        "next_cursor": next_cursor
+    })
 
 
 @spot_router.put("/{spot_id}", response_model=dict)
@@ -177,15 +559,20 @@ async def update_spot(
         "distance_between_trees", "amenities", "is_private"
     ]
     
+    previous_point = (spot.coordinates.latitude, spot.coordinates.longitude)
+    changed = set()
+    
     for field in allowed_fields:
         if field in spot_update:
+            changed.add(field)
             # Special handling for nested fields
             if field == "coordinates" and spot_update.get("coordinates"):
                 coords_data = spot_update["coordinates"]
-                spot.coordinates = Coordinates(
+                spot.set_coordinates(Coordinates(
                     latitude=coords_data.get("latitude", spot.coordinates.latitude),
                     longitude=coords_data.get("longitude", spot.coordinates.longitude)
-                )
+                ))
+                changed.add("location")
             elif field == "amenities" and spot_update.get("amenities"):
                 amenities_data = spot_update["amenities"]
                 spot.amenities = Amenities(
@@ -208,10 +595,22 @@ async def update_spot(
     # Handle photos separately if needed
     # This would require file upload handling similar to the create endpoint
     
-    # Save changes
-    await spot.save()
+    # Save only the edited fields, so rating aggregates written by background jobs are kept
+    spot.updated_at = datetime.now()
+    await spot.set({field: getattr(spot, field) for field in changed | {"updated_at"}})
+    current_point = (spot.coordinates.latitude, spot.coordinates.longitude)
+    _invalidate_cached_listings([previous_point, current_point])
+    if current_point != previous_point:
+        await enqueue(SpotMoved(
+            spot_id=str(spot.id),
+            old_latitude=previous_point[0],
+            old_longitude=previous_point[1],
+            latitude=current_point[0],
+            longitude=current_point[1],
+            avg_rating=spot.avg_rating
+        ), idempotency_key=f"spot-moved:{spot.id}:{spot.updated_at.isoformat()}")
     
-    return spot.to_response_model()
+    return json_response(spot.to_response_model())
 
 
 @spot_router.delete("/{spot_id}")
@@ -228,13 +627,22 @@ async def delete_spot(
     if str(spot.creator_id) != str(current_user.id):
         raise HTTPException(status_code=403, detail="You don't have permission to delete this spot")
     
-    # Delete the spot
-    await spot.delete()
+    # Delete the spot and leave a tombstone for delta sync clients
+    result = await spot.delete()
+    if not result or not result.deleted_count:
+        # A concurrent request deleted it first and queued the cleanup
+        return {"message": "Spot deleted successfully"}
+    await SpotTombstone(spot_id=spot_id, purge=SpotPurge(
+        creator_id=str(spot.creator_id),
+        creator_uid=current_user.firebase_uid,
+        latitude=spot.coordinates.latitude,
+        longitude=spot.coordinates.longitude,
+        photo_urls=photo_urls([spot.dict()])
+    )).insert()
+    _invalidate_cached_listings([(spot.coordinates.latitude, spot.coordinates.longitude)])
     
-    # Remove from user's created spots
-    if spot_id in current_user.created_spots:
-        current_user.created_spots.remove(spot_id)
-        await current_user.save()
+    # Reviews, photos, user references and clusters are cleaned up in the background
+    await enqueue(SpotDeleted(spot_id=spot_id), idempotency_key=f"spot-deleted:{spot_id}")
     
     return {"message": "Spot deleted successfully"}
 
@@ -255,18 +663,16 @@ async def upload_spot_photo(
         raise HTTPException(status_code=403, detail="You don't have permission to add photos to this spot")
     
     # Upload photo
-    file_content = await file.read()
-    path = f"spot_photos/{current_user.id}/{ObjectId()}"
-    url = await upload_file_to_firebase(
-        file_content, 
-        path, 
-        file.content_type or "image/jpeg"
-    )
+    photo = await upload_photo(file)
     
-    # Add to spot's photos
-    if spot.photos is None:
-        spot.photos = []
-    spot.photos.append(url)
-    await spot.save()
+    # Add to spot's photos without rewriting fields other writers may have changed
+    await HammockSpot.get_motor_collection().update_one(
+        {"_id": spot.id},
+        {
+            "$push": {"photos": photo.original, "photo_variants": photo.dict()},
+            "$set": {"updated_at": datetime.now()}
+        }
+    )
+    invalidate_spot_search([(spot.coordinates.latitude, spot.coordinates.longitude)])
     
-    return {"url": url}
\ No newline at end of file
+    return {"url": photo.original, "variants": photo.dict()}
\ No newline at end of file
@@ -1,21 +1,109 @@
 # app/routes/users/router.py
-from fastapi import APIRouter, Depends, HTTPException, Body, File, UploadFile
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Body, File, UploadFile, Query, Request
+from typing import List, Optional, Set
+from datetime import datetime
 from bson.objectid import ObjectId
 from app.models.user import User
-from app.models.hammock_spot import HammockSpot
-from app.dependencies.auth import get_current_user, upload_file_to_firebase
+from app.models.hammock_spot import HammockSpot, SPOT_RESPONSE_FIELDS
+from app.dependencies.auth import get_current_user, update_user_document
+from app.jobs import enqueue, PruneUserSpots
+from app.utils.helpers.cursor import encode_cursor, decode_cursor, next_cursor_headers
+from app.utils.helpers.fields import sparse_fields, fields_projection, trim_fields
+from app.utils.responses import json_response
+from app.utils.helpers.http_cache import document_etag, matches_if_none_match, cache_headers, not_modified
+from app.utils.storage.photos import upload_photo
 
 # Initialize router
 user_router = APIRouter(prefix="/users", tags=["users"])
 
+# Fields spot listings never return
+_SPOT_LIST_PROJECTION = {"location": 0, "rating_totals": 0, "rating_versions": 0}
+
+
+def _resume_position(spot_ids: List[str], cursor: Optional[str], kind: str) -> int:
+    """Index in the user's list to continue from, robust to entries removed since the last page"""
+    if not cursor:
+        return 0
+    position, last_id = decode_cursor(cursor, kind, (int, str))
+    if position < 0:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if 0 < position <= len(spot_ids) and spot_ids[position - 1] == last_id:
+        return position
+    if last_id in spot_ids:
+        return spot_ids.index(last_id) + 1
+    return min(position, len(spot_ids))
+
+
+async def _load_spot_page(
+    spot_ids: List[str],
+    limit: int,
+    cursor: Optional[str],
+    kind: str,
+    fields: Optional[Set[str]] = None,
+    photo_size: str = "thumbnail"
+):
+    """
+    Load one page of a user's spot ID list, keeping the list's order
+
+    Each pass fetches the remaining slots of the page with a single $in query,
+    so dangling IDs only cost an extra pass instead of a round-trip per spot.
+
+    Args:
+        spot_ids: favorite_spots or created_spots of the user
+        limit: Page size
+        cursor: X-Next-Cursor header of the previous page
+        kind: Name of the list, stored in the cursor
+        fields: Sparse fieldset, or None for every field
+        photo_size: Size of the returned photo URLs
+
+    Returns:
+        tuple: (spot response dicts, next cursor or None, IDs that no longer resolve to a spot)
+    """
+    position = _resume_position(spot_ids, cursor, kind)
+    items, missing = [], []
+    collection = HammockSpot.get_motor_collection()
+    projection = fields_projection(fields) or _SPOT_LIST_PROJECTION
+
+    while len(items) < limit and position < len(spot_ids):
+        window = spot_ids[position:position + limit - len(items)]
+        position += len(window)
+
+        object_ids = [ObjectId(spot_id) for spot_id in window if ObjectId.is_valid(spot_id)]
+        docs = await collection.find({"_id": {"$in": object_ids}}, projection) \
+            .to_list(length=None) if object_ids else []
+        by_id = {str(doc["_id"]): doc for doc in docs}
+
+        for spot_id in window:
+            doc = by_id.get(spot_id)
+            if doc is None:
+                missing.append(spot_id)
+            else:
+                items.append(trim_fields(HammockSpot.response_from_doc(doc, photo_size), fields))
+
+    next_cursor = None
+    if position < len(spot_ids):
+        next_cursor = encode_cursor(kind, position, spot_ids[position - 1])
+    return items, next_cursor, missing
+
 
 @user_router.get("/me", response_model=dict)
 async def get_current_user_profile(
+    request: Request,
+    photo_size: str = Query(
+        "original",
+        pattern="^(thumbnail|medium|full|original)$",
+        description="Size of the returned photo URLs: thumbnail, medium, full (WebP) or original"
+    ),
     current_user: User = Depends(get_current_user)
 ):
     """Get the current user's profile"""
-    return current_user.to_response_model()
+    etag = document_etag(
+        current_user.id, current_user.updated_at, current_user.created_at, [f"photo_size={photo_size}"]
+    )
+    headers = cache_headers(etag, public=False)
+    if matches_if_none_match(request, etag):
+        return not_modified(headers)
+    return json_response(current_user.to_response_model(photo_size), headers=headers)
 
 
 @user_router.put("/me", response_model=dict)
@@ -26,15 +114,18 @@ async def update_user_profile(
     """Update the current user's profile"""
     # Filter allowed fields
     allowed_fields = ["username", "bio"]
+    changes = {}
     
     for field in allowed_fields:
         if field in profile_update:
             setattr(current_user, field, profile_update[field])
+            changes[field] = profile_update[field]
     
     # Save changes
-    await current_user.save()
+    current_user.updated_at = changes["updated_at"] = datetime.now()
+    await update_user_document(current_user.id, current_user.firebase_uid, {"$set": changes})
     
-    return current_user.to_response_model()
+    return json_response(current_user.to_response_model())
 
 
 @user_router.post("/me/profile-photo", response_model=dict)
@@ -43,20 +134,16 @@ async def upload_profile_photo(
     current_user: User = Depends(get_current_user)
 ):
     """Upload a profile photo"""
-    # Upload photo to Firebase
-    file_content = await file.read()
-    path = f"profile_photos/{current_user.id}/{ObjectId()}"
-    url = await upload_file_to_firebase(
-        file_content, 
-        path, 
-        file.content_type or "image/jpeg"
-    )
+    # Upload photo, unless the same image is already stored
+    photo = await upload_photo(file)
     
     # Update user profile
-    current_user.profile_photo = url
-    await current_user.save()
+    await update_user_document(current_user.id, current_user.firebase_uid, {"$set": {
+        "profile_photo": photo.original,
+        "profile_photo_variants": photo.dict()
+    }})
     
-    return {"url": url}
+    return {"url": photo.original, "variants": photo.dict()}
 
 
 @user_router.post("/favorites/{spot_id}")
@@ -71,12 +158,10 @@ async def add_favorite(
         raise HTTPException(status_code=404, detail="Spot not found")
     
     # Add to favorites if not already there
-    if current_user.favorite_spots is None:
-        current_user.favorite_spots = []
-        
-    if spot_id not in current_user.favorite_spots:
-        current_user.favorite_spots.append(spot_id)
-        await current_user.save()
+    if spot_id not in (current_user.favorite_spots or []):
+        await update_user_document(current_user.id, current_user.firebase_uid, {
+            "$addToSet": {"favorite_spots": spot_id}
+        })
     
     return {"message": "Spot added to favorites"}
 
@@ -89,49 +174,56 @@ async def remove_favorite(
     """Remove a spot from user's favorites"""
     # Check if in favorites
     if current_user.favorite_spots and spot_id in current_user.favorite_spots:
-        current_user.favorite_spots.remove(spot_id)
-        await current_user.save()
+        await update_user_document(current_user.id, current_user.firebase_uid, {
+            "$pull": {"favorite_spots": spot_id}
+        })
     
     return {"message": "Spot removed from favorites"}
 
 
 @user_router.get("/favorites", response_model=List[dict])
 async def get_favorites(
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of spots per page"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header of the previous page"),
+    fields: Optional[Set[str]] = Depends(sparse_fields(SPOT_RESPONSE_FIELDS)),
+    photo_size: str = Query(
+        "thumbnail",
+        pattern="^(thumbnail|medium|full|original)$",
+        description="Size of the returned photo URLs: thumbnail, medium, full (WebP) or original"
+    ),
     current_user: User = Depends(get_current_user)
 ):
-    """Get user's favorite spots"""
-    if not current_user.favorite_spots:
-        return []
-    
-    favorites = []
-    for spot_id in current_user.favorite_spots:
-        try:
-            spot = await HammockSpot.get(spot_id)
-            if spot:
-                favorites.append(spot.to_response_model())
-        except:
-            # Skip spots that couldn't be found
-            pass
+    """Get user's favorite spots, in the order they were added; X-Next-Cursor points to the next page"""
+    items, next_cursor, missing = await _load_spot_page(
+        current_user.favorite_spots or [], limit, cursor, "favorites", fields, photo_size
+    )
+    if missing:
+        await enqueue(PruneUserSpots(
+            user_id=str(current_user.id), firebase_uid=current_user.firebase_uid, field="favorite_spots", spot_ids=missing
+        ))
     
-    return favorites
+    return json_response(items, headers=next_cursor_headers(next_cursor))
 
 
 @user_router.get("/spots", response_model=List[dict])
 async def get_user_spots(
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of spots per page"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor header of the previous page"),
+    fields: Optional[Set[str]] = Depends(sparse_fields(SPOT_RESPONSE_FIELDS)),
+    photo_size: str = Query(
+        "thumbnail",
+        pattern="^(thumbnail|medium|full|original)$",
+        description="Size of the returned photo URLs: thumbnail, medium, full (WebP) or original"
+    ),
     current_user: User = Depends(get_current_user)
 ):
-    """Get spots created by the current user"""
-    if not current_user.created_spots:
-        return []
-    
-    user_spots = []
-    for spot_id in current_user.created_spots:
-        try:
-            spot = await HammockSpot.get(spot_id)
-            if spot:
-                user_spots.append(spot.to_response_model())
-        except:
-            # Skip spots that couldn't be found
-            pass
+    """Get spots created by the current user, in the order they were created; X-Next-Cursor points to the next page"""
+    items, next_cursor, missing = await _load_spot_page(
+        current_user.created_spots or [], limit, cursor, "created", fields, photo_size
+    )
+    if missing:
+        await enqueue(PruneUserSpots(
+            user_id=str(current_user.id), firebase_uid=current_user.firebase_uid, field="created_spots", spot_ids=missing
+        ))
     
-    return user_spots
\ No newline at end of file
+    return json_response(items, headers=next_cursor_headers(next_cursor))
@@ -0,0 +1,52 @@
+# app/utils/body_limit.py
+"""
+ASGI middleware capping the size of request bodies.
+
+Requests announcing a larger Content-Length are rejected before any of the body
+is read. Bodies without a Content-Length (chunked transfer) are counted while
+they stream in and aborted as soon as they pass the limit, so an oversized
+upload is never spooled to disk in full.
+"""
+from fastapi import HTTPException
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+
+class BodySizeLimitMiddleware:
+    def __init__(self, app: ASGIApp, max_body_size: int):
+        self.app = app
+        self.max_body_size = max_body_size
+
+    def _too_large(self) -> str:
+        return f"Request body is larger than {self.max_body_size / (1024 * 1024):g} MB"
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        for name, value in scope.get("headers", []):
+            if name == b"content-length":
+                try:
+                    too_large = int(value) > self.max_body_size
+                except ValueError:
+                    too_large = False
+                if too_large:
+                    response = JSONResponse({"detail": self._too_large()}, status_code=413)
+                    await response(scope, receive, send)
+                    return
+                break
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > self.max_body_size:
+                    # Raised inside body parsing, so FastAPI turns it into a 413 response
+                    raise HTTPException(status_code=413, detail=self._too_large())
+            return message
+
+        await self.app(scope, limited_receive, send)
@@ -1,11 +1,11 @@
 # app/utils/firebase/__init__.py
 from .auth import initialize_firebase, verify_firebase_token, get_firebase_user
-from .storage import upload_file_to_storage, delete_file_from_storage
+from .executor import run_firebase_call, shutdown_firebase_executor
 
 __all__ = [
     'initialize_firebase',
     'verify_firebase_token',
     'get_firebase_user',
-    'upload_file_to_storage',
-    'delete_file_from_storage'
+    'run_firebase_call',
+    'shutdown_firebase_executor'
 ]
\ No newline at end of file
@@ -18,12 +18,13 @@ def initialize_firebase():
             'storageBucket': os.getenv('FIREBASE_STORAGE_BUCKET', 'sway-6f710.appspot.com')
         })
 
-def verify_firebase_token(token: str):
+def verify_firebase_token(token: str, check_revoked: bool = False):
     """
     Verify Firebase ID token and return decoded token
     
     Args:
         token: Firebase ID token
+        check_revoked: Also check that the token was not revoked (extra network call)
         
     Returns:
         dict: Decoded token data
@@ -36,7 +37,7 @@ def verify_firebase_token(token: str):
         initialize_firebase()
         
         # Verify token
-        decoded_token = auth.verify_id_token(token)
+        decoded_token = auth.verify_id_token(token, check_revoked=check_revoked)
         
         return decoded_token
     except Exception as e:
@@ -0,0 +1,102 @@
+# app/utils/firebase/executor.py
+"""
+Dedicated, size-limited thread pool for the blocking Firebase Admin SDK.
+
+Token verification, user lookups and Storage transfers are synchronous network
+calls. Running them here keeps them off the event loop, and the pool's own
+limit keeps one slow Storage upload from starving every other request. Calls
+beyond the worker count wait in a bounded queue; once that is full callers get
+a 503 instead of piling up.
+"""
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+from fastapi import HTTPException
+from app.config import (
+    FIREBASE_EXECUTOR_WORKERS, FIREBASE_EXECUTOR_MAX_QUEUE, FIREBASE_CALL_TIMEOUT
+)
+from app.utils.metrics import metrics
+
+_executor = ThreadPoolExecutor(max_workers=FIREBASE_EXECUTOR_WORKERS, thread_name_prefix="firebase")
+_lock = threading.Lock()
+_submitted = 0  # Queued plus running
+_running = 0
+
+
+def _stats() -> dict:
+    return {
+        "workers": FIREBASE_EXECUTOR_WORKERS,
+        "max_queue": FIREBASE_EXECUTOR_MAX_QUEUE,
+        "running": _running,
+        "queue_depth": max(0, _submitted - _running)
+    }
+
+
+metrics.register_gauge("firebase_executor", _stats)
+
+
+def _release(_future):
+    global _submitted
+    with _lock:
+        _submitted -= 1
+
+
+async def run_firebase_call(fn: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+    """
+    Run a blocking Firebase Admin SDK call on the Firebase thread pool
+
+    Args:
+        fn: Blocking function to call
+        args: Positional arguments for fn
+        timeout: Seconds to wait for the result (defaults to FIREBASE_CALL_TIMEOUT)
+        kwargs: Keyword arguments for fn
+
+    Returns:
+        Whatever fn returns
+
+    Raises:
+        HTTPException: 503 if the queue is full, 504 on timeout, or whatever fn raises
+    """
+    global _submitted
+    with _lock:
+        if _submitted >= FIREBASE_EXECUTOR_WORKERS + FIREBASE_EXECUTOR_MAX_QUEUE:
+            metrics.increment("firebase_executor.rejected")
+            raise HTTPException(status_code=503, detail="Firebase is busy, please retry")
+        _submitted += 1
+
+    queued_at = time.perf_counter()
+
+    def call():
+        global _running
+        started_at = time.perf_counter()
+        metrics.observe("firebase_executor.queue_wait", started_at - queued_at)
+        with _lock:
+            _running += 1
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            with _lock:
+                _running -= 1
+            metrics.observe(f"firebase.{fn.__name__}", time.perf_counter() - started_at)
+
+    future = _executor.submit(call)
+    future.add_done_callback(_release)
+
+    try:
+        return await asyncio.wait_for(
+            asyncio.wrap_future(future),
+            FIREBASE_CALL_TIMEOUT if timeout is None else timeout
+        )
+    except asyncio.TimeoutError:
+        # A call that already started keeps its worker until the SDK returns,
+        # which is what keeps the pool bounded; a queued one is dropped here
+        future.cancel()
+        metrics.increment("firebase_executor.timeouts")
+        raise HTTPException(status_code=504, detail=f"Firebase call timed out: {fn.__name__}")
+
+
+def shutdown_firebase_executor():
+    """Stop accepting work and let running calls finish"""
+    _executor.shutdown(wait=False, cancel_futures=True)
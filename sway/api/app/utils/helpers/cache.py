@@ -0,0 +1,108 @@
+# app/utils/helpers/cache.py
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class TTLCache:
+    """
+    Size-bounded in-process cache with LRU eviction and per-entry expiry.
+
+    Hit, miss and eviction counters are kept so the cache can be sized from
+    the /metrics endpoint.
+
+    maxsize counts entries, or with getsizeof the total getsizeof(value) of
+    all entries, so caches of values of very different sizes can be bounded
+    by what they hold.
+    """
+
+    def __init__(self, maxsize: int, ttl: float, getsizeof: Optional[Callable[[Any], int]] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.getsizeof = getsizeof
+        self.currsize = 0
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value, or default if missing or expired"""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            expires_at, value, size = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                self.currsize -= size
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None):
+        """Store a value, evicting least recently used entries over maxsize"""
+        size = self.getsizeof(value) if self.getsizeof else 1
+        if size > self.maxsize:
+            return
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self.currsize -= old[2]
+            self._data[key] = (expires_at, value, size)
+            self.currsize += size
+            while self.currsize > self.maxsize:
+                _, evicted = self._data.popitem(last=False)
+                self.currsize -= evicted[2]
+                self.evictions += 1
+
+    def pop(self, key: Hashable) -> Any:
+        """Remove a key and return its value (None if missing)"""
+        with self._lock:
+            entry = self._data.pop(key, None)
+            if entry is None:
+                return None
+            self.currsize -= entry[2]
+            self.invalidations += 1
+            return entry[1]
+
+    def evict_where(self, predicate: Callable[[Hashable, Any], bool]) -> int:
+        """Remove every entry for which predicate(key, value) is true"""
+        with self._lock:
+            doomed = [key for key, (_, value, _) in self._data.items() if predicate(key, value)]
+            for key in doomed:
+                self.currsize -= self._data.pop(key)[2]
+            self.invalidations += len(doomed)
+            return len(doomed)
+
+    def clear(self):
+        """Remove every entry"""
+        with self._lock:
+            self.invalidations += len(self._data)
+            self._data.clear()
+            self.currsize = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def stats(self) -> dict:
+        """Counters for sizing the cache"""
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._data),
+            "currsize": self.currsize,
+            "maxsize": self.maxsize,
+            "ttl": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations
+        }
@@ -0,0 +1,353 @@
+# app/utils/helpers/clustering.py
+"""
+Precomputed marker clusters for zoomed-out map views.
+
+Every spot is counted in one grid cell per zoom level (CLUSTER_CELLS_PER_TILE x
+CLUSTER_CELLS_PER_TILE cells per Web Mercator tile). A cell stores its spot
+count, coordinate sums for the centroid and its top-rated spot, so a viewport is
+one indexed range scan over `spot_clusters`. The cell at zoom z + 1 with
+coordinates (2x..2x+1, 2y..2y+1) are the children of cell (x, y) at zoom z.
+
+Writes update the cells incrementally. When a cell's top spot leaves it or drops
+in rating, representatives are rebuilt bottom-up through that hierarchy.
+"""
+from typing import Dict, List, Optional, Tuple
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+from app.config import CLUSTER_MAX_ZOOM, CLUSTER_CELLS_PER_TILE
+from app.models.hammock_spot import HammockSpot
+from app.models.spot_cluster import SpotCluster
+from app.utils.helpers.geo import grid_cell, grid_cell_bounds, bounds_polygon
+
+Cell = Tuple[int, int, int]  # (zoom, cell_x, cell_y)
+
+
+def cells_per_axis(zoom: int) -> int:
+    """Number of grid cells along each axis at a zoom level"""
+    return (2 ** zoom) * CLUSTER_CELLS_PER_TILE
+
+
+def cluster_cells(lat: float, lng: float) -> List[Cell]:
+    """Cells containing a point, one per zoom level from 0 to CLUSTER_MAX_ZOOM"""
+    finest_x, finest_y = grid_cell(lng, lat, cells_per_axis(CLUSTER_MAX_ZOOM))
+    cells = []
+    for zoom in range(CLUSTER_MAX_ZOOM + 1):
+        shift = CLUSTER_MAX_ZOOM - zoom
+        cells.append((zoom, finest_x >> shift, finest_y >> shift))
+    return cells
+
+
+def _cell_filter(cell: Cell) -> dict:
+    zoom, cell_x, cell_y = cell
+    return {"zoom": zoom, "cell_x": cell_x, "cell_y": cell_y}
+
+
+def _takes_top(spot_id: str, rating: float) -> dict:
+    """Pipeline expression: should (spot_id, rating) become the cell's representative"""
+    return {"$or": [
+        {"$eq": [{"$ifNull": ["$top_spot_id", None]}, None]},
+        {"$eq": ["$top_spot_id", {"$literal": spot_id}]},
+        {"$gt": [rating, "$top_rating"]}
+    ]}
+
+
+async def _bulk_write(ops: List[UpdateOne]):
+    """Unordered bulk write that retries upserts which lost a race on the unique index"""
+    collection = SpotCluster.get_motor_collection()
+    try:
+        await collection.bulk_write(ops, ordered=False)
+    except BulkWriteError as e:
+        retry = [ops[err["index"]] for err in e.details.get("writeErrors", []) if err.get("code") == 11000]
+        if len(retry) != len(e.details.get("writeErrors", [])):
+            raise
+        await collection.bulk_write(retry, ordered=False)
+
+
+async def add_spot_to_clusters(spot_id: str, lat: float, lng: float, rating: float = 0):
+    """Count a new spot in its cell at every zoom level"""
+    spot_id = str(spot_id)
+    takes_top = _takes_top(spot_id, rating)
+    ops = [
+        UpdateOne(
+            _cell_filter(cell),
+            [{"$set": {
+                "spot_count": {"$add": [{"$ifNull": ["$spot_count", 0]}, 1]},
+                "sum_lat": {"$add": [{"$ifNull": ["$sum_lat", 0]}, lat]},
+                "sum_lng": {"$add": [{"$ifNull": ["$sum_lng", 0]}, lng]},
+                "top_spot_id": {"$cond": [takes_top, {"$literal": spot_id}, "$top_spot_id"]},
+                "top_rating": {"$cond": [takes_top, rating, "$top_rating"]}
+            }}],
+            upsert=True
+        )
+        for cell in cluster_cells(lat, lng)
+    ]
+    await _bulk_write(ops)
+
+
+async def add_spots_to_clusters(spots: List[Tuple[str, float, float, float]]):
+    """
+    Count many new spots at once, e.g. an imported batch: one update per cell
+    touched instead of one per spot and zoom level
+
+    Args:
+        spots: (spot_id, lat, lng, rating) of every spot
+    """
+    cells: Dict[Cell, list] = {}
+    for spot_id, lat, lng, rating in spots:
+        for cell in cluster_cells(lat, lng):
+            entry = cells.get(cell)
+            if entry is None:
+                entry = cells[cell] = [0, 0.0, 0.0, None, 0]
+            entry[0] += 1
+            entry[1] += lat
+            entry[2] += lng
+            if entry[3] is None or rating > entry[4]:
+                entry[3] = str(spot_id)
+                entry[4] = rating
+
+    ops = []
+    for cell, (count, sum_lat, sum_lng, top_id, top_rating) in cells.items():
+        takes_top = _takes_top(top_id, top_rating)
+        ops.append(UpdateOne(
+            _cell_filter(cell),
+            [{"$set": {
+                "spot_count": {"$add": [{"$ifNull": ["$spot_count", 0]}, count]},
+                "sum_lat": {"$add": [{"$ifNull": ["$sum_lat", 0]}, sum_lat]},
+                "sum_lng": {"$add": [{"$ifNull": ["$sum_lng", 0]}, sum_lng]},
+                "top_spot_id": {"$cond": [takes_top, {"$literal": top_id}, "$top_spot_id"]},
+                "top_rating": {"$cond": [takes_top, top_rating, "$top_rating"]}
+            }}],
+            upsert=True
+        ))
+    if ops:
+        await _bulk_write(ops)
+
+
+async def remove_spot_from_clusters(spot_id: str, lat: float, lng: float):
+    """
+    Uncount a spot from its cells. Call after the spot was deleted or moved
+    so it is no longer found when representatives are rebuilt.
+    """
+    spot_id = str(spot_id)
+    cells = cluster_cells(lat, lng)
+    collection = SpotCluster.get_motor_collection()
+    await _bulk_write([
+        UpdateOne(_cell_filter(cell), {"$inc": {"spot_count": -1, "sum_lat": -lat, "sum_lng": -lng}})
+        for cell in cells
+    ])
+
+    cell_filters = [_cell_filter(cell) for cell in cells]
+    await collection.delete_many({"$or": cell_filters, "spot_count": {"$lte": 0}})
+
+    if await collection.count_documents({"$or": cell_filters, "top_spot_id": spot_id}, limit=1):
+        await rebuild_representatives(lat, lng)
+
+
+async def move_spot_in_clusters(
+    spot_id: str,
+    old_lat: float,
+    old_lng: float,
+    new_lat: float,
+    new_lng: float,
+    rating: float = 0
+):
+    """Move a spot between cells after its coordinates changed"""
+    if (old_lat, old_lng) == (new_lat, new_lng):
+        return
+    await remove_spot_from_clusters(spot_id, old_lat, old_lng)
+    await add_spot_to_clusters(spot_id, new_lat, new_lng, rating)
+
+
+async def update_spot_rating_in_clusters(
+    spot_id: str,
+    lat: float,
+    lng: float,
+    rating: float,
+    previous_rating: float
+):
+    """Promote or demote a spot as cell representative after its avg_rating changed"""
+    spot_id = str(spot_id)
+    takes_top = _takes_top(spot_id, rating)
+    cells = cluster_cells(lat, lng)
+    await _bulk_write([
+        UpdateOne(
+            _cell_filter(cell),
+            [{"$set": {
+                "top_spot_id": {"$cond": [takes_top, {"$literal": spot_id}, "$top_spot_id"]},
+                "top_rating": {"$cond": [takes_top, rating, "$top_rating"]}
+            }}]
+        )
+        for cell in cells
+    ])
+
+    if rating < previous_rating:
+        # Another spot may now outrank this one wherever it was the representative
+        collection = SpotCluster.get_motor_collection()
+        cell_filters = [_cell_filter(cell) for cell in cells]
+        if await collection.count_documents({"$or": cell_filters, "top_spot_id": spot_id}, limit=1):
+            await rebuild_representatives(lat, lng)
+
+
+async def _best_spot_in_finest_cell(cell: Cell) -> Optional[Tuple[str, float]]:
+    """Highest rated spot inside a cell at CLUSTER_MAX_ZOOM"""
+    zoom, cell_x, cell_y = cell
+    n = cells_per_axis(zoom)
+    polygon = bounds_polygon(*grid_cell_bounds(cell_x, cell_y, n))
+    cursor = HammockSpot.get_motor_collection().find(
+        {"location": {"$geoWithin": {"$geometry": polygon}}},
+        {"avg_rating": 1, "coordinates": 1}
+    ).sort("avg_rating", -1)
+
+    async for doc in cursor:
+        # Skip spots that sit exactly on a shared edge but belong to the neighbour
+        coords = doc["coordinates"]
+        if grid_cell(coords["longitude"], coords["latitude"], n) == (cell_x, cell_y):
+            return str(doc["_id"]), doc.get("avg_rating", 0)
+    return None
+
+
+async def rebuild_representatives(lat: float, lng: float):
+    """Recompute top spots for every cell containing a point, finest zoom first"""
+    collection = SpotCluster.get_motor_collection()
+    cells = cluster_cells(lat, lng)
+
+    best = await _best_spot_in_finest_cell(cells[-1])
+    tops: Dict[Cell, Optional[Tuple[str, float]]] = {cells[-1]: best}
+
+    for zoom in range(CLUSTER_MAX_ZOOM - 1, -1, -1):
+        _, cell_x, cell_y = cells[zoom]
+        recomputed_child = cells[zoom + 1]
+        siblings = await collection.find(
+            {
+                "zoom": zoom + 1,
+                "cell_x": {"$in": [2 * cell_x, 2 * cell_x + 1]},
+                "cell_y": {"$in": [2 * cell_y, 2 * cell_y + 1]},
+                "top_spot_id": {"$ne": None}
+            },
+            {"cell_x": 1, "cell_y": 1, "top_spot_id": 1, "top_rating": 1}
+        ).to_list(length=None)
+
+        candidates = [tops[recomputed_child]] if tops[recomputed_child] else []
+        for child in siblings:
+            if (zoom + 1, child["cell_x"], child["cell_y"]) != recomputed_child:
+                candidates.append((child["top_spot_id"], child["top_rating"]))
+        tops[cells[zoom]] = max(candidates, key=lambda c: c[1]) if candidates else None
+
+    await _bulk_write([
+        UpdateOne(_cell_filter(cell), {"$set": {
+            "top_spot_id": top[0] if top else None,
+            "top_rating": top[1] if top else 0
+        }})
+        for cell, top in tops.items()
+    ])
+
+
+async def find_clusters(
+    min_lng: float,
+    min_lat: float,
+    max_lng: float,
+    max_lat: float,
+    zoom: int
+) -> List[SpotCluster]:
+    """Clusters intersecting a viewport. A viewport crossing the antimeridian has min_lng > max_lng."""
+    n = cells_per_axis(zoom)
+    x0, y0 = grid_cell(min_lng, max_lat, n)  # north-west corner
+    x1, y1 = grid_cell(max_lng, min_lat, n)  # south-east corner
+
+    if x0 <= x1:
+        x_ranges = [(x0, x1)]
+    else:
+        x_ranges = [(x0, n - 1), (0, x1)]
+
+    return await SpotCluster.find({
+        "zoom": zoom,
+        "$or": [{"cell_x": {"$gte": lo, "$lte": hi}} for lo, hi in x_ranges],
+        "cell_y": {"$gte": y0, "$lte": y1}
+    }).to_list()
+
+
+def count_viewport_cells(min_lng: float, min_lat: float, max_lng: float, max_lat: float, zoom: int) -> int:
+    """Number of grid cells a viewport spans, used to reject oversized requests"""
+    n = cells_per_axis(zoom)
+    x0, y0 = grid_cell(min_lng, max_lat, n)
+    x1, y1 = grid_cell(max_lng, min_lat, n)
+    width = x1 - x0 + 1 if x0 <= x1 else (n - x0) + x1 + 1
+    return width * (y1 - y0 + 1)
+
+
+def _roll_up(cells: Dict[Tuple[int, int], list]) -> Dict[Tuple[int, int], list]:
+    """Cells of the next coarser zoom level, merged from their children"""
+    parents: Dict[Tuple[int, int], list] = {}
+    for (cell_x, cell_y), (count, sum_lat, sum_lng, top_id, top_rating) in cells.items():
+        entry = parents.get((cell_x >> 1, cell_y >> 1))
+        if entry is None:
+            parents[(cell_x >> 1, cell_y >> 1)] = [count, sum_lat, sum_lng, top_id, top_rating]
+            continue
+        entry[0] += count
+        entry[1] += sum_lat
+        entry[2] += sum_lng
+        if entry[3] is None or (top_id is not None and top_rating > entry[4]):
+            entry[3] = top_id
+            entry[4] = top_rating
+    return parents
+
+
+async def rebuild_clusters(batch_size: int = 1000) -> int:
+    """
+    Recompute every cluster from the spots collection.
+
+    The finest zoom level is counted from one scan of the spots and each coarser
+    level is merged from the one below, so only two levels are held in memory.
+    The cells are written to a staging collection that then replaces
+    `spot_clusters` in one rename; map requests see the old clusters until then.
+
+    Returns:
+        int: Number of cluster cells written
+    """
+    n = cells_per_axis(CLUSTER_MAX_ZOOM)
+    cells: Dict[Tuple[int, int], list] = {}
+    cursor = HammockSpot.get_motor_collection().find(
+        {"coordinates.latitude": {"$type": "number"}},
+        {"coordinates": 1, "avg_rating": 1}
+    ).batch_size(batch_size)
+
+    async for doc in cursor:
+        lat = doc["coordinates"]["latitude"]
+        lng = doc["coordinates"]["longitude"]
+        rating = doc.get("avg_rating", 0)
+        cell = grid_cell(lng, lat, n)
+        entry = cells.get(cell)
+        if entry is None:
+            entry = cells[cell] = [0, 0.0, 0.0, None, 0]
+        entry[0] += 1
+        entry[1] += lat
+        entry[2] += lng
+        if entry[3] is None or rating > entry[4]:
+            entry[3] = str(doc["_id"])
+            entry[4] = rating
+
+    collection = SpotCluster.get_motor_collection()
+    staging = collection.database[f"{collection.name}_rebuild"]
+    await staging.drop()
+    await staging.create_indexes(SpotCluster.Settings.indexes)
+
+    written = 0
+    for zoom in range(CLUSTER_MAX_ZOOM, -1, -1):
+        if zoom < CLUSTER_MAX_ZOOM:
+            cells = _roll_up(cells)
+        batch = []
+        for (cell_x, cell_y), (count, sum_lat, sum_lng, top_id, top_rating) in cells.items():
+            batch.append({
+                "zoom": zoom, "cell_x": cell_x, "cell_y": cell_y,
+                "spot_count": count, "sum_lat": sum_lat, "sum_lng": sum_lng,
+                "top_spot_id": top_id, "top_rating": top_rating
+            })
+            if len(batch) >= batch_size:
+                await staging.insert_many(batch, ordered=False)
+                batch = []
+        if batch:
+            await staging.insert_many(batch, ordered=False)
+        written += len(cells)
+
+    await staging.rename(collection.name, dropTarget=True)
+    return written
@@ -0,0 +1,112 @@
+# app/utils/helpers/cursor.py
+import base64
+import json
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Tuple
+from bson.objectid import ObjectId
+from fastapi import HTTPException
+
+# Expected type of a numeric keyset value; JSON turns whole floats into ints
+NUMBER = (int, float)
+
+# Carries the next page's cursor on endpoints whose body has always been a plain JSON list
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _pack(value: Any):
+    """Make a keyset value JSON-safe, tagging types JSON can't carry"""
+    if isinstance(value, ObjectId):
+        return {"$oid": str(value)}
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    return value
+
+
+def _unpack(value: Any):
+    """Reverse _pack"""
+    if isinstance(value, dict):
+        if "$oid" in value:
+            return ObjectId(value["$oid"])
+        if "$dt" in value:
+            return datetime.fromisoformat(value["$dt"])
+    return value
+
+
+def encode_cursor(kind: str, *values) -> str:
+    """
+    Encode the keyset of the last returned item as an opaque cursor token
+
+    Args:
+        kind: Name of the ordering the cursor belongs to (e.g. "distance")
+        values: Sort key values of the last item, ending with its _id
+
+    Returns:
+        str: URL-safe cursor token
+    """
+    payload = {"k": kind, "v": [_pack(v) for v in values]}
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, kind: str, types: Tuple) -> List[Any]:
+    """
+    Decode a cursor token produced by encode_cursor
+
+    Args:
+        cursor: Cursor token from a previous response
+        kind: Ordering the caller is about to paginate
+        types: Expected type (or tuple of types) of each value, in order
+
+    Returns:
+        list: Sort key values, ending with the ObjectId of the last item
+
+    Raises:
+        HTTPException: If the cursor is malformed, has the wrong values or was issued for another ordering
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        values = [_unpack(v) for v in payload["v"]]
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    if payload.get("k") != kind:
+        raise HTTPException(status_code=400, detail="Cursor does not match the requested sort order")
+
+    # Callers unpack and query with the values, so a crafted cursor must not reach them
+    if len(values) != len(types) or not all(isinstance(v, t) for v, t in zip(values, types)):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+    return values
+
+
+def build_page(
+    docs: List[dict],
+    limit: int,
+    kind: str,
+    sort_value: Callable[[dict], Any]
+) -> Tuple[List[dict], Optional[str]]:
+    """
+    Trim a limit + 1 result set to one page and build the cursor for the next one
+
+    Args:
+        docs: Up to limit + 1 documents in keyset order
+        limit: Page size
+        kind: Name of the ordering, stored in the cursor
+        sort_value: Returns the sort key of a document (its _id is appended)
+
+    Returns:
+        tuple: (page documents, next cursor or None on the last page)
+    """
+    has_more = len(docs) > limit
+    docs = docs[:limit]
+    next_cursor = None
+    if has_more:
+        last = docs[-1]
+        next_cursor = encode_cursor(kind, sort_value(last), last["_id"])
+    return docs, next_cursor
+
+
+def next_cursor_headers(next_cursor: Optional[str]) -> Optional[dict]:
+    """Response headers announcing the next page of a list endpoint, None on the last page"""
+    return {NEXT_CURSOR_HEADER: next_cursor} if next_cursor else None
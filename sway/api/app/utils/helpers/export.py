@@ -0,0 +1,133 @@
+# app/utils/helpers/export.py
+"""
+Streaming NDJSON export of whole collections.
+
+Documents are read in _id order through a single Motor cursor and written one
+per line, so memory use is bounded by one batch whatever the collection size,
+and an interrupted export continues from the last `_id` it wrote. ObjectIds are
+written as hex strings and datetimes as ISO 8601.
+
+With compression every batch becomes its own gzip member. A concatenation of
+members is a valid gzip file, and a file cut off mid-transfer can be truncated
+back to its last complete member before resuming.
+"""
+import asyncio
+import gzip
+import zlib
+import orjson
+from typing import AsyncIterator, Optional, Tuple
+from bson.objectid import ObjectId
+from app.config import EXPORT_BATCH_SIZE
+from app.models.hammock_spot import HammockSpot
+from app.models.review import Review
+from app.utils.metrics import metrics
+from app.utils.responses import dump_json
+
+EXPORT_COLLECTIONS = {
+    "spots": HammockSpot,
+    "reviews": Review,
+}
+
+
+async def iter_export_chunks(
+    collection: str,
+    after: Optional[ObjectId] = None,
+    batch_size: int = EXPORT_BATCH_SIZE,
+    compress: bool = False
+) -> AsyncIterator[bytes]:
+    """
+    Yield a collection as NDJSON, one chunk per cursor batch
+
+    Args:
+        collection: Key of EXPORT_COLLECTIONS
+        after: Only export documents with a greater _id (resume point)
+        batch_size: Documents per cursor batch and per yielded chunk
+        compress: Gzip every chunk as a separate member
+
+    Returns:
+        AsyncIterator[bytes]: NDJSON chunks, each ending with a newline
+    """
+    model = EXPORT_COLLECTIONS[collection]
+    query = {"_id": {"$gt": after}} if after is not None else {}
+    cursor = model.get_motor_collection().find(query).sort("_id", 1).batch_size(batch_size)
+    loop = asyncio.get_running_loop()
+
+    async def encode(lines):
+        chunk = b"\n".join(lines) + b"\n"
+        metrics.increment(f"export.{collection}.documents", len(lines))
+        if compress:
+            # Compressing a batch takes a few milliseconds; keep it off the event loop
+            chunk = await loop.run_in_executor(None, gzip.compress, chunk, 6)
+        return chunk
+
+    lines = []
+    async for doc in cursor:
+        lines.append(dump_json(doc))
+        if len(lines) >= batch_size:
+            yield await encode(lines)
+            lines = []
+    if lines:
+        yield await encode(lines)
+
+
+def find_resume_point(
+    path: str,
+    compressed: bool,
+    read_size: int = 1 << 20
+) -> Tuple[int, Optional[ObjectId]]:
+    """
+    Locate where a partially written export file can be continued
+
+    Args:
+        path: Export file written by iter_export_chunks
+        compressed: Whether the file holds gzip members
+        read_size: Bytes read at a time
+
+    Returns:
+        tuple: (length of the complete prefix to keep, _id of its last document or None)
+    """
+    valid_length = 0
+    last_line = b""
+    offset = 0
+    pending = b""  # Uncompressed: bytes after the last newline
+    member_text = b""  # Compressed: tail of the current member's text
+    decompressor = zlib.decompressobj(wbits=31)
+
+    with open(path, "rb") as f:
+        while True:
+            data = f.read(read_size)
+            if not data:
+                break
+            if not compressed:
+                text = pending + data
+                cut = text.rfind(b"\n")
+                if cut != -1:
+                    complete, pending = text[:cut], text[cut + 1:]
+                    last_line = complete.rsplit(b"\n", 1)[-1] or last_line
+                    valid_length = offset + len(data) - len(pending)
+                else:
+                    pending = text
+                offset += len(data)
+                continue
+
+            while data:
+                member_text += decompressor.decompress(data)
+                # Only the tail matters: keep the last line started so far
+                cut = member_text.rfind(b"\n", 0, len(member_text) - 1)
+                if cut != -1:
+                    member_text = member_text[cut + 1:]
+                if not decompressor.eof:
+                    offset += len(data)
+                    break
+                # A member ended: everything up to here is complete
+                unused = decompressor.unused_data
+                offset += len(data) - len(unused)
+                valid_length = offset
+                last_line = member_text.rstrip(b"\n") or last_line
+                member_text = b""
+                decompressor = zlib.decompressobj(wbits=31)
+                data = unused
+
+    if not last_line:
+        return valid_length, None
+    return valid_length, ObjectId(orjson.loads(last_line)["_id"])
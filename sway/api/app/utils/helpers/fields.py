@@ -0,0 +1,84 @@
+# app/utils/helpers/fields.py
+"""
+Sparse fieldsets for read endpoints.
+
+`?fields=id,coordinates,avg_rating` limits a response to the listed top-level
+fields. The same set becomes the MongoDB projection, so fields nobody asked for
+are neither read from disk, decoded from BSON nor serialized. `id` is always
+returned.
+"""
+from typing import Iterable, Optional, Set
+from fastapi import Query
+from fastapi.exceptions import RequestValidationError
+
+
+def sparse_fields(allowed: Iterable[str]):
+    """
+    Build a dependency that parses and validates the `fields` query parameter
+
+    Args:
+        allowed: Response fields the endpoint can return
+
+    Returns:
+        callable: FastAPI dependency returning the requested set, or None for all fields
+    """
+    allowed = tuple(allowed)
+    allowed_set = set(allowed)
+
+    def dependency(
+        fields: Optional[str] = Query(
+            None,
+            description=f"Comma-separated subset of fields to return: {', '.join(allowed)}"
+        )
+    ) -> Optional[Set[str]]:
+        if fields is None:
+            return None
+
+        requested = {name.strip() for name in fields.split(",") if name.strip()}
+        unknown = sorted(requested - allowed_set)
+        if not requested or unknown:
+            msg = f"Unknown fields: {', '.join(unknown)}" if unknown else "No fields requested"
+            raise RequestValidationError([{
+                "loc": ("query", "fields"),
+                "msg": msg,
+                "type": "value_error"
+            }])
+
+        requested.add("id")
+        return requested
+
+    return dependency
+
+
+def fields_projection(
+    fields: Optional[Set[str]],
+    required: Iterable[str] = (),
+    computed: Iterable[str] = ()
+) -> Optional[dict]:
+    """
+    MongoDB inclusion projection for a sparse fieldset
+
+    Args:
+        fields: Requested response fields, or None for all fields
+        required: Document fields the query needs regardless (e.g. keyset sort keys)
+        computed: Response fields that are not stored on the document
+
+    Returns:
+        dict: Projection, or None when every field is requested
+    """
+    if fields is None:
+        return None
+    skip = {"id", *computed}
+    projection = {name: 1 for name in fields if name not in skip}
+    projection.update({name: 1 for name in required})
+    if "photos" in projection:
+        # Photo URLs are resolved to the requested photo_size from the variants
+        projection["photo_variants"] = 1
+    return projection
+
+
+def trim_fields(item: dict, fields: Optional[Set[str]]) -> dict:
+    """Drop response fields that were not requested"""
+    if fields is None:
+        return item
+    return {key: value for key, value in item.items() if key in fields}
@@ -0,0 +1,128 @@
+# app/utils/helpers/geo.py
+import math
+from typing import Tuple
+
+# Mean Earth radius used by MongoDB's spherical queries ($centerSphere, $geoNear)
+EARTH_RADIUS_METERS = 6378100
+
+_GEOHASH_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+
+def haversine_meters(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """Great-circle distance between two points in meters"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlmb = math.radians(lng2 - lng1)
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlmb / 2) ** 2
+    return 2 * EARTH_RADIUS_METERS * math.asin(min(1.0, math.sqrt(a)))
+
+
+def geohash_encode(lat: float, lng: float, precision: int) -> str:
+    """
+    Encode a point as a geohash
+
+    Args:
+        lat: Latitude
+        lng: Longitude
+        precision: Number of base32 characters
+
+    Returns:
+        str: Geohash of the cell containing the point
+    """
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True
+
+    while len(chars) < precision:
+        rng, value = (lng_range, lng) if even else (lat_range, lat)
+        mid = (rng[0] + rng[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            rng[0] = mid
+        else:
+            bits <<= 1
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_GEOHASH_BASE32[bits])
+            bits = 0
+            bit_count = 0
+
+    return "".join(chars)
+
+
+def geohash_bounds(geohash: str) -> Tuple[float, float, float, float]:
+    """Return (min_lat, min_lng, max_lat, max_lng) of a geohash cell"""
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    even = True
+
+    for char in geohash:
+        bits = _GEOHASH_BASE32.index(char)
+        for shift in range(4, -1, -1):
+            rng = lng_range if even else lat_range
+            mid = (rng[0] + rng[1]) / 2
+            if (bits >> shift) & 1:
+                rng[0] = mid
+            else:
+                rng[1] = mid
+            even = not even
+
+    return lat_range[0], lng_range[0], lat_range[1], lng_range[1]
+
+
+def geohash_center(geohash: str) -> Tuple[float, float]:
+    """Return the (lat, lng) center of a geohash cell"""
+    min_lat, min_lng, max_lat, max_lng = geohash_bounds(geohash)
+    return (min_lat + max_lat) / 2, (min_lng + max_lng) / 2
+
+
+# Web Mercator (EPSG:3857) helpers shared by map clustering and vector tiles
+MAX_MERCATOR_LAT = 85.05112878
+
+
+def lnglat_to_world(lng: float, lat: float) -> Tuple[float, float]:
+    """Project a point to normalized Web Mercator coordinates in [0, 1)"""
+    lat = max(-MAX_MERCATOR_LAT, min(MAX_MERCATOR_LAT, lat))
+    x = (lng + 180.0) / 360.0
+    sin_lat = math.sin(math.radians(lat))
+    y = 0.5 - math.log((1 + sin_lat) / (1 - sin_lat)) / (4 * math.pi)
+    return min(max(x, 0.0), 1.0 - 1e-12), min(max(y, 0.0), 1.0 - 1e-12)
+
+
+def world_to_lnglat(x: float, y: float) -> Tuple[float, float]:
+    """Inverse of lnglat_to_world"""
+    lng = x * 360.0 - 180.0
+    lat = math.degrees(math.atan(math.sinh(math.pi * (1 - 2 * y))))
+    return lng, lat
+
+
+def grid_cell(lng: float, lat: float, cells_per_axis: int) -> Tuple[int, int]:
+    """Return the (x, y) cell of a point on a Web Mercator grid"""
+    x, y = lnglat_to_world(lng, lat)
+    return int(x * cells_per_axis), int(y * cells_per_axis)
+
+
+def grid_cell_bounds(cell_x: int, cell_y: int, cells_per_axis: int) -> Tuple[float, float, float, float]:
+    """Return (min_lng, min_lat, max_lng, max_lat) of a Web Mercator grid cell"""
+    min_lng, max_lat = world_to_lnglat(cell_x / cells_per_axis, cell_y / cells_per_axis)
+    max_lng, min_lat = world_to_lnglat((cell_x + 1) / cells_per_axis, (cell_y + 1) / cells_per_axis)
+    return min_lng, min_lat, max_lng, max_lat
+
+
+def bounds_polygon(min_lng: float, min_lat: float, max_lng: float, max_lat: float) -> dict:
+    """GeoJSON Polygon for a lng/lat rectangle"""
+    return {
+        "type": "Polygon",
+        "coordinates": [[
+            [min_lng, min_lat],
+            [max_lng, min_lat],
+            [max_lng, max_lat],
+            [min_lng, max_lat],
+            [min_lng, min_lat]
+        ]]
+    }
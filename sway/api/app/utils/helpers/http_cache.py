@@ -0,0 +1,73 @@
+# app/utils/helpers/http_cache.py
+"""
+Conditional GET support.
+
+ETags are derived from a document's id and its updated_at (falling back to
+created_at for documents never edited), so a matching If-None-Match can be
+answered with 304 before the document is serialized. Every write path that
+changes a response must therefore bump updated_at.
+"""
+import hashlib
+from datetime import datetime
+from typing import Iterable, Optional
+from fastapi import Request, Response
+from app.config import PUBLIC_CACHE_MAX_AGE, PUBLIC_CACHE_S_MAXAGE
+
+# Projection fields document_etag needs
+VERSION_FIELDS = ["updated_at", "created_at"]
+
+PUBLIC_CACHE_CONTROL = f"public, max-age={PUBLIC_CACHE_MAX_AGE}, s-maxage={PUBLIC_CACHE_S_MAXAGE}"
+PRIVATE_CACHE_CONTROL = "private, no-cache"
+
+
+def document_etag(
+    doc_id,
+    updated_at: Optional[datetime],
+    created_at: Optional[datetime],
+    variant: Iterable[str] = ()
+) -> str:
+    """
+    Strong ETag for one representation of a document
+
+    Args:
+        doc_id: Document _id
+        updated_at: Last modification time, or None if never modified
+        created_at: Creation time
+        variant: What else shapes the body, e.g. the requested sparse fieldset
+
+    Returns:
+        str: Quoted ETag value
+    """
+    version = updated_at or created_at
+    key = f"{doc_id}:{version.isoformat() if version else ''}:{','.join(sorted(variant))}"
+    return '"' + hashlib.sha1(key.encode()).hexdigest()[:20] + '"'
+
+
+def matches_if_none_match(request: Request, etag: str) -> bool:
+    """Whether the client's If-None-Match header already names this ETag (weak comparison)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    for tag in header.split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
+def cache_headers(etag: str, public: bool) -> dict:
+    """ETag, Cache-Control and Vary headers for a cacheable GET"""
+    return {
+        "ETag": etag,
+        "Cache-Control": PUBLIC_CACHE_CONTROL if public else PRIVATE_CACHE_CONTROL,
+        "Vary": "Accept-Encoding" if public else "Accept-Encoding, Authorization"
+    }
+
+
+def not_modified(headers: dict) -> Response:
+    """304 response carrying the same validators as the full response"""
+    return Response(status_code=304, headers=headers)
@@ -0,0 +1,90 @@
+# app/utils/helpers/images.py
+"""
+Photo derivatives.
+
+An uploaded photo is decoded once, rotated upright from its EXIF orientation and
+re-encoded as WebP at full, medium and thumbnail size, each resized from the
+previous one. No metadata is written, which strips EXIF (including GPS) from
+the derivatives. Decoding and encoding are CPU bound, so they run in a process
+pool instead of on the event loop or the Firebase thread pool. Workers are
+given the path of a local copy of the photo and read it themselves, so the
+upload is never held in memory as a whole or pickled across processes.
+"""
+import asyncio
+import io
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional
+from PIL import Image, ImageOps
+from app.config import (
+    IMAGE_WORKERS, PHOTO_THUMBNAIL_SIZE, PHOTO_MEDIUM_SIZE, PHOTO_FULL_MAX_SIZE, PHOTO_WEBP_QUALITY
+)
+from app.utils.metrics import metrics
+
+try:
+    # HEIC (iPhone) decoding is optional; without it HEIC photos are kept as uploaded only
+    from pillow_heif import register_heif_opener
+    register_heif_opener()
+except ImportError:
+    pass
+
+# Variant name -> longest edge, largest first so each is resized from the previous one
+PHOTO_VARIANT_SIZES = {
+    "full": PHOTO_FULL_MAX_SIZE,
+    "medium": PHOTO_MEDIUM_SIZE,
+    "thumbnail": PHOTO_THUMBNAIL_SIZE,
+}
+
+# Also bounds how many decoded photos are held in memory at once
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_slots = asyncio.Semaphore(IMAGE_WORKERS)
+
+
+def render_variants(source: str) -> Dict[str, bytes]:
+    """
+    Encode the WebP variants of a photo. Runs in a worker process.
+
+    Args:
+        source: Path of a local file holding the photo as uploaded
+
+    Returns:
+        dict: WebP bytes per variant name of PHOTO_VARIANT_SIZES
+    """
+    with Image.open(source) as photo:
+        # Let JPEG decode at a reduced scale when even the largest variant is smaller
+        photo.draft("RGB", (PHOTO_FULL_MAX_SIZE, PHOTO_FULL_MAX_SIZE))
+        image = ImageOps.exif_transpose(photo)
+        image = image.convert("RGBA" if "A" in image.getbands() else "RGB")
+
+    variants = {}
+    for name, max_edge in PHOTO_VARIANT_SIZES.items():
+        image.thumbnail((max_edge, max_edge), Image.LANCZOS)
+        out = io.BytesIO()
+        image.save(out, "WEBP", quality=PHOTO_WEBP_QUALITY, method=4)
+        variants[name] = out.getvalue()
+    return variants
+
+
+async def render_photo_variants(source: str) -> Optional[Dict[str, bytes]]:
+    """Render variants in the process pool; None if the image cannot be decoded"""
+    global _pool
+    if _pool is None:
+        # Spawned, not forked: a fork would copy the event loop, motor's threads and their locks
+        _pool = ProcessPoolExecutor(max_workers=IMAGE_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+
+    async with _pool_slots:
+        try:
+            with metrics.timer("images.render_variants"):
+                return await asyncio.get_running_loop().run_in_executor(_pool, render_variants, source)
+        except Exception as e:
+            metrics.increment("images.render_failures")
+            print(f"Failed to render photo variants: {e}")
+            return None
+
+
+def shutdown_image_pool():
+    """Stop the worker processes"""
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
@@ -0,0 +1,125 @@
+# app/utils/helpers/mvt.py
+"""
+Minimal Mapbox Vector Tile (v2.1) encoder for point layers.
+
+Only what the spot tiles need is implemented: point geometries and scalar
+properties (str, bool, int, float). The protobuf wire format is written by hand
+so the API does not need protobuf or shapely.
+"""
+import struct
+from typing import Dict, List, Tuple
+
+# Protobuf wire types
+_VARINT = 0
+_FIXED64 = 1
+_LENGTH_DELIMITED = 2
+
+_GEOM_POINT = 1
+_CMD_MOVE_TO = 1
+
+
+def _varint(value: int) -> bytes:
+    out = bytearray()
+    while True:
+        byte = value & 0x7F
+        value >>= 7
+        if value:
+            out.append(byte | 0x80)
+        else:
+            out.append(byte)
+            return bytes(out)
+
+
+def _zigzag(value: int) -> int:
+    return (value << 1) ^ (value >> 63)
+
+
+def _tag(field: int, wire_type: int) -> bytes:
+    return _varint((field << 3) | wire_type)
+
+
+def _varint_field(field: int, value: int) -> bytes:
+    return _tag(field, _VARINT) + _varint(value)
+
+
+def _bytes_field(field: int, payload: bytes) -> bytes:
+    return _tag(field, _LENGTH_DELIMITED) + _varint(len(payload)) + payload
+
+
+def _packed_field(field: int, values: List[int]) -> bytes:
+    return _bytes_field(field, b"".join(_varint(v) for v in values))
+
+
+def _encode_value(value) -> bytes:
+    """Encode a Layer.Value message"""
+    if isinstance(value, bool):
+        return _varint_field(7, int(value))
+    if isinstance(value, int):
+        if value >= 0:
+            return _varint_field(5, value)
+        return _varint_field(6, _zigzag(value))
+    if isinstance(value, float):
+        return _tag(3, _FIXED64) + struct.pack("<d", value)
+    return _bytes_field(1, str(value).encode("utf-8"))
+
+
+class PointLayer:
+    """Accumulates point features for one tile layer"""
+
+    def __init__(self, name: str, extent: int = 4096):
+        self.name = name
+        self.extent = extent
+        self._features: List[bytes] = []
+        self._keys: Dict[str, int] = {}
+        self._values: Dict[Tuple[type, object], int] = {}
+
+    def __len__(self) -> int:
+        return len(self._features)
+
+    def _key_index(self, key: str) -> int:
+        index = self._keys.get(key)
+        if index is None:
+            index = self._keys[key] = len(self._keys)
+        return index
+
+    def _value_index(self, value) -> int:
+        # Keep 1 and True (and 1.0) apart: they hash equal but encode differently
+        lookup = (type(value), value)
+        index = self._values.get(lookup)
+        if index is None:
+            index = self._values[lookup] = len(self._values)
+        return index
+
+    def add_point(self, x: int, y: int, properties: dict):
+        """
+        Add a point feature
+
+        Args:
+            x: Tile-local x in [0, extent), may fall in the buffer outside it
+            y: Tile-local y in [0, extent)
+            properties: Scalar feature properties; None values are skipped
+        """
+        tags = []
+        for key, value in properties.items():
+            if value is None:
+                continue
+            tags.append(self._key_index(key))
+            tags.append(self._value_index(value))
+
+        geometry = [(1 << 3) | _CMD_MOVE_TO, _zigzag(x), _zigzag(y)]
+        feature = _packed_field(2, tags) + _varint_field(3, _GEOM_POINT) + _packed_field(4, geometry)
+        self._features.append(feature)
+
+    def encode(self) -> bytes:
+        """Encode the Layer message"""
+        parts = [_varint_field(15, 2), _bytes_field(1, self.name.encode("utf-8"))]
+        parts.extend(_bytes_field(2, feature) for feature in self._features)
+        parts.extend(_bytes_field(3, key.encode("utf-8")) for key in self._keys)
+        parts.extend(_bytes_field(4, _encode_value(value)) for _, value in self._values)
+        parts.append(_varint_field(5, self.extent))
+        return b"".join(parts)
+
+
+def encode_tile(layers: List[PointLayer]) -> bytes:
+    """Encode a Tile message from its non-empty layers"""
+    return b"".join(_bytes_field(3, layer.encode()) for layer in layers if len(layer))
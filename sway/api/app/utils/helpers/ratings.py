@@ -0,0 +1,184 @@
+# app/utils/helpers/ratings.py
+"""
+Per-spot rating aggregates.
+
+Each HammockSpot keeps `review_count` and running sums per rating dimension in
+`rating_totals`. Review writes apply deltas to those in a single pipeline update
+that also recomputes `avg_rating`, so the cost of a review does not grow with
+the number of reviews and concurrent reviews cannot overwrite each other.
+Deltas are applied by background jobs, which run at least once. To count each
+change exactly once, every review carries a `rating_version` that its writes
+bump, and the spot keeps the last version it applied per review in
+`rating_versions`. A delta is only applied on top of its predecessor, in the
+same update that records its version: a repeated job finds its version already
+there and is a no-op, and one that overtook its predecessor fails and is
+retried. Entries of deleted reviews stay behind so a late job cannot bring
+their rating back until rebuild_rating_aggregates resets the map from the
+reviews.
+"""
+from datetime import datetime
+from typing import Optional
+from bson.objectid import ObjectId
+from pymongo import ReturnDocument, UpdateOne
+from app.models.hammock_spot import HammockSpot, Rating
+from app.models.review import Review
+
+RATING_DIMENSIONS = list(Rating.__fields__.keys())
+
+
+
+def rating_delta(old: Optional[Rating], new: Optional[Rating]) -> dict:
+    """Per-dimension difference between two ratings (None counts as all zeros)"""
+    old_values = old.dict() if old else {}
+    new_values = new.dict() if new else {}
+    return {d: new_values.get(d, 0) - old_values.get(d, 0) for d in RATING_DIMENSIONS}
+
+
+async def apply_rating_delta(
+    spot_id: str,
+    count_delta: int,
+    delta: dict,
+    review_id: str,
+    version: int,
+    counted: bool = False
+) -> Optional[dict]:
+    """
+    Atomically add a review count and rating sum delta to a spot, once per review version
+
+    Args:
+        spot_id: HammockSpot ID
+        count_delta: +1 for a new review, -1 for a deleted one, 0 for an edit
+        delta: Per-dimension change of the rating sums
+        review_id: Review the delta belongs to
+        version: rating_version of the review after the change (0 on creation, one more than
+            the last update on deletion)
+        counted: Whether the spot counted version - 1 without recording it (reviews written
+            before rating_version existed)
+
+    Returns:
+        dict: coordinates, previous_rating and avg_rating of the spot, or None if it does not
+            exist or already has this delta
+
+    Raises:
+        RuntimeError: The delta of version - 1 has not been applied yet
+    """
+    totals = {
+        f"rating_totals.{d}": {"$add": [{"$ifNull": [f"$rating_totals.{d}", 0]}, delta.get(d, 0)]}
+        for d in RATING_DIMENSIONS
+    }
+    has_reviews = {"$gt": ["$review_count", 0]}
+    version_field = f"rating_versions.{review_id}"
+    previous = [{version_field: version - 1}] if version > 0 else []
+    if version == 0 or counted:
+        previous.append({version_field: {"$exists": False}})
+    query = {"_id": ObjectId(spot_id), "$or": previous}
+    pipeline = [
+        {"$set": {
+            "review_count": {"$add": [{"$ifNull": ["$review_count", 0]}, count_delta]},
+            **totals,
+            version_field: version
+        }},
+        {"$set": {
+            "avg_rating": {"$cond": [has_reviews, {"$divide": ["$rating_totals.overall", "$review_count"]}, 0]},
+            # Reset float residue once the last review is gone
+            "rating_totals": {"$cond": [has_reviews, "$rating_totals", {d: 0 for d in RATING_DIMENSIONS}]},
+            "review_count": {"$max": ["$review_count", 0]},
+            "updated_at": datetime.now()
+        }}
+    ]
+
+    spots = HammockSpot.get_motor_collection()
+    before = await spots.find_one_and_update(
+        query,
+        pipeline,
+        projection={"coordinates": 1, "avg_rating": 1, "review_count": 1, "rating_totals": 1},
+        return_document=ReturnDocument.BEFORE
+    )
+    if before is None:
+        spot = await spots.find_one({"_id": ObjectId(spot_id)}, {version_field: 1})
+        applied = (spot or {}).get("rating_versions", {}).get(review_id)
+        if spot is None or (applied is not None and applied >= version):
+            return None
+        raise RuntimeError(f"Rating version {version - 1} of review {review_id} not applied to spot {spot_id} yet")
+
+    # Same arithmetic as the pipeline, applied to the pre-update values
+    count = (before.get("review_count") or 0) + count_delta
+    total = ((before.get("rating_totals") or {}).get("overall") or 0) + delta.get("overall", 0)
+
+    return {
+        "coordinates": before["coordinates"],
+        "previous_rating": before.get("avg_rating", 0),
+        "avg_rating": total / count if count > 0 else 0
+    }
+
+
+async def rebuild_rating_aggregates(batch_size: int = 1000) -> int:
+    """
+    Recompute review_count, rating_totals, avg_rating and rating_versions of every spot from the
+    reviews collection. Run it while no rating jobs are queued.
+
+    Returns:
+        int: Number of spots updated
+    """
+    group = {
+        "_id": "$spot_id",
+        "review_count": {"$sum": 1},
+        "versions": {"$push": {"id": "$_id", "version": {"$ifNull": ["$rating_version", 0]}}}
+    }
+    for d in RATING_DIMENSIONS:
+        group[d] = {"$sum": f"$rating.{d}"}
+
+    spots = HammockSpot.get_motor_collection()
+    reviewed_ids = set()
+    updated = 0
+    batch = []
+
+    async def flush():
+        nonlocal updated, batch
+        if batch:
+            updated += (await spots.bulk_write(batch, ordered=False)).modified_count
+            batch = []
+
+    now = datetime.now()
+    async for row in Review.get_motor_collection().aggregate([{"$group": group}], allowDiskUse=True):
+        if not ObjectId.is_valid(row["_id"]):
+            continue
+        spot_id = ObjectId(row["_id"])
+        reviewed_ids.add(spot_id)
+        count = row["review_count"]
+        avg_rating = row["overall"] / count if count else 0
+        batch.append(UpdateOne({"_id": spot_id}, [{"$set": {
+            "review_count": count,
+            "rating_totals": {d: {"$literal": row[d]} for d in RATING_DIMENSIONS},
+            "avg_rating": {"$literal": avg_rating},
+            "rating_versions": {"$literal": {str(v["id"]): v["version"] for v in row["versions"]}},
+            # Only repaired spots count as changed for delta sync
+            "updated_at": {"$cond": [
+                {"$and": [{"$eq": ["$review_count", count]}, {"$eq": ["$avg_rating", avg_rating]}]},
+                "$updated_at",
+                now
+            ]}
+        }}]))
+        if len(batch) >= batch_size:
+            await flush()
+
+    # Spots whose reviews are all gone
+    stale = spots.find(
+        {"$or": [{"review_count": {"$ne": 0}}, {"avg_rating": {"$ne": 0}}]},
+        {"_id": 1}
+    ).batch_size(batch_size)
+    async for doc in stale:
+        if doc["_id"] in reviewed_ids:
+            continue
+        batch.append(UpdateOne({"_id": doc["_id"]}, {"$set": {
+            "review_count": 0,
+            "rating_totals": {d: 0 for d in RATING_DIMENSIONS},
+            "avg_rating": 0,
+            "rating_versions": {},
+            "updated_at": now
+        }}))
+        if len(batch) >= batch_size:
+            await flush()
+
+    await flush()
+    return updated
@@ -0,0 +1,93 @@
+# app/utils/helpers/spot_changes.py
+"""
+Change feed behind GET /v1/spots/changes.
+
+Spots are ordered by (updated_at, _id) and deletions by (deleted_at, _id) in
+spot_tombstones. Both are read with keyset queries and merged into one stream,
+so a page costs two indexed range scans whatever the size of the collection.
+
+A sync covers the window [since, until). `until` lags the clock by
+SPOT_SYNC_SETTLE_SECONDS so a write whose timestamp was taken just before the
+query but committed just after it is picked up by the next sync instead of being
+skipped. `until` is fixed by the first page and carried in the cursor, and it
+becomes the client's next watermark once the last page was read.
+"""
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+from bson.objectid import ObjectId
+from app.config import SPOT_SYNC_SETTLE_SECONDS
+from app.models.hammock_spot import HammockSpot
+from app.models.spot_tombstone import SpotTombstone
+from app.utils.helpers.cursor import encode_cursor, decode_cursor
+
+# Internal fields that are not part of the spot response
+_SPOT_PROJECTION = {"location": 0, "rating_totals": 0, "rating_versions": 0}
+
+
+def _window_query(field: str, since: datetime, until: datetime, last: Optional[tuple]) -> dict:
+    """Documents with since <= field < until, after the (timestamp, _id) keyset position"""
+    query = {field: {"$gte": since, "$lt": until}}
+    if last is not None:
+        last_ts, last_id = last
+        query = {"$and": [query, {"$or": [
+            {field: {"$gt": last_ts}},
+            {field: last_ts, "_id": {"$gt": last_id}}
+        ]}]}
+    return query
+
+
+async def find_spot_changes(
+    since: datetime,
+    limit: int,
+    cursor: Optional[str] = None,
+    photo_size: str = "thumbnail"
+) -> Tuple[List[dict], Optional[str], datetime]:
+    """
+    Read one page of spot changes
+
+    Args:
+        since: Client watermark (inclusive)
+        limit: Maximum number of changes per page
+        cursor: next_cursor of the previous page of the same sync
+        photo_size: Size of the photo URLs in the returned spots
+
+    Returns:
+        tuple: (changes in order, next cursor or None, watermark for the next sync)
+    """
+    last = None
+    if cursor:
+        last_ts, last_id, until = decode_cursor(cursor, "changes", (datetime, ObjectId, datetime))
+        last = (last_ts, last_id)
+    else:
+        until = datetime.now() - timedelta(seconds=SPOT_SYNC_SETTLE_SECONDS)
+
+    spots = await HammockSpot.get_motor_collection() \
+        .find(_window_query("updated_at", since, until, last), _SPOT_PROJECTION) \
+        .sort([("updated_at", 1), ("_id", 1)]) \
+        .limit(limit + 1) \
+        .to_list(length=None)
+    tombstones = await SpotTombstone.get_motor_collection() \
+        .find(_window_query("deleted_at", since, until, last), {"spot_id": 1, "deleted_at": 1}) \
+        .sort([("deleted_at", 1), ("_id", 1)]) \
+        .limit(limit + 1) \
+        .to_list(length=None)
+
+    merged = sorted(
+        [(doc["updated_at"], doc["_id"], "upsert", doc) for doc in spots] +
+        [(doc["deleted_at"], doc["_id"], "delete", doc) for doc in tombstones],
+        key=lambda change: (change[0], change[1])
+    )
+
+    next_cursor = None
+    if len(merged) > limit:
+        merged = merged[:limit]
+        last_ts, last_id = merged[-1][0], merged[-1][1]
+        next_cursor = encode_cursor("changes", last_ts, last_id, until)
+
+    changes = []
+    for _, _, op, doc in merged:
+        if op == "upsert":
+            changes.append({"op": op, "id": str(doc["_id"]), "spot": HammockSpot.response_from_doc(doc, photo_size)})
+        else:
+            changes.append({"op": op, "id": doc["spot_id"]})
+    return changes, next_cursor, until
@@ -0,0 +1,460 @@
+# app/utils/helpers/spot_import.py
+"""
+Bulk import of spots from GeoJSON or CSV, e.g. datasets from parks departments.
+
+The input is parsed while it streams in, so a file of any size is held in memory
+one batch of rows at a time. A GeoJSON FeatureCollection is read feature by
+feature (Point geometries, spot fields in `properties`); a CSV needs a header
+row naming the columns:
+
+    name, description, latitude, longitude, tree_types, distance_between_trees,
+    restrooms, water_source, shade, parking, food_nearby, swimming, is_private
+
+tree_types is a list (GeoJSON) or a `;`-separated string; amenities may also be
+given as an `amenities` object in GeoJSON. Every row is validated against
+HammockSpot, and rows within SPOT_IMPORT_DUPLICATE_RADIUS of an existing spot or
+of an earlier row are skipped as duplicates.
+
+Valid rows are written with one unordered insert_many per batch, so one bad
+document does not stop the others. The creator's created_spots and the map
+clusters are then updated once per batch by a SpotsImported job.
+"""
+import codecs
+import csv
+import json
+import math
+import re
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+from bson.objectid import ObjectId
+from pydantic import BaseModel, ValidationError
+from pymongo.errors import BulkWriteError
+from app.config import SPOT_IMPORT_BATCH_SIZE, SPOT_IMPORT_DUPLICATE_RADIUS, SPOT_IMPORT_MAX_REPORTED_ROWS
+from app.jobs import enqueue, ImportedSpot, SpotsImported
+from app.models.hammock_spot import HammockSpot, Amenities, Coordinates, GeoPoint
+from app.models.user import User
+from app.utils.helpers.geo import EARTH_RADIUS_METERS, haversine_meters
+from app.utils.helpers.spot_search_cache import spot_search_cache
+from app.utils.helpers.spot_tiles import tile_cache
+
+IMPORT_FORMATS = ("geojson", "csv")
+
+# A single JSON value (one feature) larger than this is rejected rather than buffered
+_MAX_VALUE_CHARS = 1024 * 1024
+
+# Characters a JSON number can continue with
+_NUMBER_CHARS = "0123456789.eE+-"
+
+_AMENITY_FIELDS = tuple(Amenities.__fields__)
+_TRUE = {"1", "true", "yes", "y"}
+_FALSE = {"", "0", "false", "no", "n"}
+
+Record = Tuple[int, Any]  # (1-based row number, raw record or the error that made it unreadable)
+
+
+class SpotImportReport(BaseModel):
+    """Outcome of an import; failed and skipped rows are listed up to SPOT_IMPORT_MAX_REPORTED_ROWS"""
+    rows: int = 0
+    inserted: int = 0
+    duplicates: int = 0
+    failed: int = 0
+    errors: List[dict] = []  # {"row", "error"}
+    skipped: List[dict] = []  # {"row", "duplicate_of"}: spot ID, or "row N" within the import
+    aborted: Optional[str] = None  # Set when the input stopped being readable; rows before it were imported
+
+    def add_error(self, row: int, error: str):
+        self.failed += 1
+        if len(self.errors) < SPOT_IMPORT_MAX_REPORTED_ROWS:
+            self.errors.append({"row": row, "error": error})
+
+    def add_duplicate(self, row: int, duplicate_of: str):
+        self.duplicates += 1
+        if len(self.skipped) < SPOT_IMPORT_MAX_REPORTED_ROWS:
+            self.skipped.append({"row": row, "duplicate_of": duplicate_of})
+
+
+# ---- Streaming parsers ----
+
+class _JsonStream:
+    """Reads JSON tokens and values incrementally from a stream of byte chunks"""
+
+    def __init__(self, chunks: AsyncIterator[bytes]):
+        self._chunks = chunks.__aiter__()
+        self._decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self._json = json.JSONDecoder()
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    async def _fill(self) -> bool:
+        """Append the next chunk to the buffer, dropping what was consumed; False at the end"""
+        if self._eof:
+            return False
+        try:
+            chunk = await self._chunks.__anext__()
+        except StopAsyncIteration:
+            self._eof = True
+            chunk = None
+        text = self._decoder.decode(chunk or b"", final=chunk is None)
+        self._buffer = self._buffer[self._pos:] + text
+        self._pos = 0
+        return True
+
+    async def peek(self) -> str:
+        """Next non-whitespace character without consuming it"""
+        while True:
+            while self._pos < len(self._buffer) and self._buffer[self._pos] in " \t\r\n":
+                self._pos += 1
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not await self._fill():
+                raise ValueError("Unexpected end of JSON input")
+
+    async def expect(self, chars: str) -> str:
+        """Consume the next character, which must be one of chars"""
+        char = await self.peek()
+        if char not in chars:
+            raise ValueError(f"Expected {' or '.join(map(repr, chars))} but found {char!r}")
+        self._pos += 1
+        return char
+
+    async def value(self) -> Any:
+        """Decode the next complete JSON value"""
+        await self.peek()
+        while True:
+            try:
+                value, end = self._json.raw_decode(self._buffer, self._pos)
+            except json.JSONDecodeError:
+                # Usually a value cut off at the end of the buffer
+                if len(self._buffer) - self._pos > _MAX_VALUE_CHARS or not await self._fill():
+                    raise
+                continue
+            # A number at the end of the buffer, or cut off after its "." or "e", may continue in the next chunk
+            if not self._eof and not self._buffer[end:].strip(_NUMBER_CHARS):
+                await self._fill()
+                continue
+            self._pos = end
+            return value
+
+
+async def iter_geojson_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[Record]:
+    """Features of a streamed GeoJSON FeatureCollection, numbered from 1"""
+    stream = _JsonStream(chunks)
+    found = False
+    await stream.expect("{")
+    if await stream.peek() == "}":
+        raise ValueError("Not a GeoJSON FeatureCollection: no features")
+    while True:
+        key = await stream.value()
+        await stream.expect(":")
+        if key == "features":
+            found = True
+            await stream.expect("[")
+            row = 0
+            if await stream.peek() != "]":
+                while True:
+                    row += 1
+                    yield row, await stream.value()
+                    if await stream.expect(",]") == "]":
+                        break
+            else:
+                await stream.expect("]")
+        else:
+            await stream.value()
+        if await stream.expect(",}") == "}":
+            break
+    if not found:
+        raise ValueError("Not a GeoJSON FeatureCollection: no features")
+
+
+async def _iter_lines(chunks: AsyncIterator[bytes]) -> AsyncIterator[str]:
+    decoder = codecs.getincrementaldecoder("utf-8-sig")()
+    pending = ""
+    async for chunk in chunks:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line + "\n"
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+async def iter_csv_records(chunks: AsyncIterator[bytes]) -> AsyncIterator[Record]:
+    """Data rows of a streamed CSV file as dicts keyed by the header row, numbered from 1"""
+    header = None
+    row = 0
+    record = ""
+    async for line in _iter_lines(chunks):
+        # A quoted field may span lines; a record is complete once its quotes balance
+        record += line
+        if record.count('"') % 2:
+            continue
+        values = next(csv.reader([record]), [])
+        record = ""
+        if not any(value.strip() for value in values):
+            continue
+        if header is None:
+            header = [name.strip().lower() for name in values]
+            continue
+        row += 1
+        if len(values) > len(header):
+            yield row, ValueError(f"{len(values)} columns but the header has {len(header)}")
+            continue
+        yield row, dict(zip(header, values))
+    if record:
+        row += 1
+        yield row, ValueError("Unterminated quoted field")
+
+
+def iter_import_records(chunks: AsyncIterator[bytes], format: str) -> AsyncIterator[Record]:
+    """Raw records of a GeoJSON or CSV stream"""
+    if format == "geojson":
+        return iter_geojson_records(chunks)
+    if format == "csv":
+        return iter_csv_records(chunks)
+    raise ValueError(f"Unknown import format {format!r}, expected one of: {', '.join(IMPORT_FORMATS)}")
+
+
+# ---- Row validation ----
+
+def _parse_bool(value: Any, field: str) -> bool:
+    if isinstance(value, bool) or value is None:
+        return bool(value)
+    text = str(value).strip().lower()
+    if text in _TRUE:
+        return True
+    if text in _FALSE:
+        return False
+    raise ValueError(f"{field}: expected true or false, got {value!r}")
+
+
+def _parse_float(value: Any, field: str) -> Optional[float]:
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{field}: expected a number, got {value!r}")
+    if not math.isfinite(number):
+        raise ValueError(f"{field}: expected a finite number, got {value!r}")
+    return number
+
+
+def _flatten_feature(feature: Any) -> dict:
+    """Spot fields of a GeoJSON Point feature, in the same shape as a CSV row"""
+    if not isinstance(feature, dict) or feature.get("type") != "Feature":
+        raise ValueError("Not a GeoJSON Feature")
+    geometry = feature.get("geometry") or {}
+    coordinates = geometry.get("coordinates")
+    if geometry.get("type") != "Point" or not isinstance(coordinates, list) or len(coordinates) < 2:
+        raise ValueError("geometry: expected a Point")
+    properties = feature.get("properties") or {}
+    if not isinstance(properties, dict):
+        raise ValueError("properties: expected an object")
+    fields = dict(properties)
+    amenities = fields.pop("amenities", None)
+    if isinstance(amenities, dict):
+        fields.update({name: value for name, value in amenities.items() if name in _AMENITY_FIELDS})
+    fields["longitude"], fields["latitude"] = coordinates[0], coordinates[1]
+    return fields
+
+
+def spot_from_record(record: Any, format: str, creator_id: str) -> HammockSpot:
+    """
+    Validate one raw record and build the spot it describes
+
+    Raises:
+        ValueError: With a message naming the offending field
+    """
+    if isinstance(record, Exception):
+        raise record
+    fields = _flatten_feature(record) if format == "geojson" else record
+
+    latitude = _parse_float(fields.get("latitude"), "latitude")
+    longitude = _parse_float(fields.get("longitude"), "longitude")
+    if latitude is None or not -90 <= latitude <= 90:
+        raise ValueError("latitude: expected a number between -90 and 90")
+    if longitude is None or not -180 <= longitude <= 180:
+        raise ValueError("longitude: expected a number between -180 and 180")
+
+    name = fields.get("name")
+    name = name.strip() if isinstance(name, str) else name
+    if not name:
+        raise ValueError("name: required")
+
+    tree_types = fields.get("tree_types") or []
+    if isinstance(tree_types, str):
+        tree_types = [value.strip().lower() for value in re.split(r"[;|]", tree_types) if value.strip()]
+
+    description = fields.get("description")
+    coordinates = Coordinates(latitude=latitude, longitude=longitude)
+    now = datetime.now()
+    try:
+        return HammockSpot(
+            name=name,
+            description=description or None,
+            coordinates=coordinates,
+            location=GeoPoint.from_coordinates(coordinates),
+            tree_types=tree_types,
+            distance_between_trees=_parse_float(fields.get("distance_between_trees"), "distance_between_trees"),
+            amenities=Amenities(**{name: _parse_bool(fields.get(name), name) for name in _AMENITY_FIELDS}),
+            creator_id=creator_id,
+            is_private=_parse_bool(fields.get("is_private"), "is_private"),
+            created_at=now,
+            updated_at=now
+        )
+    except ValidationError as e:
+        raise ValueError("; ".join(
+            f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in e.errors()
+        ))
+
+
+# ---- Near-duplicate detection ----
+
+class _PointGrid:
+    """Points bucketed in cells about `radius` meters tall, to find one within radius of a location"""
+
+    def __init__(self, radius: float):
+        self.radius = radius
+        self.cell = math.degrees(radius / EARTH_RADIUS_METERS)  # Degrees of latitude
+        self.cells: Dict[Tuple[int, int], list] = defaultdict(list)
+
+    def _key(self, lat: float, lng: float) -> Tuple[int, int]:
+        return math.floor(lat / self.cell), math.floor(lng / self.cell)
+
+    def add(self, lat: float, lng: float, label: str):
+        self.cells[self._key(lat, lng)].append((lat, lng, label))
+
+    def find(self, lat: float, lng: float) -> Optional[str]:
+        """Label of a point within radius, or None"""
+        cell_y, cell_x = self._key(lat, lng)
+        # A degree of longitude shrinks with latitude, so more cells span the radius
+        span = math.ceil(1 / max(math.cos(math.radians(min(abs(lat) + self.cell, 90))), 1e-3))
+        for dy in (-1, 0, 1):
+            for dx in range(-span, span + 1):
+                for other_lat, other_lng, label in self.cells.get((cell_y + dy, cell_x + dx), ()):
+                    if haversine_meters(lat, lng, other_lat, other_lng) <= self.radius:
+                        return label
+        return None
+
+
+async def _existing_spots_near(spots: List[HammockSpot], radius: float) -> _PointGrid:
+    """Stored spots within radius of any of the given spots, in one query"""
+    grid = _PointGrid(radius)
+    if radius <= 0 or not spots:
+        return grid
+    cursor = HammockSpot.get_motor_collection().find(
+        {"$or": [
+            {"location": {"$geoWithin": {"$centerSphere": [
+                [spot.coordinates.longitude, spot.coordinates.latitude], radius / EARTH_RADIUS_METERS
+            ]}}}
+            for spot in spots
+        ]},
+        {"coordinates": 1}
+    )
+    async for doc in cursor:
+        grid.add(doc["coordinates"]["latitude"], doc["coordinates"]["longitude"], str(doc["_id"]))
+    return grid
+
+
+# ---- Import ----
+
+async def _insert_batch(
+    batch: List[Tuple[int, HammockSpot]],
+    creator: User,
+    duplicate_radius: float,
+    report: SpotImportReport
+):
+    """Skip near-duplicates, insert the rest unordered and queue the follow-up updates"""
+    existing = await _existing_spots_near([spot for _, spot in batch], duplicate_radius)
+    accepted = _PointGrid(duplicate_radius)
+    rows, docs = [], []
+    for row, spot in batch:
+        lat, lng = spot.coordinates.latitude, spot.coordinates.longitude
+        if duplicate_radius > 0:
+            duplicate_of = existing.find(lat, lng) or accepted.find(lat, lng)
+            if duplicate_of:
+                report.add_duplicate(row, duplicate_of)
+                continue
+            accepted.add(lat, lng, f"row {row}")
+        doc = spot.dict(exclude={"id", "revision_id"})
+        doc["_id"] = ObjectId()
+        rows.append(row)
+        docs.append(doc)
+    if not docs:
+        return
+
+    failed = set()
+    try:
+        await HammockSpot.get_motor_collection().insert_many(docs, ordered=False)
+    except BulkWriteError as e:
+        for error in e.details.get("writeErrors", []):
+            failed.add(error["index"])
+            report.add_error(rows[error["index"]], error.get("errmsg", "Insert failed"))
+
+    inserted = [doc for index, doc in enumerate(docs) if index not in failed]
+    report.inserted += len(inserted)
+    if not inserted:
+        return
+
+    # Imports touch spots everywhere, so cached searches and tiles are simply dropped
+    spot_search_cache.clear()
+    tile_cache.clear()
+
+    await enqueue(SpotsImported(
+        creator_id=str(creator.id),
+        creator_uid=creator.firebase_uid,
+        spots=[
+            ImportedSpot(
+                spot_id=str(doc["_id"]),
+                latitude=doc["coordinates"]["latitude"],
+                longitude=doc["coordinates"]["longitude"]
+            )
+            for doc in inserted
+        ]
+    ), idempotency_key=f"spots-imported:{inserted[0]['_id']}")
+
+
+async def import_spots(
+    chunks: AsyncIterator[bytes],
+    format: str,
+    creator: User,
+    batch_size: int = SPOT_IMPORT_BATCH_SIZE,
+    duplicate_radius: float = SPOT_IMPORT_DUPLICATE_RADIUS
+) -> SpotImportReport:
+    """
+    Import spots from a GeoJSON or CSV byte stream
+
+    Args:
+        chunks: The input, e.g. a request body stream
+        format: "geojson" or "csv"
+        creator: User the spots are created by
+        batch_size: Rows per insert_many
+        duplicate_radius: Meters within which a row counts as a duplicate; 0 disables the check
+
+    Returns:
+        SpotImportReport: Counts and per-row errors. A stream that becomes
+            unreadable (malformed JSON) stops the import with `aborted` set;
+            the batches before it stay imported.
+    """
+    report = SpotImportReport()
+    batch: List[Tuple[int, HammockSpot]] = []
+    try:
+        async for row, record in iter_import_records(chunks, format):
+            report.rows += 1
+            try:
+                batch.append((row, spot_from_record(record, format, str(creator.id))))
+            except ValueError as e:
+                report.add_error(row, str(e))
+            if len(batch) >= batch_size:
+                await _insert_batch(batch, creator, duplicate_radius, report)
+                batch = []
+                print(f"Importing spots: {report.rows} rows read, {report.inserted} inserted")
+    except (ValueError, UnicodeDecodeError) as e:
+        report.aborted = str(e)
+
+    if batch:
+        await _insert_batch(batch, creator, duplicate_radius, report)
+    return report
@@ -0,0 +1,103 @@
+# app/utils/helpers/spot_purge.py
+"""
+Cleanup after a spot is deleted.
+
+delete_spot removes the spot document and records what else has to go on its
+tombstone: the reviews of the spot, the photos of the spot and of those reviews
+in storage, the spot ID in users' favorite_spots and created_spots, and its
+count in the map clusters. purge_spot then works through that in bulk, from a
+background job.
+
+Every step is safe to repeat. Reviews are deleted one batch at a time, after the
+photos of that batch, so an interrupted purge still finds the photos it has not
+deleted yet; photos that other spots, reviews or profiles still use are kept.
+Cluster counts are claimed on the tombstone before they are decremented, so
+they are uncounted at most once. Progress is kept on the tombstone, which
+scripts/purge_deleted_spots.py also uses to finish purges that ran out of
+retries.
+"""
+from datetime import datetime
+from typing import Iterable, List, Optional
+from bson.objectid import ObjectId
+from app.config import SPOT_PURGE_BATCH_SIZE
+from app.dependencies.auth import update_user_document
+from app.models.review import Review
+from app.models.spot_tombstone import SpotTombstone
+from app.models.user import User
+from app.utils.helpers.clustering import remove_spot_from_clusters
+from app.utils.storage.photos import delete_unreferenced_photos
+
+
+def photo_urls(docs: Iterable[dict]) -> List[str]:
+    """Original photo URLs of raw spot or review documents; variants are deleted along with them"""
+    return [url for doc in docs for url in doc.get("photos") or []]
+
+
+async def purge_spot(spot_id: str, batch_size: int = SPOT_PURGE_BATCH_SIZE) -> Optional[dict]:
+    """
+    Delete the reviews, photos and user references of a deleted spot
+
+    Args:
+        spot_id: ID of the deleted spot
+        batch_size: Reviews per delete batch
+
+    Returns:
+        dict: Final progress (SpotPurge fields), or None if the spot has no pending purge
+    """
+    tombstones = SpotTombstone.get_motor_collection()
+    tombstone = await tombstones.find_one({"spot_id": spot_id, "purge": {"$ne": None}})
+    if tombstone is None:
+        return None
+    purge = tombstone["purge"]
+
+    async def report(inc: Optional[dict] = None, **fields):
+        update = {"$set": {f"purge.{name}": value for name, value in fields.items()}}
+        if inc:
+            update["$inc"] = {f"purge.{name}": value for name, value in inc.items()}
+        await tombstones.update_one({"_id": tombstone["_id"]}, update)
+
+    await report(status="running", started_at=purge.get("started_at") or datetime.now())
+
+    # Reviews and their photos, one batch at a time
+    reviews = Review.get_motor_collection()
+    while True:
+        batch = await reviews.find({"spot_id": spot_id}, {"photos": 1}) \
+            .sort("_id", 1) \
+            .limit(batch_size) \
+            .to_list(length=None)
+        if not batch:
+            break
+        review_ids = [doc["_id"] for doc in batch]
+        photos_deleted = await delete_unreferenced_photos(
+            photo_urls(batch), ignore_reviews=review_ids, best_effort=False
+        )
+        result = await reviews.delete_many({"_id": {"$in": review_ids}})
+        await report({"reviews_deleted": result.deleted_count, "photos_deleted": photos_deleted})
+        print(f"Purging spot {spot_id}: deleted {result.deleted_count} reviews and {photos_deleted} photos")
+
+    # References in users' spot lists. Users still cached elsewhere may list the spot
+    # until their cache entry expires; favorites pages skip and prune missing spots.
+    result = await User.get_motor_collection().update_many(
+        {"favorite_spots": spot_id},
+        {"$pull": {"favorite_spots": spot_id}, "$set": {"updated_at": datetime.now()}}
+    )
+    await update_user_document(ObjectId(purge["creator_id"]), purge["creator_uid"], {
+        "$pull": {"created_spots": spot_id}
+    })
+    await report({"favorites_removed": result.modified_count})
+
+    photos_deleted = await delete_unreferenced_photos(purge.get("photo_urls") or [], best_effort=False)
+    await report({"photos_deleted": photos_deleted})
+
+    # Claim the cluster update first: a crash after the claim leaves the spot counted
+    # (repaired by rebuild_spot_clusters.py), never uncounted twice
+    claimed = await tombstones.update_one(
+        {"_id": tombstone["_id"], "purge.unclustered": {"$ne": True}},
+        {"$set": {"purge.unclustered": True}}
+    )
+    if claimed.modified_count:
+        await remove_spot_from_clusters(spot_id, purge["latitude"], purge["longitude"])
+
+    await report(status="done", finished_at=datetime.now())
+    done = await tombstones.find_one({"_id": tombstone["_id"]}, {"purge": 1})
+    return done["purge"]
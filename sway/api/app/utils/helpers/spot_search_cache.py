@@ -0,0 +1,139 @@
+# app/utils/helpers/spot_search_cache.py
+"""
+Result cache for GET /v1/spots.
+
+Radius searches are grouped by the geohash tile of their center and a radius
+bucket (the radius rounded up). Nearby clients asking for about the same area
+share one cached candidate list: the location, rating and _id of every spot
+within the bucket radius of any point in the tile. Each request then keeps the
+candidates within its own radius of its own center, measures distances from
+that center and pages through them, so results are exactly those of an uncached
+search. Areas with more than SPOT_SEARCH_CACHE_MAX_CANDIDATES spots are not
+cached, and the cache as a whole holds at most SPOT_SEARCH_CACHE_CANDIDATES.
+
+Searches without a location are exact already and cache the encoded response.
+
+The cache is per process and write-through invalidated by the spot and review
+routes. Writes handled by other workers are bounded by the TTL.
+"""
+from typing import Hashable, List, NamedTuple, Optional, Tuple
+from bson.objectid import ObjectId
+from app.config import SPOT_SEARCH_CACHE_CANDIDATES, SPOT_SEARCH_CACHE_TTL
+from app.utils.helpers.cache import TTLCache
+from app.utils.helpers.geo import geohash_encode, geohash_bounds, geohash_center, haversine_meters
+from app.utils.metrics import metrics
+
+# (max radius in meters, geohash precision) - roughly 150m tiles for a 5km search
+RADIUS_BUCKETS = [
+    (250, 8),
+    (500, 8),
+    (1000, 8),
+    (2000, 7),
+    (3000, 7),
+    (5000, 7),
+    (7500, 6),
+    (10000, 6),
+    (15000, 6),
+    (25000, 6),
+    (50000, 5),
+    (100000, 5),
+]
+
+# Approximate memory of one candidate tuple, the unit the cache size is counted in
+_CANDIDATE_BYTES = 250
+
+
+def _entry_size(entry: tuple) -> int:
+    """Cache weight of an entry, in candidates"""
+    area, value = entry
+    if area is None:
+        return max(1, len(value[0]) // _CANDIDATE_BYTES)
+    return max(1, len(value or ()))
+
+
+spot_search_cache = TTLCache(SPOT_SEARCH_CACHE_CANDIDATES, SPOT_SEARCH_CACHE_TTL, getsizeof=_entry_size)
+metrics.register_gauge("spot_search_cache", spot_search_cache.stats)
+
+
+class SearchArea(NamedTuple):
+    tile: str
+    bucket: float
+    lat: float
+    lng: float
+    radius: float  # Around the tile center, covers the bucket radius around every point of the tile
+
+
+# (lat, lng, avg_rating, _id) of a spot in a cached search area
+Candidate = Tuple[float, float, float, ObjectId]
+
+
+def snap_search_area(lat: float, lng: float, radius: float) -> Optional[SearchArea]:
+    """
+    Find the cache tile and radius bucket of a radius search
+
+    Returns:
+        SearchArea: Tile, radius bucket and the circle around the tile center its
+        candidates are loaded from, or None if the radius is larger than the
+        biggest bucket and should not be cached
+    """
+    for bucket, precision in RADIUS_BUCKETS:
+        if radius <= bucket:
+            tile = geohash_encode(lat, lng, precision)
+            center_lat, center_lng = geohash_center(tile)
+            min_lat, min_lng, max_lat, max_lng = geohash_bounds(tile)
+            # The search center can be anywhere in the tile, at most a corner away from its center
+            reach = max(
+                haversine_meters(center_lat, center_lng, corner_lat, corner_lng)
+                for corner_lat in (min_lat, max_lat)
+                for corner_lng in (min_lng, max_lng)
+            )
+            return SearchArea(tile, float(bucket), center_lat, center_lng, bucket + reach + 1)
+    return None
+
+
+def get_cached_search(key: Hashable) -> Optional[Tuple[bytes, Optional[str]]]:
+    """Return a cached, already encoded get_spots response body with its next cursor, or None"""
+    entry = spot_search_cache.get(key)
+    return entry[1] if entry is not None else None
+
+
+def cache_search(key: Hashable, body: bytes, next_cursor: Optional[str]):
+    """Store an encoded get_spots response body and next cursor of a search without a location"""
+    spot_search_cache.set(key, (None, (body, next_cursor)))
+
+
+def get_cached_candidates(key: Hashable) -> Tuple[bool, Optional[List[Candidate]]]:
+    """
+    Look up the candidate spots of a search area
+
+    Returns:
+        tuple: (whether the key was cached, candidates or None if the area has too many)
+    """
+    entry = spot_search_cache.get(key)
+    if entry is None:
+        return False, None
+    return True, entry[1]
+
+
+def cache_candidates(key: Hashable, area: SearchArea, candidates: Optional[List[Candidate]]):
+    """Store the candidate spots of a search area; None records that it has too many to cache"""
+    spot_search_cache.set(key, (area, candidates))
+
+
+def invalidate_spot_search(points: List[Tuple[float, float]]):
+    """
+    Drop cached searches that could contain any of the given (lat, lng) points.
+
+    Searches without a location cover every spot and are always dropped.
+    """
+    def covers(_key, entry):
+        area = entry[0]
+        if area is None:
+            return True
+        # Small slack for the spherical distance differences between here and MongoDB
+        return any(
+            haversine_meters(area.lat, area.lng, lat, lng) <= area.radius * 1.001 + 1
+            for lat, lng in points
+        )
+
+    spot_search_cache.evict_where(covers)
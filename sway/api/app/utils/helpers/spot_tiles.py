@@ -0,0 +1,131 @@
+# app/utils/helpers/spot_tiles.py
+"""
+Vector tiles for the spot map.
+
+Tiles below SPOT_TILE_MIN_ZOOM carry the precomputed clusters of that zoom
+level, higher tiles carry individual spots. Encoded tiles are cached per
+process and invalidated for every tile (at every zoom) whose buffered footprint
+contains a changed spot.
+"""
+from typing import List, Set, Tuple
+from app.config import (
+    TILE_MAX_ZOOM, SPOT_TILE_MIN_ZOOM, TILE_EXTENT, TILE_BUFFER, TILE_MAX_FEATURES,
+    TILE_CACHE_SIZE, TILE_CACHE_TTL, CLUSTER_MAX_ZOOM, CLUSTER_CELLS_PER_TILE
+)
+from app.models.hammock_spot import HammockSpot, Amenities
+from app.models.spot_cluster import SpotCluster
+from app.utils.helpers.cache import TTLCache
+from app.utils.helpers.geo import lnglat_to_world, world_to_lnglat, bounds_polygon
+from app.utils.helpers.mvt import PointLayer, encode_tile
+from app.utils.metrics import metrics
+
+tile_cache = TTLCache(TILE_CACHE_SIZE, TILE_CACHE_TTL)
+metrics.register_gauge("spot_tile_cache", tile_cache.stats)
+
+AMENITY_FIELDS = list(Amenities.__fields__.keys())
+SPOT_TILE_PROJECTION = {"coordinates": 1, "avg_rating": 1, "tree_types": 1, "amenities": 1}
+
+
+def _tile_point(lng: float, lat: float, z: int, x: int, y: int) -> Tuple[int, int]:
+    """Tile-local integer coordinates of a point"""
+    world_x, world_y = lnglat_to_world(lng, lat)
+    n = 2 ** z
+    return (
+        int(round((world_x * n - x) * TILE_EXTENT)),
+        int(round((world_y * n - y) * TILE_EXTENT))
+    )
+
+
+def _buffered_bounds(z: int, x: int, y: int) -> Tuple[float, float, float, float]:
+    """(min_lng, min_lat, max_lng, max_lat) of a tile including its buffer"""
+    n = 2 ** z
+    pad = TILE_BUFFER / TILE_EXTENT
+    min_lng, max_lat = world_to_lnglat(max(0.0, (x - pad) / n), max(0.0, (y - pad) / n))
+    max_lng, min_lat = world_to_lnglat(min(1.0, (x + 1 + pad) / n), min(1.0, (y + 1 + pad) / n))
+    return min_lng, min_lat, max_lng, max_lat
+
+
+async def _spot_layer(z: int, x: int, y: int) -> PointLayer:
+    layer = PointLayer("spots", TILE_EXTENT)
+    polygon = bounds_polygon(*_buffered_bounds(z, x, y))
+    docs = await HammockSpot.get_motor_collection().find(
+        {"location": {"$geoWithin": {"$geometry": polygon}}},
+        SPOT_TILE_PROJECTION
+    ).sort("avg_rating", -1).limit(TILE_MAX_FEATURES).to_list(length=None)
+
+    for doc in docs:
+        coords = doc["coordinates"]
+        px, py = _tile_point(coords["longitude"], coords["latitude"], z, x, y)
+        amenities = doc.get("amenities") or {}
+        properties = {
+            "id": str(doc["_id"]),
+            "avg_rating": float(doc.get("avg_rating", 0)),
+            "tree_types": ",".join(doc.get("tree_types") or [])
+        }
+        for field in AMENITY_FIELDS:
+            properties[field] = bool(amenities.get(field, False))
+        layer.add_point(px, py, properties)
+    return layer
+
+
+async def _cluster_layer(z: int, x: int, y: int) -> PointLayer:
+    layer = PointLayer("clusters", TILE_EXTENT)
+    clusters = await SpotCluster.get_motor_collection().find({
+        "zoom": z,
+        "cell_x": {"$gte": x * CLUSTER_CELLS_PER_TILE, "$lt": (x + 1) * CLUSTER_CELLS_PER_TILE},
+        "cell_y": {"$gte": y * CLUSTER_CELLS_PER_TILE, "$lt": (y + 1) * CLUSTER_CELLS_PER_TILE},
+        "spot_count": {"$gt": 0}
+    }).to_list(length=None)
+
+    for cluster in clusters:
+        count = cluster["spot_count"]
+        px, py = _tile_point(cluster["sum_lng"] / count, cluster["sum_lat"] / count, z, x, y)
+        layer.add_point(px, py, {
+            "point_count": count,
+            "id": cluster.get("top_spot_id"),
+            "avg_rating": float(cluster.get("top_rating", 0))
+        })
+    return layer
+
+
+def uses_clusters(z: int) -> bool:
+    """Whether tiles at this zoom are built from clusters instead of spots"""
+    return z < SPOT_TILE_MIN_ZOOM and z <= CLUSTER_MAX_ZOOM
+
+
+async def get_spot_tile(z: int, x: int, y: int) -> bytes:
+    """Encoded MVT for a tile, served from the tile cache when possible"""
+    key = (z, x, y)
+    cached = tile_cache.get(key)
+    if cached is not None:
+        return cached
+
+    layer = await (_cluster_layer(z, x, y) if uses_clusters(z) else _spot_layer(z, x, y))
+    tile = encode_tile([layer])
+    tile_cache.set(key, tile)
+    return tile
+
+
+def tiles_containing(lat: float, lng: float) -> Set[Tuple[int, int, int]]:
+    """Every tile, at every zoom, whose buffered footprint contains a point"""
+    world_x, world_y = lnglat_to_world(lng, lat)
+    pad = TILE_BUFFER / TILE_EXTENT
+    tiles = set()
+    for z in range(TILE_MAX_ZOOM + 1):
+        n = 2 ** z
+        if uses_clusters(z):
+            # Clusters are bucketed by cell, which never straddles a tile edge
+            tiles.add((z, int(world_x * n), int(world_y * n)))
+            continue
+        for tx in {int(world_x * n - pad), int(world_x * n), int(min(world_x * n + pad, n - 1))}:
+            for ty in {int(world_y * n - pad), int(world_y * n), int(min(world_y * n + pad, n - 1))}:
+                if 0 <= tx < n and 0 <= ty < n:
+                    tiles.add((z, tx, ty))
+    return tiles
+
+
+def invalidate_spot_tiles(points: List[Tuple[float, float]]):
+    """Drop cached tiles covering any of the given (lat, lng) points"""
+    for lat, lng in points:
+        for tile in tiles_containing(lat, lng):
+            tile_cache.pop(tile)
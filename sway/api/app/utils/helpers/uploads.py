@@ -0,0 +1,81 @@
+# app/utils/helpers/uploads.py
+"""
+Validation of uploaded photos.
+
+Starlette spools multipart files to a temporary file, so an UploadFile can be
+checked and streamed to storage without its content ever being held in memory.
+The content type is taken from the file's magic bytes rather than the
+client-supplied header.
+"""
+from typing import Optional
+from fastapi import HTTPException, UploadFile
+from app.config import MAX_PHOTO_BYTES
+
+# Bytes needed to recognise every supported format
+_SNIFF_BYTES = 32
+
+# ISO base media "ftyp" brands of HEIF/AVIF images (iPhone photos are HEIC)
+_HEIF_BRANDS = {b"heic", b"heix", b"hevc", b"hevx", b"heim", b"heis", b"mif1", b"msf1"}
+_AVIF_BRANDS = {b"avif", b"avis"}
+
+
+def sniff_image_type(header: bytes) -> Optional[str]:
+    """MIME type of an image from its first bytes, or None if it is not a supported image"""
+    if header.startswith(b"\xff\xd8\xff"):
+        return "image/jpeg"
+    if header.startswith(b"\x89PNG\r\n\x1a\n"):
+        return "image/png"
+    if header[:6] in (b"GIF87a", b"GIF89a"):
+        return "image/gif"
+    if header[:4] == b"RIFF" and header[8:12] == b"WEBP":
+        return "image/webp"
+    if header[4:8] == b"ftyp":
+        brand = header[8:12]
+        if brand in _HEIF_BRANDS:
+            return "image/heic"
+        if brand in _AVIF_BRANDS:
+            return "image/avif"
+    return None
+
+
+async def upload_size(file: UploadFile) -> int:
+    """Size of an uploaded file in bytes, without reading it"""
+    if file.size is not None:
+        return file.size
+    # UploadFile.seek only takes an offset, so seek the spooled file itself to its end
+    file.file.seek(0, 2)
+    size = file.file.tell()
+    file.file.seek(0)
+    return size
+
+
+async def check_image_upload(file: UploadFile) -> str:
+    """
+    Reject an upload that is too large or not an image
+
+    Args:
+        file: Uploaded file
+
+    Returns:
+        str: MIME type detected from the file content
+
+    Raises:
+        HTTPException: 413 if the file exceeds MAX_PHOTO_BYTES, 415 if it is not a supported image
+    """
+    if await upload_size(file) > MAX_PHOTO_BYTES:
+        raise HTTPException(
+            status_code=413,
+            detail=f"{file.filename or 'File'} is larger than {MAX_PHOTO_BYTES / (1024 * 1024):g} MB"
+        )
+
+    await file.seek(0)
+    header = await file.read(_SNIFF_BYTES)
+    await file.seek(0)
+
+    content_type = sniff_image_type(header)
+    if content_type is None:
+        raise HTTPException(
+            status_code=415,
+            detail=f"{file.filename or 'File'} is not a supported image (JPEG, PNG, GIF, WebP, HEIC or AVIF)"
+        )
+    return content_type
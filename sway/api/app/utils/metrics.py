@@ -0,0 +1,89 @@
+# app/utils/metrics.py
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Dict
+
+
+class _Timer:
+    """Latency statistics with a sliding window for percentiles"""
+
+    def __init__(self, window: int = 1024):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.samples = deque(maxlen=window)
+
+    def observe(self, seconds: float):
+        self.count += 1
+        self.total += seconds
+        self.max = max(self.max, seconds)
+        self.samples.append(seconds)
+
+    def snapshot(self) -> dict:
+        ordered = sorted(self.samples)
+
+        def percentile(p):
+            if not ordered:
+                return 0.0
+            return ordered[min(len(ordered) - 1, int(p * len(ordered)))]
+
+        return {
+            "count": self.count,
+            "avg_ms": (self.total / self.count) * 1000 if self.count else 0.0,
+            "p50_ms": percentile(0.50) * 1000,
+            "p95_ms": percentile(0.95) * 1000,
+            "p99_ms": percentile(0.99) * 1000,
+            "max_ms": self.max * 1000
+        }
+
+
+class MetricsRegistry:
+    """Process-local counters, timers and gauges exposed on /metrics"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters: Dict[str, int] = {}
+        self._timers: Dict[str, _Timer] = {}
+        self._gauges: Dict[str, Callable[[], object]] = {}
+
+    def increment(self, name: str, value: int = 1):
+        """Add to a counter"""
+        with self._lock:
+            self._counters[name] = self._counters.get(name, 0) + value
+
+    def observe(self, name: str, seconds: float):
+        """Record a latency sample"""
+        with self._lock:
+            timer = self._timers.get(name)
+            if timer is None:
+                timer = self._timers[name] = _Timer()
+            timer.observe(seconds)
+
+    @contextmanager
+    def timer(self, name: str):
+        """Time the wrapped block and record it under name"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - start)
+
+    def register_gauge(self, name: str, fn: Callable[[], object]):
+        """Register a callable evaluated on every snapshot"""
+        self._gauges[name] = fn
+
+    def snapshot(self) -> dict:
+        """Current value of every metric"""
+        with self._lock:
+            counters = dict(self._counters)
+            timers = {name: timer.snapshot() for name, timer in self._timers.items()}
+        return {
+            "counters": counters,
+            "timers": timers,
+            "gauges": {name: fn() for name, fn in self._gauges.items()}
+        }
+
+
+metrics = MetricsRegistry()
@@ -0,0 +1,52 @@
+# app/utils/responses.py
+"""
+orjson-backed JSON responses.
+
+Routes that return a plain dict go through FastAPI's response_model validation,
+jsonable_encoder and stdlib json, which walks every item twice and converts
+datetimes and ObjectIds along the way. Returning a Response from a route skips
+all of that, so the hot read routes serialize their to_response_model /
+response_from_doc dicts in one orjson call instead.
+"""
+from typing import Any, Optional
+import orjson
+from bson.objectid import ObjectId
+from fastapi.responses import ORJSONResponse, Response
+
+
+def _default(value: Any):
+    """Types orjson does not serialize natively"""
+    if isinstance(value, ObjectId):
+        return str(value)
+    if hasattr(value, "dict"):
+        return value.dict()
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dump_json(content: Any) -> bytes:
+    """Serialize a response payload to JSON bytes"""
+    return orjson.dumps(content, default=_default)
+
+
+class FastJSONResponse(ORJSONResponse):
+    """ORJSONResponse that also handles ObjectId and pydantic models"""
+
+    def render(self, content: Any) -> bytes:
+        return dump_json(content)
+
+
+def json_response(content: Any, status_code: int = 200, headers: Optional[dict] = None) -> Response:
+    """
+    Build a JSON response that bypasses FastAPI's response validation and encoding
+
+    Args:
+        content: Payload, or JSON bytes that were already serialized (e.g. from a cache)
+        status_code: HTTP status code
+        headers: Extra response headers
+
+    Returns:
+        Response: application/json response
+    """
+    if isinstance(content, bytes):
+        return Response(content=content, status_code=status_code, headers=headers, media_type="application/json")
+    return FastJSONResponse(content=content, status_code=status_code, headers=headers)
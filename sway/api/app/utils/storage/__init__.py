@@ -0,0 +1,30 @@
+# app/utils/storage/__init__.py
+from typing import Optional
+from app.config import STORAGE_BACKEND, LOCAL_STORAGE_DIR, LOCAL_STORAGE_URL
+from .base import StorageBackend, IMMUTABLE_CACHE_CONTROL
+from .firebase import FirebaseStorage
+from .local import LocalStorage
+
+_storage: Optional[StorageBackend] = None
+
+
+def get_storage() -> StorageBackend:
+    """The storage backend selected by STORAGE_BACKEND"""
+    global _storage
+    if _storage is None:
+        if STORAGE_BACKEND == "local":
+            _storage = LocalStorage(LOCAL_STORAGE_DIR, LOCAL_STORAGE_URL)
+        elif STORAGE_BACKEND == "firebase":
+            _storage = FirebaseStorage()
+        else:
+            raise ValueError(f"Unknown STORAGE_BACKEND {STORAGE_BACKEND!r}, expected 'firebase' or 'local'")
+    return _storage
+
+
+__all__ = [
+    'StorageBackend',
+    'IMMUTABLE_CACHE_CONTROL',
+    'FirebaseStorage',
+    'LocalStorage',
+    'get_storage'
+]
\ No newline at end of file
@@ -0,0 +1,66 @@
+# app/utils/storage/base.py
+from abc import ABC, abstractmethod
+from typing import BinaryIO, List, Optional, Set
+
+# Objects are named after their content, so they never change once written
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+
+class StorageBackend(ABC):
+    """
+    Blob storage for photos. Every method is blocking and is called through
+    run_firebase_call, which keeps it off the event loop.
+
+    Objects are created publicly readable in the upload request itself and are
+    served from public_url(path).
+    """
+
+    @abstractmethod
+    def public_url(self, path: str) -> str:
+        """Public URL of the object at path, whether or not it exists"""
+
+    @abstractmethod
+    def path_from_url(self, url: str) -> Optional[str]:
+        """Storage path of a URL returned by public_url, or None for other URLs"""
+
+    @abstractmethod
+    def existing_paths(self, prefix: str) -> Set[str]:
+        """Paths of the stored objects whose path starts with prefix"""
+
+    @abstractmethod
+    def upload_bytes(self, data: bytes, path: str, content_type: str) -> str:
+        """
+        Store data at path
+
+        Returns:
+            str: Public URL of the object
+        """
+
+    @abstractmethod
+    def upload_stream(
+        self,
+        file_obj: BinaryIO,
+        path: str,
+        content_type: str,
+        size: Optional[int] = None
+    ) -> str:
+        """
+        Store the content of a readable binary file at path without reading it into memory
+
+        Returns:
+            str: Public URL of the object
+        """
+
+    @abstractmethod
+    def delete(self, path: str):
+        """Delete the object at path"""
+
+    @abstractmethod
+    def delete_many(self, paths: List[str]) -> int:
+        """
+        Delete many objects. Objects that no longer exist count as deleted, so a
+        partly completed delete can simply be repeated.
+
+        Returns:
+            int: Number of paths processed
+        """
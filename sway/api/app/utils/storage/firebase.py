@@ -0,0 +1,172 @@
+# app/utils/storage/firebase.py
+from firebase_admin import storage
+from google.api_core.exceptions import GoogleAPICallError
+from typing import BinaryIO, List, Optional, Set
+from urllib.parse import unquote, urlparse
+from fastapi import HTTPException
+from app.config import UPLOAD_CHUNK_SIZE, STORAGE_DELETE_BATCH_SIZE
+from app.utils.firebase import initialize_firebase
+from .base import StorageBackend, IMMUTABLE_CACHE_CONTROL
+
+
+class FirebaseStorage(StorageBackend):
+    """Photos in the Firebase Storage (Cloud Storage) bucket"""
+
+    def _bucket(self):
+        # Initialize Firebase if not already
+        initialize_firebase()
+        return storage.bucket()
+
+    def _blob(self, path: str, chunk_size: Optional[int] = None):
+        blob = self._bucket().blob(path, chunk_size=chunk_size)
+        # Sent with the object metadata of the upload request
+        blob.cache_control = IMMUTABLE_CACHE_CONTROL
+        return blob
+
+    def public_url(self, path: str) -> str:
+        return self._bucket().blob(path).public_url
+
+    def path_from_url(self, url: str) -> Optional[str]:
+        parsed = urlparse(url)
+        if parsed.netloc != "storage.googleapis.com":
+            return None
+        # /<bucket>/<quoted path>
+        _, _, path = parsed.path.lstrip("/").partition("/")
+        return unquote(path) or None
+
+    def existing_paths(self, prefix: str) -> Set[str]:
+        try:
+            blobs = self._bucket().list_blobs(prefix=prefix, fields="items(name),nextPageToken")
+            return {blob.name for blob in blobs}
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to list files: {str(e)}"
+            )
+
+    def upload_bytes(self, data: bytes, path: str, content_type: str) -> str:
+        """
+        Upload a file to Firebase Storage
+
+        Args:
+            data: Raw file data
+            path: Storage path
+            content_type: MIME type
+
+        Returns:
+            str: Public URL of the uploaded file
+
+        Raises:
+            HTTPException: If upload fails
+        """
+        try:
+            blob = self._blob(path)
+
+            # Created public by the upload request itself instead of a second make_public call
+            blob.upload_from_string(
+                data,
+                content_type=content_type,
+                predefined_acl="publicRead"
+            )
+            return blob.public_url
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to upload file: {str(e)}"
+            )
+
+    def upload_stream(
+        self,
+        file_obj: BinaryIO,
+        path: str,
+        content_type: str,
+        size: Optional[int] = None
+    ) -> str:
+        """
+        Upload a file object to Firebase Storage without reading it into memory
+
+        Files larger than UPLOAD_CHUNK_SIZE go through a resumable upload that reads
+        and sends one chunk at a time; smaller ones are sent in a single request.
+
+        Args:
+            file_obj: Readable binary file, e.g. the spooled file of an UploadFile
+            path: Storage path
+            content_type: MIME type
+            size: Size in bytes, if known
+
+        Returns:
+            str: Public URL of the uploaded file
+
+        Raises:
+            HTTPException: If upload fails
+        """
+        try:
+            blob = self._blob(path, chunk_size=UPLOAD_CHUNK_SIZE)
+
+            # A known size up to 8 MiB makes the client buffer the whole file for a
+            # multipart upload, so only pass it when the file fits in one chunk
+            small = size is not None and size <= UPLOAD_CHUNK_SIZE
+            blob.upload_from_file(
+                file_obj,
+                rewind=True,
+                size=size if small else None,
+                content_type=content_type,
+                predefined_acl="publicRead"
+            )
+            return blob.public_url
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to upload file: {str(e)}"
+            )
+
+    def delete(self, path: str):
+        """
+        Delete a file from Firebase Storage
+
+        Args:
+            path: Storage path
+
+        Raises:
+            HTTPException: If deletion fails
+        """
+        try:
+            self._bucket().blob(path).delete()
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to delete file: {str(e)}"
+            )
+
+    def delete_many(self, paths: List[str]) -> int:
+        """
+        Delete many files from Firebase Storage, one batch request per
+        STORAGE_DELETE_BATCH_SIZE paths
+
+        Args:
+            paths: Storage paths
+
+        Returns:
+            int: Number of paths processed
+
+        Raises:
+            HTTPException: If any file could not be deleted. Files not found are skipped.
+        """
+        try:
+            bucket = self._bucket()
+            for start in range(0, len(paths), STORAGE_DELETE_BATCH_SIZE):
+                chunk = paths[start:start + STORAGE_DELETE_BATCH_SIZE]
+                try:
+                    with bucket.client.batch():
+                        for path in chunk:
+                            bucket.delete_blob(path)
+                except GoogleAPICallError:
+                    # A batch only reports its first failed file, and a file already gone
+                    # counts as failed, so delete the chunk again one file at a time
+                    bucket.delete_blobs(chunk, on_error=lambda blob: None)
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to delete files: {str(e)}"
+            )
+        return len(paths)
@@ -0,0 +1,94 @@
+# app/utils/storage/local.py
+import os
+import shutil
+import tempfile
+from typing import BinaryIO, List, Optional, Set
+from urllib.parse import quote, unquote
+from fastapi import HTTPException
+from .base import StorageBackend
+
+
+class LocalStorage(StorageBackend):
+    """
+    Photos in a directory on local disk, served by the API itself (see main.py).
+    For development, tests and offline benchmarks without a Firebase project.
+    """
+
+    def __init__(self, root: str, base_url: str):
+        self.root = os.path.abspath(root)
+        self.base_url = base_url.rstrip("/")
+
+    def _file(self, path: str) -> str:
+        file_path = os.path.normpath(os.path.join(self.root, path))
+        if not file_path.startswith(self.root + os.sep):
+            raise HTTPException(status_code=400, detail=f"Invalid storage path: {path}")
+        return file_path
+
+    def _write(self, path: str, write):
+        # Written to a temporary file and renamed, so readers never see a partial file
+        file_path = self._file(path)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(file_path), prefix=".upload-")
+        try:
+            with os.fdopen(fd, "wb") as tmp:
+                write(tmp)
+            os.replace(tmp_path, file_path)
+        except Exception as e:
+            if os.path.exists(tmp_path):
+                os.unlink(tmp_path)
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to upload file: {str(e)}"
+            )
+        return self.public_url(path)
+
+    def public_url(self, path: str) -> str:
+        return f"{self.base_url}/{quote(path)}"
+
+    def path_from_url(self, url: str) -> Optional[str]:
+        if not url.startswith(self.base_url + "/"):
+            return None
+        return unquote(url[len(self.base_url) + 1:]) or None
+
+    def existing_paths(self, prefix: str) -> Set[str]:
+        directory, _, name_prefix = prefix.rpartition("/")
+        try:
+            names = os.listdir(self._file(directory) if directory else self.root)
+        except FileNotFoundError:
+            return set()
+        return {
+            f"{directory}/{name}" if directory else name
+            for name in names
+            if name.startswith(name_prefix) and not name.startswith(".upload-")
+        }
+
+    def upload_bytes(self, data: bytes, path: str, content_type: str) -> str:
+        return self._write(path, lambda tmp: tmp.write(data))
+
+    def upload_stream(
+        self,
+        file_obj: BinaryIO,
+        path: str,
+        content_type: str,
+        size: Optional[int] = None
+    ) -> str:
+        def write(tmp):
+            file_obj.seek(0)
+            shutil.copyfileobj(file_obj, tmp)
+        return self._write(path, write)
+
+    def delete(self, path: str):
+        try:
+            os.unlink(self._file(path))
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to delete file: {str(e)}"
+            )
+
+    def delete_many(self, paths: List[str]) -> int:
+        for path in paths:
+            self.delete(path)
+        return len(paths)
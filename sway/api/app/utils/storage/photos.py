@@ -0,0 +1,348 @@
+# app/utils/storage/photos.py
+"""
+Photo uploads and deletes on top of the storage backend.
+
+Photos are content-addressed: each is stored once under the SHA-256 of its
+content, with thumbnail, medium and full WebP variants beside it, so the same
+blob can belong to several spots, reviews and profiles. A photo uploaded before
+is found with one listing request and neither transferred nor rendered again,
+and a photo is only deleted once no document references it any more.
+
+An upload that finds its photo already stored only references it once the
+request is done, so uploads and deletes coordinate through PhotoClaim: uploads
+claim a photo before looking for it, and deletes skip recently claimed photos.
+"""
+import asyncio
+import hashlib
+import mimetypes
+import tempfile
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timedelta, timezone
+from typing import BinaryIO, List, Optional, Tuple
+from fastapi import UploadFile
+from pymongo import ReturnDocument, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from app.config import FIREBASE_UPLOAD_TIMEOUT, PHOTO_UPLOAD_CONCURRENCY, UPLOAD_CHUNK_SIZE, PHOTO_DELETE_GRACE
+from app.models.hammock_spot import HammockSpot
+from app.models.photo import PhotoVariants, PhotoClaim
+from app.models.review import Review
+from app.models.user import User
+from app.utils.firebase import run_firebase_call
+from app.utils.helpers.images import PHOTO_VARIANT_SIZES, render_photo_variants
+from app.utils.helpers.uploads import check_image_upload, upload_size
+from . import get_storage
+
+# How often an upload checks whether a delete of its photo has finished
+_DELETE_POLL_INTERVAL = 0.2
+
+
+async def upload_file(file_data: bytes, path: str, content_type: str = "image/jpeg"):
+    """Upload a file to photo storage and return the public URL"""
+    return await run_firebase_call(
+        get_storage().upload_bytes, file_data, path, content_type, timeout=FIREBASE_UPLOAD_TIMEOUT
+    )
+
+
+def photo_path(digest: str, content_type: str) -> str:
+    """Storage path of a photo, named after the SHA-256 hex digest of its content"""
+    return f"photos/{digest}{mimetypes.guess_extension(content_type) or ''}"
+
+
+def photo_variant_path(path: str, name: str) -> str:
+    """Storage path of one WebP variant of the photo stored at path"""
+    return f"{path}-{name}.webp"
+
+
+def photo_storage_paths(paths: List[str]) -> List[str]:
+    """Storage paths of the given photos and all their variants"""
+    return [
+        stored
+        for path in paths
+        for stored in [path] + [photo_variant_path(path, name) for name in PHOTO_VARIANT_SIZES]
+    ]
+
+
+def _copy_photo(source: BinaryIO, target: BinaryIO) -> str:
+    """Copy an upload chunk by chunk, hashing it on the way, and return its SHA-256 hex digest. Runs in a thread."""
+    digest = hashlib.sha256()
+    source.seek(0)
+    try:
+        for chunk in iter(lambda: source.read(UPLOAD_CHUNK_SIZE), b""):
+            digest.update(chunk)
+            target.write(chunk)
+        target.flush()
+    finally:
+        source.seek(0)
+    return digest.hexdigest()
+
+
+@asynccontextmanager
+async def _local_photo(file: UploadFile, content_type: str):
+    """
+    Copy an uploaded photo to a named temporary file the image workers can open, and
+    yield its local path with the storage path the photo belongs at. Starlette's spooled
+    file may live in memory or be unnamed on disk, so it cannot be handed to another process.
+    The copy is removed on exit.
+    """
+    copy = tempfile.NamedTemporaryFile(prefix="sway-photo-")
+    try:
+        digest = await asyncio.get_running_loop().run_in_executor(None, _copy_photo, file.file, copy)
+        yield copy.name, photo_path(digest, content_type)
+    finally:
+        copy.close()
+
+
+def _claim_time() -> datetime:
+    """
+    Current UTC time at the millisecond precision MongoDB stores, so it can be matched again.
+    UTC because the TTL indexes on the claims expire them by UTC.
+    """
+    now = datetime.now(timezone.utc)
+    return now.replace(microsecond=now.microsecond - now.microsecond % 1000)
+
+
+async def _claim_photo(path: str) -> datetime:
+    """
+    Claim a photo for an upload before looking for it in storage, which keeps deletes
+    away from it for PHOTO_DELETE_GRACE. If a delete got there first, wait until it
+    has finished so the upload finds the photo gone and stores it again.
+
+    Returns:
+        datetime: used_at of the claim
+    """
+    collection = PhotoClaim.get_motor_collection()
+    used_at = _claim_time()
+    for attempt in range(2):
+        try:
+            claim = await collection.find_one_and_update(
+                {"path": path},
+                {"$set": {"used_at": used_at}},
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+            break
+        except DuplicateKeyError:
+            # A concurrent upload or delete inserted the claim between our match and insert
+            if attempt:
+                raise
+
+    if claim.get("deleting_at") is not None:
+        # A delete's storage calls give up after FIREBASE_UPLOAD_TIMEOUT, so a mark
+        # outliving that was left by a crashed delete
+        deadline = time.monotonic() + FIREBASE_UPLOAD_TIMEOUT
+        while time.monotonic() < deadline and await collection.count_documents(
+            {"path": path, "deleting_at": {"$ne": None}}, limit=1
+        ):
+            await asyncio.sleep(_DELETE_POLL_INTERVAL)
+    return used_at
+
+
+async def _release_photo_claims(claims: List[Tuple[str, datetime]]):
+    """Drop the given (path, used_at) claims unless another upload renewed them since"""
+    collection = PhotoClaim.get_motor_collection()
+    for path, used_at in claims:
+        await collection.update_one({"path": path, "used_at": used_at}, {"$unset": {"used_at": ""}})
+
+
+async def _mark_deleting(paths: List[str], deleting_at: datetime) -> List[str]:
+    """
+    Mark photos as being deleted, except those an upload claimed within PHOTO_DELETE_GRACE
+    or another delete already marked. Each mark is a single atomic update, so an upload
+    either claimed the photo first or sees the mark and waits for the delete.
+
+    Returns:
+        list: The paths marked, which the caller must delete and unmark
+    """
+    cutoff = deleting_at - timedelta(seconds=PHOTO_DELETE_GRACE)
+    requests = [
+        UpdateOne(
+            {"path": path, "deleting_at": None, "$or": [{"used_at": None}, {"used_at": {"$lt": cutoff}}]},
+            {"$set": {"deleting_at": deleting_at}, "$unset": {"used_at": ""}},
+            upsert=True
+        )
+        for path in paths
+    ]
+    try:
+        await PhotoClaim.get_motor_collection().bulk_write(requests, ordered=False)
+        return paths
+    except BulkWriteError as e:
+        # The upsert of a path that is claimed or marked collides with its claim on the unique index
+        errors = e.details["writeErrors"]
+        if any(error["code"] != 11000 for error in errors):
+            raise
+        skipped = {error["index"] for error in errors}
+        return [path for index, path in enumerate(paths) if index not in skipped]
+
+
+async def _unmark_deleting(paths: List[str], deleting_at: datetime):
+    """Remove the marks of a finished delete, keeping claims uploads made meanwhile"""
+    collection = PhotoClaim.get_motor_collection()
+    await collection.delete_many({"path": {"$in": paths}, "deleting_at": deleting_at, "used_at": None})
+    await collection.update_many(
+        {"path": {"$in": paths}, "deleting_at": deleting_at},
+        {"$unset": {"deleting_at": ""}}
+    )
+
+
+async def _upload_photo_variants(local: str, path: str, names: List[str]) -> dict:
+    """Render a photo's variants and upload the named ones concurrently; empty if it could not be decoded"""
+    if not names:
+        return {}
+    rendered = await render_photo_variants(local)
+    if rendered is None:
+        return {}
+    names = [name for name in names if name in rendered]
+    urls = await asyncio.gather(*(
+        upload_file(rendered[name], photo_variant_path(path, name), "image/webp")
+        for name in names
+    ))
+    return dict(zip(names, urls))
+
+
+async def _store_photo(file: UploadFile, local: str, path: str, content_type: str) -> PhotoVariants:
+    """
+    Upload a photo and its variants unless they are already stored. A photo uploaded
+    before (by anyone) is found with one listing request and is neither transferred
+    nor rendered again.
+    """
+    storage = get_storage()
+    existing = await run_firebase_call(storage.existing_paths, path)
+    stored = {
+        name: storage.public_url(photo_variant_path(path, name))
+        for name in PHOTO_VARIANT_SIZES
+        if photo_variant_path(path, name) in existing
+    }
+    missing = [name for name in PHOTO_VARIANT_SIZES if name not in stored]
+
+    async def upload_original():
+        if path in existing:
+            return storage.public_url(path)
+        size = await upload_size(file)
+        return await run_firebase_call(
+            storage.upload_stream, file.file, path, content_type, size, timeout=FIREBASE_UPLOAD_TIMEOUT
+        )
+
+    # The variants are rendered while the original streams from the spooled file
+    original, variants = await asyncio.gather(
+        upload_original(),
+        _upload_photo_variants(local, path, missing)
+    )
+    return PhotoVariants(original=original, **stored, **variants)
+
+
+async def upload_photo(file: UploadFile, content_type: Optional[str] = None) -> PhotoVariants:
+    """
+    Store an uploaded photo along with its thumbnail, medium and full WebP variants under a
+    path derived from its content, and return their public URLs.
+    The photo is validated first unless the caller already did and passes its content_type.
+    """
+    if content_type is None:
+        content_type = await check_image_upload(file)
+    async with _local_photo(file, content_type) as (local, path):
+        await _claim_photo(path)
+        return await _store_photo(file, local, path, content_type)
+
+
+async def upload_photos(photos: List[Tuple[UploadFile, str]]) -> List[PhotoVariants]:
+    """
+    Upload several photos and their variants concurrently, at most PHOTO_UPLOAD_CONCURRENCY at a time
+    
+    Args:
+        photos: (file, content type) of every photo, already validated
+        
+    Returns:
+        list: PhotoVariants in the same order as photos
+        
+    Raises:
+        HTTPException: The first upload error. Photos uploaded by then are deleted
+            again unless something else uses them, and photos still waiting are not started.
+    """
+    semaphore = asyncio.Semaphore(PHOTO_UPLOAD_CONCURRENCY)
+    failed = False
+    claims = []
+    
+    async def upload(file, content_type):
+        nonlocal failed
+        async with semaphore:
+            if failed:
+                return None
+            try:
+                async with _local_photo(file, content_type) as (local, path):
+                    claims.append((path, await _claim_photo(path)))
+                    return await _store_photo(file, local, path, content_type)
+            except BaseException:
+                failed = True
+                raise
+    
+    # Let in-flight uploads finish so every blob that made it to storage is known and can be removed
+    results = await asyncio.gather(*(upload(*photo) for photo in photos), return_exceptions=True)
+    errors = [result for result in results if isinstance(result, BaseException)]
+    if errors:
+        # A failed photo may have left its original or some variants behind; deleting a missing blob is harmless.
+        # Our own claims would keep them from being deleted, while those of other uploads still count.
+        await _release_photo_claims(claims)
+        storage = get_storage()
+        await delete_unreferenced_photos([storage.public_url(path) for path, _ in claims])
+        raise errors[0]
+    return results
+
+
+async def delete_file(path: str):
+    """Delete a file from photo storage"""
+    await run_firebase_call(get_storage().delete, path)
+
+
+async def delete_files(paths: List[str], best_effort: bool = True):
+    """
+    Delete many files with batched requests; files already gone are skipped.
+    Failures are only logged unless best_effort is False, as when cleaning up after a failed request.
+    """
+    if not paths:
+        return
+    try:
+        await run_firebase_call(get_storage().delete_many, paths, timeout=FIREBASE_UPLOAD_TIMEOUT)
+    except Exception as e:
+        if not best_effort:
+            raise
+        print(f"Failed to delete orphaned uploads {', '.join(paths[:5])}: {e}")
+
+
+async def delete_unreferenced_photos(urls: List[str], ignore_reviews: List = (), best_effort: bool = True) -> int:
+    """
+    Delete photos, variants included, that no spot, review or profile uses any more
+    
+    Photos are stored once per content, so the same blob can belong to several
+    documents; only those whose URL is found in none of them are deleted. Photos an
+    upload claimed within PHOTO_DELETE_GRACE are skipped too, since that upload may
+    reference them once its request completes. If it fails instead, the blobs stay
+    in storage unused.
+    
+    Args:
+        urls: Public URLs of original photos
+        ignore_reviews: _ids of reviews about to be deleted, whose photos do not count as used
+        best_effort: Only log storage failures instead of raising
+        
+    Returns:
+        int: Number of photos deleted, not counting claimed ones
+    """
+    urls = list(set(urls))
+    if not urls:
+        return 0
+    used = set(await HammockSpot.get_motor_collection().distinct("photos", {"photos": {"$in": urls}}))
+    used.update(await Review.get_motor_collection().distinct(
+        "photos", {"photos": {"$in": urls}, "_id": {"$nin": list(ignore_reviews)}}
+    ))
+    used.update(await User.get_motor_collection().distinct("profile_photo", {"profile_photo": {"$in": urls}}))
+    
+    storage = get_storage()
+    paths = sorted({storage.path_from_url(url) for url in urls if url not in used} - {None})
+    if not paths:
+        return 0
+    deleting_at = _claim_time()
+    paths = await _mark_deleting(paths, deleting_at)
+    try:
+        await delete_files(photo_storage_paths(paths), best_effort)
+    finally:
+        await _unmark_deleting(paths, deleting_at)
+    return len(paths)
@@ -0,0 +1,57 @@
+# scripts/backfill_spot_locations.py
+"""
+Backfill the GeoJSON `location` field on existing HammockSpot documents.
+
+Spots created before `location` existed only carry the lat/lng `coordinates`
+sub-document, so they are invisible to the 2dsphere index used by radius
+search. This copies `coordinates` into `location` server-side with a single
+pipeline update and is safe to re-run.
+
+Usage (from the api directory):
+    MONGODB_URL=mongodb://localhost:27017/hammock_spots python scripts/backfill_spot_locations.py
+"""
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.dependencies.database import connect_to_mongodb, close_mongodb_connection
+from app.models.hammock_spot import HammockSpot
+
+
+async def backfill_locations() -> int:
+    """Set `location` from `coordinates` on every spot that is missing it"""
+    collection = HammockSpot.get_motor_collection()
+    result = await collection.update_many(
+        {
+            "location": {"$exists": False},
+            "coordinates.latitude": {"$type": "number"},
+            "coordinates.longitude": {"$type": "number"},
+        },
+        [
+            {
+                "$set": {
+                    "location": {
+                        "type": "Point",
+                        "coordinates": ["$coordinates.longitude", "$coordinates.latitude"],
+                    }
+                }
+            }
+        ],
+    )
+    return result.modified_count
+
+
+async def main():
+    # init_beanie also creates the 2dsphere index declared on HammockSpot
+    await connect_to_mongodb()
+    try:
+        modified = await backfill_locations()
+        print(f"Backfilled location on {modified} spots.")
+    finally:
+        await close_mongodb_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,45 @@
+# scripts/backfill_spot_updated_at.py
+"""
+Backfill `updated_at` on HammockSpot documents that never had it set.
+
+Delta sync (GET /v1/spots/changes) pages through spots by updated_at, so spots
+created before every write path set it would never be reported. This copies
+`created_at` into `updated_at` server-side with a single pipeline update and is
+safe to re-run. Clients holding no watermark do a full reload anyway.
+
+Usage (from the api directory):
+    MONGODB_URL=mongodb://localhost:27017/hammock_spots python scripts/backfill_spot_updated_at.py
+"""
+import asyncio
+import os
+import sys
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.dependencies.database import connect_to_mongodb, close_mongodb_connection
+from app.models.hammock_spot import HammockSpot
+
+
+async def backfill_updated_at() -> int:
+    """Set `updated_at` from `created_at` (or now) on every spot that is missing it"""
+    collection = HammockSpot.get_motor_collection()
+    result = await collection.update_many(
+        {"updated_at": None},
+        [{"$set": {"updated_at": {"$ifNull": ["$created_at", datetime.now()]}}}],
+    )
+    return result.modified_count
+
+
+async def main():
+    # init_beanie also creates the updated_at index declared on HammockSpot
+    await connect_to_mongodb()
+    try:
+        modified = await backfill_updated_at()
+        print(f"Backfilled updated_at on {modified} spots.")
+    finally:
+        await close_mongodb_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
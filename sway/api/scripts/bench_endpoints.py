@@ -0,0 +1,440 @@
+# scripts/bench_endpoints.py
+"""
+Load test of the hot API endpoints, reporting throughput and latency percentiles per route.
+
+Boots app.main:app under uvicorn in a child process against the database in
+MONGODB_URL, with local stand-ins for Firebase:
+
+- auth: a bearer token "bench:<firebase_uid>" verifies as that UID, so no
+  Firebase project or signed ID tokens are needed
+- storage: STORAGE_BACKEND=local, with photos written to a temporary directory
+
+The database should be a disposable one seeded by scripts/seed_data.py. Reads
+are made as randomly sampled seeded users (so favorites lists are realistic);
+reviews and photo uploads are made by a pool of users created for this run,
+each of which first creates one spot of their own to upload photos to. Every
+upload is a distinct image, so the full variant rendering path is measured.
+
+A fixed number of concurrent clients each send requests back to back, choosing
+the route by the weights in --mix. Requests during --warmup are not recorded.
+Percentiles are over successful responses; other statuses count as errors.
+
+With --baseline, each route's p50/p95/p99 and throughput are compared with a
+JSON report from an earlier run, and the script exits with status 1 if any of
+them is more than --threshold worse.
+
+Usage (from the api directory):
+    MONGODB_URL=mongodb://localhost:27017/hammock_bench python scripts/seed_data.py --drop --spots 100000 --users 10000
+    MONGODB_URL=mongodb://localhost:27017/hammock_bench python scripts/bench_endpoints.py --output baseline.json
+    MONGODB_URL=... python scripts/bench_endpoints.py --concurrency 64 --duration 60 --baseline baseline.json
+    MONGODB_URL=... python scripts/bench_endpoints.py --mix get_spots=1  # One route on its own
+"""
+import argparse
+import asyncio
+import io
+import json
+import os
+import random
+import signal
+import socket
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+
+import httpx
+from PIL import Image
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.dependencies.database import connect_to_mongodb, close_mongodb_connection
+from app.models.hammock_spot import HammockSpot, TreeType, Amenities
+from app.models.user import User
+
+TOKEN_PREFIX = "bench:"
+
+DEFAULT_MIX = "get_spots=40,get_spot=30,get_favorites=15,create_review=10,upload_photo=5"
+
+# Latency percentiles reported per route, and compared against the baseline
+PERCENTILES = (50, 95, 99)
+
+
+# --- Server ---
+
+def _verify_bench_token(token: str, check_revoked: bool = False) -> dict:
+    """Stand-in for verify_firebase_token: "bench:<uid>" is a valid token for uid"""
+    if not token.startswith(TOKEN_PREFIX):
+        raise ValueError("Not a benchmark token")
+    uid = token[len(TOKEN_PREFIX):]
+    return {"uid": uid, "email": f"{uid}@bench.invalid", "exp": time.time() + 24 * 3600}
+
+
+def serve(port: int):
+    """Run the API with the Firebase stand-ins; the environment selects local storage"""
+    import uvicorn
+    import app.dependencies.auth
+    import app.main
+
+    app.dependencies.auth.verify_firebase_token = _verify_bench_token
+    app.main.initialize_firebase = lambda: None
+    uvicorn.run(app.main.app, host="127.0.0.1", port=port, log_level="warning", access_log=False)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+async def start_server(storage_dir: str) -> tuple:
+    """Start the API in a child process and wait until it answers /health"""
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    env = dict(
+        os.environ,
+        STORAGE_BACKEND="local",
+        LOCAL_STORAGE_DIR=storage_dir,
+        LOCAL_STORAGE_URL=f"{base_url}/media",
+    )
+    process = subprocess.Popen([sys.executable, os.path.abspath(__file__), "--serve", str(port)], env=env)
+
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        deadline = time.monotonic() + 60
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                sys.exit(f"API server exited with status {process.returncode}")
+            try:
+                if (await client.get("/health")).status_code == 200:
+                    return process, base_url
+            except httpx.TransportError:
+                pass
+            await asyncio.sleep(0.2)
+    process.kill()
+    sys.exit("API server did not start within 60 seconds")
+
+
+def stop_server(process: subprocess.Popen):
+    """Shut the server down gracefully, so queued jobs finish"""
+    process.send_signal(signal.SIGINT)
+    try:
+        process.wait(timeout=60)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+# --- Requests ---
+
+def make_photo(width: int, height: int) -> bytes:
+    """A noisy JPEG that compresses like a real photo rather than a flat image"""
+    noise = Image.effect_noise((width, height), 64).convert("RGB")
+    gradient = Image.linear_gradient("L").resize((width, height)).convert("RGB")
+    image = Image.blend(noise, gradient, 0.5)
+    out = io.BytesIO()
+    image.save(out, "JPEG", quality=85)
+    return out.getvalue()
+
+
+def unique_photo(photo: bytes, n: int) -> bytes:
+    """The same JPEG with a comment segment after SOI, so its hash and storage path are new"""
+    comment = f"bench {os.getpid()} {time.time_ns()} {n}".encode()
+    return photo[:2] + b"\xff\xfe" + struct.pack(">H", len(comment) + 2) + comment + photo[2:]
+
+
+def _auth(uid: str) -> dict:
+    return {"Authorization": f"Bearer {TOKEN_PREFIX}{uid}"}
+
+
+class Workload:
+    """Sampled targets and the request builders for each benchmarked route"""
+
+    def __init__(self, spots: list, readers: list, writers: list, photo: bytes, radius: float):
+        self.spots = spots  # (spot_id, latitude, longitude)
+        self.readers = readers  # firebase_uid
+        self.writers = writers  # (firebase_uid, own spot_id)
+        self.photo = photo
+        self.radius = radius
+        self.reviews = 0
+        self.uploads = 0
+
+    def get_spots(self, rng: random.Random):
+        _, lat, lng = rng.choice(self.spots)
+        params = {"lat": lat, "lng": lng, "radius": self.radius, "limit": 20}
+        return "GET", "/v1/spots/", {"params": params, "headers": _auth(rng.choice(self.readers))}
+
+    def get_spot(self, rng: random.Random):
+        spot_id, _, _ = rng.choice(self.spots)
+        return "GET", f"/v1/spots/{spot_id}", {}
+
+    def get_favorites(self, rng: random.Random):
+        return "GET", "/v1/users/favorites", {"params": {"limit": 20}, "headers": _auth(rng.choice(self.readers))}
+
+    def create_review(self, rng: random.Random):
+        # Walk (writer, spot) pairs in order so no writer reviews the same spot twice
+        n = self.reviews
+        self.reviews += 1
+        uid, _ = self.writers[n % len(self.writers)]
+        spot_id, _, _ = self.spots[(n // len(self.writers)) % len(self.spots)]
+        data = {
+            "view_rating": rng.randint(1, 5),
+            "comfort_rating": rng.randint(1, 5),
+            "accessibility_rating": rng.randint(1, 5),
+            "privacy_rating": rng.randint(1, 5),
+            "comment": "Benchmark review. Good trees, a little windy in the afternoon.",
+        }
+        return "POST", f"/v1/reviews/{spot_id}", {"data": data, "headers": _auth(uid)}
+
+    def upload_photo(self, rng: random.Random):
+        self.uploads += 1
+        uid, spot_id = rng.choice(self.writers)
+        files = {"file": ("photo.jpg", unique_photo(self.photo, self.uploads), "image/jpeg")}
+        return "POST", f"/v1/spots/{spot_id}/photos", {"files": files, "headers": _auth(uid)}
+
+
+ROUTES = ["get_spots", "get_spot", "get_favorites", "create_review", "upload_photo"]
+
+
+def parse_mix(mix: str) -> dict:
+    weights = {}
+    for part in mix.split(","):
+        name, _, weight = part.partition("=")
+        name = name.strip()
+        if name not in ROUTES:
+            sys.exit(f"Unknown route in --mix: {name!r}, expected one of: {', '.join(ROUTES)}")
+        weights[name] = float(weight or 1)
+    if not any(weight > 0 for weight in weights.values()):
+        sys.exit("--mix needs at least one route with a positive weight")
+    return weights
+
+
+async def sample_targets(spot_count: int, reader_count: int) -> tuple:
+    """Random existing spots and users of the seeded database"""
+    spots = await HammockSpot.get_motor_collection().aggregate([
+        {"$match": {"is_private": False}},
+        {"$sample": {"size": spot_count}},
+        {"$project": {"coordinates": 1}},
+    ]).to_list(None)
+    readers = await User.get_motor_collection().aggregate([
+        {"$sample": {"size": reader_count}},
+        {"$project": {"firebase_uid": 1}},
+    ]).to_list(None)
+    if not spots or not readers:
+        sys.exit("The database has no spots or users, seed it first with scripts/seed_data.py")
+    return (
+        [(str(doc["_id"]), doc["coordinates"]["latitude"], doc["coordinates"]["longitude"]) for doc in spots],
+        [doc["firebase_uid"] for doc in readers],
+    )
+
+
+async def create_writers(client: httpx.AsyncClient, count: int, spots: list) -> list:
+    """Users for this run, each with one spot of their own to upload photos to"""
+    run = datetime.now().strftime("%Y%m%d%H%M%S")
+    amenities = {name: True for name in Amenities.__fields__}
+
+    async def create(i: int):
+        uid = f"bench-{run}-{i}"
+        _, lat, lng = spots[i % len(spots)]
+        response = await client.post("/v1/spots/", headers=_auth(uid), data={
+            "name": f"Benchmark spot {run}-{i}",
+            "latitude": lat + 0.001,
+            "longitude": lng + 0.001,
+            "tree_types": json.dumps([TreeType.PINE.value]),
+            "amenities": json.dumps(amenities),
+        })
+        response.raise_for_status()
+        return uid, response.json()["id"]
+
+    return await asyncio.gather(*(create(i) for i in range(count)))
+
+
+async def run_load(client: httpx.AsyncClient, workload: Workload, weights: dict, args) -> tuple:
+    """Drive the mix from --concurrency clients; returns (latencies, statuses, measured seconds)"""
+    latencies = defaultdict(list)
+    statuses = defaultdict(Counter)
+    names = list(weights)
+    route_weights = [weights[name] for name in names]
+
+    loop_start = time.perf_counter()
+    measure_start = loop_start + args.warmup
+    measure_end = measure_start + args.duration
+
+    async def client_loop(index: int):
+        rng = random.Random(f"{args.seed}:{index}")
+        while True:
+            start = time.perf_counter()
+            if start >= measure_end:
+                return
+            name = rng.choices(names, weights=route_weights)[0]
+            method, url, kwargs = getattr(workload, name)(rng)
+            try:
+                response = await client.request(method, url, **kwargs)
+                status = response.status_code
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+            end = time.perf_counter()
+            if start < measure_start or end > measure_end:
+                continue
+            statuses[name][status] += 1
+            if isinstance(status, int) and status < 400:
+                latencies[name].append(end - start)
+
+    await asyncio.gather(*(client_loop(i) for i in range(args.concurrency)))
+    return latencies, statuses, args.duration
+
+
+# --- Report ---
+
+def percentile(sorted_values: list, p: float) -> float:
+    """Nearest-rank percentile of an ascending list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-len(sorted_values) * p // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def summarize(latencies: list, statuses: Counter, seconds: float) -> dict:
+    values = sorted(latencies)
+    summary = {
+        "requests": sum(statuses.values()),
+        "errors": sum(statuses.values()) - len(values),
+        "throughput": round(len(values) / seconds, 2),
+    }
+    for p in PERCENTILES:
+        summary[f"p{p}_ms"] = round(percentile(values, p) * 1000, 2)
+    summary["mean_ms"] = round(sum(values) / len(values) * 1000, 2) if values else 0.0
+    summary["max_ms"] = round(values[-1] * 1000, 2) if values else 0.0
+    summary["statuses"] = {str(status): count for status, count in sorted(statuses.items(), key=str)}
+    return summary
+
+
+def print_report(routes: dict):
+    header = f"{'route':<15} {'requests':>9} {'errors':>7} {'req/s':>9}"
+    header += "".join(f" {f'p{p} ms':>9}" for p in PERCENTILES) + f" {'max ms':>9}"
+    print(header)
+    for name, summary in routes.items():
+        line = f"{name:<15} {summary['requests']:>9} {summary['errors']:>7} {summary['throughput']:>9.1f}"
+        line += "".join(f" {summary[f'p{p}_ms']:>9.1f}" for p in PERCENTILES) + f" {summary['max_ms']:>9.1f}"
+        print(line)
+
+
+def compare(report: dict, baseline: dict, threshold: float) -> list:
+    """Print the change against the baseline per route; returns the regressions found"""
+    regressions = []
+    for key in ("concurrency", "mix", "radius"):
+        if report["config"].get(key) != baseline.get("config", {}).get(key):
+            print(f"Warning: {key} differs from the baseline, results may not be comparable")
+
+    print(f"\nAgainst baseline (regression: more than {threshold:.0%} worse)")
+    for name, summary in report["routes"].items():
+        base = baseline.get("routes", {}).get(name)
+        if not base:
+            print(f"{name:<15} not in baseline")
+            continue
+        changes = []
+        for metric, worse_if_higher in [(f"p{p}_ms", True) for p in PERCENTILES] + [("throughput", False)]:
+            if not base[metric]:
+                continue
+            ratio = summary[metric] / base[metric]
+            regressed = ratio > 1 + threshold if worse_if_higher else ratio < 1 - threshold
+            changes.append(f"{metric} {ratio - 1:+.0%}{' REGRESSION' if regressed else ''}")
+            if regressed:
+                regressions.append(f"{name} {metric}: {base[metric]} -> {summary[metric]}")
+        print(f"{name:<15} " + ", ".join(changes))
+    return regressions
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--concurrency", type=int, default=32, help="Clients sending requests back to back")
+    parser.add_argument("--duration", type=float, default=30, help="Measured seconds")
+    parser.add_argument("--warmup", type=float, default=5, help="Seconds of load before measuring starts")
+    parser.add_argument("--mix", default=DEFAULT_MIX, help=f"Route weights (default: {DEFAULT_MIX})")
+    parser.add_argument("--radius", type=float, default=5000, help="get_spots search radius in meters")
+    parser.add_argument("--spots", type=int, default=2000, help="Spots sampled as request targets")
+    parser.add_argument("--readers", type=int, default=1000, help="Seeded users sampled for authenticated reads")
+    parser.add_argument("--writers", type=int, default=50, help="Users created for reviews and photo uploads")
+    parser.add_argument("--photo-size", default="1600x1200", help="Uploaded photo dimensions, WIDTHxHEIGHT")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the clients' route and target choices")
+    parser.add_argument("--output", help="Write the report as JSON to this file")
+    parser.add_argument("--baseline", help="JSON report of an earlier run to compare with")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed fraction worse than the baseline")
+    parser.add_argument("--serve", type=int, metavar="PORT", help=argparse.SUPPRESS)
+    return parser.parse_args()
+
+
+async def main(args):
+    weights = parse_mix(args.mix)
+    width, height = (int(v) for v in args.photo_size.lower().split("x"))
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    await connect_to_mongodb()
+    try:
+        spots, readers = await sample_targets(args.spots, args.readers)
+    finally:
+        await close_mongodb_connection()
+
+    started_at = datetime.now()
+    with tempfile.TemporaryDirectory(prefix="bench-storage-") as storage_dir:
+        process, base_url = await start_server(storage_dir)
+        try:
+            limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+            async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+                writers = await create_writers(client, args.writers, spots)
+                workload = Workload(spots, readers, writers, make_photo(width, height), args.radius)
+
+                print(
+                    f"Running {args.concurrency} clients for {args.warmup:g}s warmup + {args.duration:g}s "
+                    f"against {len(spots)} spots and {len(readers)} users"
+                )
+                latencies, statuses, seconds = await run_load(client, workload, weights, args)
+                server_metrics = (await client.get("/metrics")).json()
+        finally:
+            stop_server(process)
+
+    all_statuses = sum(statuses.values(), Counter())
+    all_latencies = [latency for values in latencies.values() for latency in values]
+    report = {
+        "started_at": started_at.isoformat(),
+        "config": {
+            "concurrency": args.concurrency,
+            "duration": args.duration,
+            "warmup": args.warmup,
+            "mix": weights,
+            "radius": args.radius,
+            "photo_size": args.photo_size,
+            "spots": len(spots),
+            "readers": len(readers),
+            "writers": len(writers),
+        },
+        "routes": {name: summarize(latencies[name], statuses[name], seconds) for name in weights if statuses[name]},
+        "total": summarize(all_latencies, all_statuses, seconds),
+        "server_metrics": server_metrics,
+    }
+
+    print_report({**report["routes"], "total": report["total"]})
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Wrote {args.output}")
+
+    if baseline is not None:
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\n{len(regressions)} regression(s):")
+            for regression in regressions:
+                print(f"  {regression}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    if args.serve:
+        # The child process started by start_server; uvicorn runs its own event loop
+        serve(args.serve)
+    else:
+        asyncio.run(main(args))
@@ -0,0 +1,117 @@
+# scripts/bench_serialization.py
+"""
+Micro-benchmark of the cost of serializing one 100-spot page of GET /v1/spots.
+
+  before: HammockSpot.parse_obj(doc).to_response_model() per spot, then
+          FastAPI's jsonable_encoder and stdlib json (JSONResponse)
+  after:  HammockSpot.response_from_doc(doc) per spot, then one orjson call
+
+Before timing, the decoded output of both paths is compared and the script
+exits with an error if they differ.
+
+The documents are synthetic and built in memory; MongoDB is only needed because
+Beanie documents cannot be constructed before init_beanie.
+
+Usage (from the api directory):
+    MONGODB_URL=mongodb://localhost:27017/hammock_spots python scripts/bench_serialization.py [--page-size 100] [--rounds 200]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import timeit
+from datetime import datetime, timedelta
+from bson.objectid import ObjectId
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.dependencies.database import connect_to_mongodb, close_mongodb_connection
+from app.models.hammock_spot import HammockSpot, TreeType, Amenities
+from app.utils.responses import dump_json
+
+
+def make_spot_docs(count: int, seed: int = 0) -> list:
+    """Raw spot documents shaped like the ones stored by create_spot"""
+    rng = random.Random(seed)
+    tree_types = [t.value for t in TreeType]
+    amenity_names = list(Amenities.__fields__.keys())
+    docs = []
+    for i in range(count):
+        lat, lng = rng.uniform(-60, 60), rng.uniform(-180, 180)
+        created_at = datetime(2023, 1, 1) + timedelta(seconds=rng.randrange(50_000_000))
+        docs.append({
+            "_id": ObjectId(),
+            "name": f"Spot {i}",
+            "description": "Two sturdy pines about four meters apart with a view over the lake. " * 3,
+            "coordinates": {"latitude": lat, "longitude": lng},
+            "location": {"type": "Point", "coordinates": [lng, lat]},
+            "tree_types": rng.sample(tree_types, rng.randint(1, 3)),
+            "distance_between_trees": round(rng.uniform(2, 6), 1),
+            "amenities": {name: rng.random() < 0.5 for name in amenity_names},
+            "photos": [
+                f"https://storage.googleapis.com/sway-app.appspot.com/spot_photos/{i}/{n}.jpg"
+                for n in range(rng.randint(0, 6))
+            ],
+            "creator_id": str(ObjectId()),
+            "is_private": False,
+            "is_verified": rng.random() < 0.2,
+            "avg_rating": round(rng.uniform(0, 5), 2),
+            "review_count": rng.randint(0, 200),
+            "rating_totals": {"view": 0, "comfort": 0, "accessibility": 0, "privacy": 0, "overall": 0},
+            "created_at": created_at,
+            "updated_at": created_at + timedelta(days=3)
+        })
+    return docs
+
+
+def serialize_before(docs: list) -> bytes:
+    items = [HammockSpot.parse_obj(doc).to_response_model() for doc in docs]
+    return JSONResponse(content=jsonable_encoder(items)).body
+
+
+def serialize_after(docs: list) -> bytes:
+    items = [HammockSpot.response_from_doc(doc) for doc in docs]
+    return dump_json(items)
+
+
+def check_identical(docs: list):
+    """Exit with the first difference if the two paths do not produce the same JSON"""
+    before = json.loads(serialize_before(docs))
+    after = json.loads(serialize_after(docs))
+    if before == after:
+        return
+    for i, (old, new) in enumerate(zip(before, after)):
+        for key in sorted(set(old) | set(new)):
+            if old.get(key) != new.get(key):
+                sys.exit(f"Output differs at [{i}].{key}: {old.get(key)!r} != {new.get(key)!r}")
+    sys.exit(f"Output differs in length: {len(before)} != {len(after)}")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--page-size", type=int, default=100)
+    parser.add_argument("--rounds", type=int, default=200)
+    args = parser.parse_args()
+
+    await connect_to_mongodb()
+    try:
+        docs = make_spot_docs(args.page_size)
+        check_identical(docs)
+        print(f"identical JSON for {args.page_size} spots")
+        results = {}
+        for name, fn in (("before", serialize_before), ("after", serialize_after)):
+            fn(docs)  # warm up
+            best = min(timeit.repeat(lambda: fn(docs), number=args.rounds, repeat=5)) / args.rounds
+            results[name] = best
+            print(f"{name:>6}: {best * 1000:8.3f} ms per {args.page_size}-spot page, {len(fn(docs))} bytes")
+        print(f"speedup: {results['before'] / results['after']:.1f}x")
+    finally:
+        await close_mongodb_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
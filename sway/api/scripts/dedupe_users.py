@@ -0,0 +1,58 @@
+# scripts/dedupe_users.py
+"""
+Merge duplicate user documents that share a firebase_uid.
+
+Concurrent first requests used to insert the same Firebase user twice. The
+unique firebase_uid index cannot be built while such duplicates exist, so run
+this once before deploying it. The oldest document is kept, favorites and
+created spots are merged into it, and spots/reviews are re-pointed at it.
+
+Usage (from the api directory):
+    MONGODB_URL=mongodb://localhost:27017/hammock_spots python scripts/dedupe_users.py
+"""
+import asyncio
+import os
+from motor.motor_asyncio import AsyncIOMotorClient
+
+
+async def dedupe_users(db) -> int:
+    """Merge every group of users with the same firebase_uid into its oldest member"""
+    merged = 0
+    groups = db.users.aggregate([
+        {"$sort": {"_id": 1}},
+        {"$group": {"_id": "$firebase_uid", "ids": {"$push": "$_id"}, "count": {"$sum": 1}}},
+        {"$match": {"count": {"$gt": 1}}}
+    ], allowDiskUse=True)
+
+    async for group in groups:
+        keeper_id, duplicate_ids = group["ids"][0], group["ids"][1:]
+        duplicates = await db.users.find({"_id": {"$in": duplicate_ids}}).to_list(length=None)
+
+        favorites = [spot_id for dup in duplicates for spot_id in dup.get("favorite_spots", [])]
+        created = [spot_id for dup in duplicates for spot_id in dup.get("created_spots", [])]
+        await db.users.update_one({"_id": keeper_id}, {"$addToSet": {
+            "favorite_spots": {"$each": favorites},
+            "created_spots": {"$each": created}
+        }})
+
+        old_ids = [str(dup_id) for dup_id in duplicate_ids]
+        await db.HammockSpot.update_many({"creator_id": {"$in": old_ids}}, {"$set": {"creator_id": str(keeper_id)}})
+        await db.reviews.update_many({"user_id": {"$in": old_ids}}, {"$set": {"user_id": str(keeper_id)}})
+        await db.users.delete_many({"_id": {"$in": duplicate_ids}})
+        merged += len(duplicate_ids)
+
+    return merged
+
+
+async def main():
+    mongodb_url = os.getenv("MONGODB_URL", "mongodb://mongo:27017/hammock_spots")
+    client = AsyncIOMotorClient(mongodb_url)
+    try:
+        merged = await dedupe_users(client.get_default_database())
+        print(f"Merged {merged} duplicate users.")
+    finally:
+        client.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
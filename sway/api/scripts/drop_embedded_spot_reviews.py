@@ -0,0 +1,65 @@
+# scripts/drop_embedded_spot_reviews.py
+"""
+Migrate spots off the embedded `reviews` link list.
+
+Reviews are now looked up by spot_id in the reviews collection. This script:
+  1. removes the `reviews` array from every spot document,
+  2. deletes duplicate reviews (same spot_id and user_id, keeping the oldest) so
+     the unique (spot_id, user_id) index can be built,
+  3. builds the review indexes and rebuilds the per-spot rating aggregates.
+
+It is safe to re-run.
+
+Usage (from the api directory):
+    MONGODB_URL=mongodb://localhost:27017/hammock_spots python scripts/drop_embedded_spot_reviews.py
+"""
+import asyncio
+import os
+import sys
+from motor.motor_asyncio import AsyncIOMotorClient
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.dependencies.database import connect_to_mongodb, close_mongodb_connection
+from app.utils.helpers.ratings import rebuild_rating_aggregates
+
+
+async def drop_embedded_reviews(db) -> int:
+    """Unset the reviews array on every spot"""
+    result = await db.HammockSpot.update_many({"reviews": {"$exists": True}}, {"$unset": {"reviews": ""}})
+    return result.modified_count
+
+
+async def delete_duplicate_reviews(db) -> int:
+    """Keep only the oldest review per (spot_id, user_id)"""
+    deleted = 0
+    groups = db.reviews.aggregate([
+        {"$sort": {"_id": 1}},
+        {"$group": {"_id": {"spot_id": "$spot_id", "user_id": "$user_id"}, "ids": {"$push": "$_id"}}},
+        {"$match": {"ids.1": {"$exists": True}}}
+    ], allowDiskUse=True)
+    async for group in groups:
+        result = await db.reviews.delete_many({"_id": {"$in": group["ids"][1:]}})
+        deleted += result.deleted_count
+    return deleted
+
+
+async def main():
+    # Clean up with a plain client first: init_beanie would fail building the unique index
+    client = AsyncIOMotorClient(os.getenv("MONGODB_URL", "mongodb://mongo:27017/hammock_spots"))
+    try:
+        db = client.get_default_database()
+        print(f"Removed embedded reviews from {await drop_embedded_reviews(db)} spots.")
+        print(f"Deleted {await delete_duplicate_reviews(db)} duplicate reviews.")
+    finally:
+        client.close()
+
+    await connect_to_mongodb()
+    try:
+        print(f"Rebuilt rating aggregates on {await rebuild_rating_aggregates()} spots.")
+    finally:
+        await close_mongodb_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
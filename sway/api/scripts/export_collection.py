@@ -0,0 +1,56 @@
+# scripts/export_collection.py
+"""
+Export the spots or reviews collection to a newline-delimited JSON file.
+
+Documents are streamed in _id order with a constant memory footprint. With
+--resume an existing output file is truncated to its last complete line (or
+gzip member) and the export continues after the last _id it contains.
+
+Usage (from the api directory):
+    MONGODB_URL=mongodb://localhost:27017/hammock_spots python scripts/export_collection.py spots spots.ndjson
+    MONGODB_URL=... python scripts/export_collection.py reviews reviews.ndjson.gz --gzip --resume
+"""
+import argparse
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import EXPORT_BATCH_SIZE
+from app.dependencies.database import connect_to_mongodb, close_mongodb_connection
+from app.utils.helpers.export import EXPORT_COLLECTIONS, iter_export_chunks, find_resume_point
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Export a collection as NDJSON")
+    parser.add_argument("collection", choices=list(EXPORT_COLLECTIONS))
+    parser.add_argument("output", help="Output file path")
+    parser.add_argument("--gzip", action="store_true", help="Gzip-compress the output")
+    parser.add_argument("--resume", action="store_true", help="Continue an interrupted export into the same file")
+    parser.add_argument("--batch-size", type=int, default=EXPORT_BATCH_SIZE)
+    args = parser.parse_args()
+
+    after = None
+    mode = "wb"
+    if args.resume and os.path.exists(args.output):
+        valid_length, after = find_resume_point(args.output, args.gzip)
+        with open(args.output, "r+b") as f:
+            f.truncate(valid_length)
+        mode = "ab"
+        print(f"Resuming after _id {after} ({valid_length} bytes kept).")
+
+    await connect_to_mongodb()
+    try:
+        written = 0
+        with open(args.output, mode) as f:
+            async for chunk in iter_export_chunks(args.collection, after, args.batch_size, compress=args.gzip):
+                f.write(chunk)
+                written += len(chunk)
+        print(f"Wrote {written} bytes of {args.collection} to {args.output}.")
+    finally:
+        await close_mongodb_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,84 @@
+# scripts/import_spots.py
+"""
+Bulk import spots from a GeoJSON FeatureCollection or CSV file.
+
+Same import as POST /v1/admin/spots/import (see app/utils/helpers/spot_import.py
+for the accepted columns), run directly against the database. The spots are
+created by the user with the given Firebase UID.
+
+Usage (from the api directory):
+    MONGODB_URL=mongodb://localhost:27017/hammock_spots python scripts/import_spots.py parks.geojson --creator-uid <uid>
+    MONGODB_URL=... python scripts/import_spots.py parks.csv --creator-uid <uid> --duplicate-radius 10 --report errors.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import SPOT_IMPORT_BATCH_SIZE, SPOT_IMPORT_DUPLICATE_RADIUS, UPLOAD_CHUNK_SIZE
+from app.dependencies.database import connect_to_mongodb, close_mongodb_connection
+from app.jobs import start_job_workers, stop_job_workers
+from app.models.user import User
+from app.utils.firebase import shutdown_firebase_executor
+from app.utils.helpers.spot_import import import_spots
+
+
+async def read_chunks(path: str):
+    with open(path, "rb") as f:
+        while True:
+            chunk = f.read(UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                break
+            yield chunk
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Bulk import spots from GeoJSON or CSV")
+    parser.add_argument("path", help="GeoJSON FeatureCollection or CSV file")
+    parser.add_argument("--creator-uid", required=True, help="Firebase UID of the user the spots are created by")
+    parser.add_argument("--format", choices=["geojson", "csv"], help="Defaults to the file extension")
+    parser.add_argument("--batch-size", type=int, default=SPOT_IMPORT_BATCH_SIZE)
+    parser.add_argument(
+        "--duplicate-radius", type=float, default=SPOT_IMPORT_DUPLICATE_RADIUS,
+        help="Skip rows this close (meters) to an existing spot or an earlier row; 0 imports all"
+    )
+    parser.add_argument("--report", help="Also write the full report as JSON to this file")
+    args = parser.parse_args()
+
+    format = args.format or ("csv" if args.path.lower().endswith(".csv") else "geojson")
+
+    await connect_to_mongodb()
+    try:
+        creator = await User.find_one(User.firebase_uid == args.creator_uid)
+        if creator is None:
+            sys.exit(f"No user with firebase_uid {args.creator_uid}")
+
+        # Runs the per-batch created_spots and cluster updates, and waits for them before exiting
+        await start_job_workers()
+        report = await import_spots(
+            read_chunks(args.path), format, creator,
+            batch_size=args.batch_size, duplicate_radius=args.duplicate_radius
+        )
+        await stop_job_workers()
+
+        for error in report.errors[:20]:
+            print(f"Row {error['row']}: {error['error']}")
+        if report.aborted:
+            print(f"Stopped reading {args.path}: {report.aborted}")
+        print(
+            f"Imported {report.inserted} of {report.rows} rows: "
+            f"{report.duplicates} duplicates skipped, {report.failed} failed."
+        )
+        if args.report:
+            with open(args.report, "w") as f:
+                json.dump(report.dict(), f, indent=2)
+    finally:
+        shutdown_firebase_executor()
+        await close_mongodb_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
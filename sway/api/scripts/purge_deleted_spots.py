@@ -0,0 +1,63 @@
+# scripts/purge_deleted_spots.py
+"""
+Finish the cleanup of deleted spots whose background purge did not complete.
+
+Deleting a spot queues a job that removes its reviews, their photos, the spot's
+photos and the spot ID from users' lists. A purge that ran out of retries, or
+was queued in memory by a process that stopped, stays unfinished on the spot's
+tombstone. This runs those purges again; a purge is safe to repeat.
+
+Usage (from the api directory):
+    MONGODB_URL=mongodb://localhost:27017/hammock_spots python scripts/purge_deleted_spots.py
+    MONGODB_URL=... python scripts/purge_deleted_spots.py --spot-id 60d21b4667d0d8992e610c85
+"""
+import argparse
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.dependencies.database import connect_to_mongodb, close_mongodb_connection
+from app.models.spot_tombstone import SpotTombstone
+from app.utils.firebase import shutdown_firebase_executor
+from app.utils.helpers.spot_purge import purge_spot
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Re-run unfinished purges of deleted spots")
+    parser.add_argument("--spot-id", help="Purge only this spot")
+    parser.add_argument(
+        "--min-age-minutes", type=float, default=30,
+        help="Skip spots deleted more recently, whose purge job may still be running"
+    )
+    args = parser.parse_args()
+
+    await connect_to_mongodb()
+    try:
+        if args.spot_id:
+            query = {"spot_id": args.spot_id}
+        else:
+            query = {
+                "purge.status": {"$in": ["pending", "running"]},
+                "deleted_at": {"$lt": datetime.now() - timedelta(minutes=args.min_age_minutes)}
+            }
+
+        purged = 0
+        async for tombstone in SpotTombstone.get_motor_collection().find(query, {"spot_id": 1}):
+            progress = await purge_spot(tombstone["spot_id"])
+            if progress is not None:
+                purged += 1
+                print(
+                    f"Purged spot {tombstone['spot_id']}: {progress['reviews_deleted']} reviews, "
+                    f"{progress['photos_deleted']} photos, {progress['favorites_removed']} favorites."
+                )
+        print(f"Purged {purged} deleted spots.")
+    finally:
+        shutdown_firebase_executor()
+        await close_mongodb_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
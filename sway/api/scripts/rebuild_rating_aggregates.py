@@ -0,0 +1,33 @@
+# scripts/rebuild_rating_aggregates.py
+"""
+Rebuild review_count, rating_totals and avg_rating on every spot from the
+reviews collection.
+
+Review writes keep these aggregates up to date incrementally. Run this once
+after deploying them, and again whenever aggregates need repair (for example
+after reviews were edited directly in the database).
+
+Usage (from the api directory):
+    MONGODB_URL=mongodb://localhost:27017/hammock_spots python scripts/rebuild_rating_aggregates.py
+"""
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.dependencies.database import connect_to_mongodb, close_mongodb_connection
+from app.utils.helpers.ratings import rebuild_rating_aggregates
+
+
+async def main():
+    await connect_to_mongodb()
+    try:
+        updated = await rebuild_rating_aggregates()
+        print(f"Rebuilt rating aggregates on {updated} spots.")
+    finally:
+        await close_mongodb_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,31 @@
+# scripts/rebuild_spot_clusters.py
+"""
+Rebuild the precomputed map clusters (spot_clusters) from the spots collection.
+
+The API keeps clusters up to date incrementally. Run this after bulk changes
+made outside the API, or to repair drift.
+
+Usage (from the api directory):
+    MONGODB_URL=mongodb://localhost:27017/hammock_spots python scripts/rebuild_spot_clusters.py
+"""
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.dependencies.database import connect_to_mongodb, close_mongodb_connection
+from app.utils.helpers.clustering import rebuild_clusters
+
+
+async def main():
+    await connect_to_mongodb()
+    try:
+        cells = await rebuild_clusters()
+        print(f"Rebuilt {cells} cluster cells.")
+    finally:
+        await close_mongodb_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,52 @@
+# scripts/run_job_worker.py
+"""
+Run background jobs from the durable job queue outside the API processes.
+
+Only meaningful with JOB_QUEUE_MODE=mongo. Start API processes with
+JOB_WORKER_CONCURRENCY=0 to leave all jobs to dedicated workers, or run both.
+Stops on SIGINT/SIGTERM after giving running jobs JOB_SHUTDOWN_TIMEOUT to finish.
+
+Usage (from the api directory):
+    JOB_QUEUE_MODE=mongo MONGODB_URL=mongodb://localhost:27017/hammock_spots python scripts/run_job_worker.py
+    JOB_QUEUE_MODE=mongo MONGODB_URL=... python scripts/run_job_worker.py --concurrency 16
+"""
+import argparse
+import asyncio
+import os
+import signal
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.config import JOB_QUEUE_MODE, JOB_WORKER_CONCURRENCY
+from app.dependencies.database import connect_to_mongodb, close_mongodb_connection
+from app.jobs import start_job_workers, stop_job_workers
+from app.utils.firebase import shutdown_firebase_executor
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Run background jobs from the jobs collection")
+    parser.add_argument("--concurrency", type=int, default=max(JOB_WORKER_CONCURRENCY, 1))
+    args = parser.parse_args()
+
+    if JOB_QUEUE_MODE != "mongo":
+        sys.exit("JOB_QUEUE_MODE must be 'mongo' for a separate worker process")
+
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    await connect_to_mongodb()
+    try:
+        await start_job_workers(args.concurrency)
+        print(f"Running background jobs with {args.concurrency} workers.")
+        await stop.wait()
+        await stop_job_workers()
+    finally:
+        shutdown_firebase_executor()
+        await close_mongodb_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,435 @@
+# scripts/seed_data.py
+"""
+Generate a large, realistic synthetic dataset for local performance work.
+
+Everything is derived from --seed, so the same arguments always produce the
+same documents, _ids included:
+
+- spots clustered around real-world hammock destinations (parks, coasts,
+  cities), denser at the center and thinning out with distance
+- a power-law popularity per spot: most spots have no or a few reviews, a few
+  have thousands, and popular spots are also the ones users favorite most
+- users, a minority of whom create most spots, with favorite lists of up to
+  --max-favorites spots and profile photos
+- photo URL arrays (with WebP variants) on spots, reviews and profiles. URLs
+  point at the configured storage backend, but no files are written; use
+  STORAGE_BACKEND=local to seed without Firebase credentials
+
+review_count, rating_totals and avg_rating are written consistent with the
+generated reviews, and the map clusters are rebuilt at the end.
+
+Data is generated in fixed-size chunks, each with its own random generator, by a
+pool of processes that bulk insert with unordered insert_many. Collections are
+loaded without secondary indexes, which are built once at the end.
+
+Usage (from the api directory):
+    STORAGE_BACKEND=local MONGODB_URL=mongodb://localhost:27017/hammock_spots python scripts/seed_data.py --drop
+    MONGODB_URL=... python scripts/seed_data.py --drop --spots 5000000 --users 500000 --workers 8
+    MONGODB_URL=... python scripts/seed_data.py --drop --spots 20000 --users 2000  # Quick dataset
+"""
+import argparse
+import asyncio
+import hashlib
+import math
+import os
+import random
+import sys
+import time
+from array import array
+from bisect import bisect_right
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from itertools import accumulate
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from beanie import init_beanie
+from bson.objectid import ObjectId
+from pymongo import MongoClient
+from app.dependencies import database
+from app.utils.storage.photos import photo_variant_path
+from app.dependencies.database import connect_to_mongodb, close_mongodb_connection
+from app.models import HammockSpot, User, Review, SpotCluster, SpotTombstone, Job, PhotoClaim, TreeType
+from app.utils.helpers.clustering import rebuild_clusters
+from app.utils.helpers.images import PHOTO_VARIANT_SIZES
+from app.utils.storage import get_storage
+
+# Changing these changes the generated data for a given seed
+SPOT_CHUNK = 10000
+USER_CHUNK = 10000
+START = datetime(2022, 1, 1)
+SPAN_DAYS = 3 * 365
+
+# _id kinds, so documents of different collections never share an _id
+_SPOT, _USER, _REVIEW = 1, 2, 3
+
+# (name, latitude, longitude, spread in km); listed roughly by popularity
+HOTSPOTS = [
+    ("Barcelona", 41.39, 2.17, 15),
+    ("Yosemite", 37.75, -119.59, 30),
+    ("Tulum", 20.21, -87.47, 10),
+    ("Lisbon", 38.72, -9.14, 20),
+    ("Asheville", 35.60, -82.55, 35),
+    ("Bali", -8.51, 115.26, 40),
+    ("Mallorca", 39.62, 2.98, 30),
+    ("Austin", 30.27, -97.74, 25),
+    ("Athens", 37.98, 23.73, 20),
+    ("Chiang Mai", 18.79, 98.98, 25),
+    ("Boulder", 40.01, -105.27, 20),
+    ("Crete", 35.24, 24.81, 60),
+    ("Cape Town", -33.92, 18.42, 25),
+    ("Portland", 45.52, -122.68, 20),
+    ("Marseille", 43.30, 5.37, 20),
+    ("Sydney", -33.87, 151.21, 30),
+    ("Tel Aviv", 32.09, 34.78, 15),
+    ("Rio de Janeiro", -22.91, -43.17, 25),
+    ("Antalya", 36.90, 30.70, 30),
+    ("Central Park", 40.78, -73.97, 3),
+    ("Split", 43.51, 16.44, 20),
+    ("Nice", 43.70, 7.27, 15),
+    ("Great Smoky Mountains", 35.61, -83.49, 40),
+    ("Algarve", 37.09, -8.25, 40),
+    ("Rome", 41.90, 12.50, 20),
+    ("Costa Rica", 9.75, -83.75, 80),
+    ("Queenstown", -45.03, 168.66, 25),
+    ("Vancouver", 49.28, -123.12, 25),
+    ("Kyoto", 35.01, 135.77, 15),
+    ("Patagonia", -41.13, -71.31, 60),
+]
+_HOTSPOT_WEIGHTS = list(accumulate(1 / (rank + 1) ** 0.8 for rank in range(len(HOTSPOTS))))
+
+_NAME_WORDS = (
+    ["Quiet", "Shady", "Breezy", "Hidden", "Sunny", "Mossy", "Windy", "Lazy", "Golden", "Secret"],
+    ["Pines", "Grove", "Cove", "Ridge", "Creek", "Bluff", "Meadow", "Point", "Hollow", "Terrace"],
+)
+_COMMENTS = [
+    "Perfect trees, a bit crowded on weekends.",
+    "Great view and plenty of shade.",
+    "Hard to find but worth the walk.",
+    "Bring bug spray in the evening.",
+    "Trees are a little too far apart for a short hammock.",
+    "Lovely spot for an afternoon nap.",
+]
+_TREE_TYPES = [tree_type.value for tree_type in TreeType]
+_AMENITIES = ["restrooms", "water_source", "shade", "parking", "food_nearby", "swimming"]
+
+# Per-process state of pool workers, set by _init_worker
+_worker = {}
+
+
+def _object_id(kind: int, index: int, created_at: datetime) -> ObjectId:
+    """Deterministic ObjectId: creation time, then kind and index instead of random bytes"""
+    seconds = int((created_at - datetime(1970, 1, 1)).total_seconds())
+    return ObjectId(seconds.to_bytes(4, "big") + bytes([kind]) + index.to_bytes(7, "big"))
+
+
+def _spot_created_at(index: int, spots: int) -> datetime:
+    return START + timedelta(days=SPAN_DAYS * index / max(spots, 1))
+
+
+def _spot_id(index: int, spots: int) -> str:
+    return str(_object_id(_SPOT, index, _spot_created_at(index, spots)))
+
+
+def _user_id(index: int) -> str:
+    return str(_object_id(_USER, index, START))
+
+
+def _photos(key: str, count: int):
+    """Photo URLs and variant documents, named like content-addressed uploads"""
+    storage = get_storage()
+    photos, variants = [], []
+    for n in range(count):
+        path = f"photos/{hashlib.sha256(f'{key}:{n}'.encode()).hexdigest()}.jpg"
+        photos.append(storage.public_url(path))
+        variants.append({
+            "original": photos[-1],
+            **{name: storage.public_url(photo_variant_path(path, name)) for name in PHOTO_VARIANT_SIZES}
+        })
+    return photos, variants
+
+
+def _init_worker(mongodb_url: str, options: dict, creator_offsets: array, popularity: array = None):
+    client = MongoClient(mongodb_url)
+    db = client.get_default_database()
+    _worker.update(
+        options=options,
+        creator_offsets=creator_offsets,
+        popularity=popularity,
+        spots=db[options["spot_collection"]],
+        reviews=db[options["review_collection"]],
+        users=db[options["user_collection"]],
+    )
+
+
+def _insert(collection, docs: list):
+    if docs:
+        collection.insert_many(docs, ordered=False)
+        docs.clear()
+
+
+def seed_spot_chunk(chunk: int):
+    """
+    Generate and insert the spots of one chunk with their reviews
+
+    Returns:
+        tuple: (chunk, popularity weight per spot, reviews inserted)
+    """
+    options = _worker["options"]
+    n_spots, n_users, batch_size = options["spots"], options["users"], options["batch_size"]
+    rng = random.Random(f"{options['seed']}:spots:{chunk}")
+    spots, reviews = [], []
+    weights = array("d")
+    review_total = 0
+
+    for index in range(chunk * SPOT_CHUNK, min((chunk + 1) * SPOT_CHUNK, n_spots)):
+        created_at = _spot_created_at(index, n_spots)
+        spot_id = _spot_id(index, n_spots)
+
+        # Location: a hotspot, with a tenth of the spots scattered further out
+        name, center_lat, center_lng, spread = HOTSPOTS[bisect_right(
+            _HOTSPOT_WEIGHTS, rng.random() * _HOTSPOT_WEIGHTS[-1]
+        )]
+        spread *= 4 if rng.random() < 0.1 else 1
+        lat = max(-85.0, min(85.0, center_lat + rng.gauss(0, spread) / 111.32))
+        lng = center_lng + rng.gauss(0, spread) / (111.32 * math.cos(math.radians(lat)))
+        lng = (lng + 180) % 360 - 180
+
+        # Popularity drives both review count and how often the spot is favorited
+        popularity = rng.paretovariate(options["review_alpha"])
+        weights.append(popularity)
+        review_count = min(int(popularity) - 1, options["max_reviews"], n_users)
+
+        quality = rng.uniform(2.5, 4.8)
+        totals = dict.fromkeys(["view", "comfort", "accessibility", "privacy", "overall"], 0.0)
+        updated_at = created_at
+        rating_versions = {}
+        remaining_seconds = (START + timedelta(days=SPAN_DAYS) - created_at).total_seconds() + 60
+        for n, user in enumerate(rng.sample(range(n_users), review_count)):
+            rating = {
+                dimension: float(max(1, min(5, round(rng.gauss(quality, 0.8)))))
+                for dimension in ("view", "comfort", "accessibility", "privacy")
+            }
+            rating["overall"] = sum(rating.values()) / 4
+            for dimension, value in rating.items():
+                totals[dimension] += value
+            reviewed_at = created_at + timedelta(seconds=rng.uniform(60, remaining_seconds))
+            updated_at = max(updated_at, reviewed_at)
+            photos, variants = _photos(
+                f"{options['seed']}:review:{index}:{n}", rng.choice((0, 0, 0, 0, 0, 0, 0, 1, 2, 3))
+            )
+            review_id = _object_id(_REVIEW, (index << 20) | n, reviewed_at)
+            rating_versions[str(review_id)] = 0
+            reviews.append({
+                "_id": review_id,
+                "spot_id": spot_id,
+                "user_id": _user_id(user),
+                "username": f"user{user}",
+                "rating": rating,
+                "comment": rng.choice(_COMMENTS) if rng.random() < 0.6 else None,
+                "photos": photos,
+                "photo_variants": variants,
+                "rating_version": 0,
+                "created_at": reviewed_at,
+                "updated_at": reviewed_at
+            })
+        review_total += review_count
+
+        photos, variants = _photos(f"{options['seed']}:spot:{index}", rng.choice((0, 1, 1, 2, 2, 3, 4, 6)))
+        spots.append({
+            "_id": ObjectId(spot_id),
+            "name": f"{rng.choice(_NAME_WORDS[0])} {rng.choice(_NAME_WORDS[1])} near {name}",
+            "description": rng.choice(_COMMENTS) if rng.random() < 0.5 else None,
+            "coordinates": {"latitude": lat, "longitude": lng},
+            "location": {"type": "Point", "coordinates": [lng, lat]},
+            "tree_types": sorted(set(rng.choices(_TREE_TYPES, k=rng.randint(1, 2)))),
+            "distance_between_trees": round(rng.uniform(2.5, 6), 1) if rng.random() < 0.7 else None,
+            "amenities": {amenity: rng.random() < 0.35 for amenity in _AMENITIES},
+            "photos": photos,
+            "photo_variants": variants,
+            "creator_id": _user_id(bisect_right(_worker["creator_offsets"], index) - 1),
+            "is_private": rng.random() < 0.05,
+            "is_verified": rng.random() < 0.1,
+            "avg_rating": totals["overall"] / review_count if review_count else 0,
+            "review_count": review_count,
+            "rating_totals": totals,
+            "rating_versions": rating_versions,
+            "created_at": created_at,
+            "updated_at": updated_at
+        })
+
+        if len(spots) >= batch_size:
+            _insert(_worker["spots"], spots)
+        if len(reviews) >= batch_size:
+            _insert(_worker["reviews"], reviews)
+
+    _insert(_worker["spots"], spots)
+    _insert(_worker["reviews"], reviews)
+    return chunk, weights, review_total
+
+
+def seed_user_chunk(chunk: int):
+    """
+    Generate and insert the users of one chunk
+
+    Returns:
+        tuple: (chunk, favorites inserted)
+    """
+    options = _worker["options"]
+    n_spots, n_users = options["spots"], options["users"]
+    offsets, popularity = _worker["creator_offsets"], _worker["popularity"]
+    rng = random.Random(f"{options['seed']}:users:{chunk}")
+    users = []
+    favorite_total = 0
+
+    for index in range(chunk * USER_CHUNK, min((chunk + 1) * USER_CHUNK, n_users)):
+        favorite_count = min(
+            int(rng.paretovariate(options["favorite_alpha"])) - 1, options["max_favorites"], n_spots
+        )
+        favorites = list(dict.fromkeys(
+            rng.choices(range(n_spots), cum_weights=popularity, k=favorite_count)
+        )) if favorite_count > 0 else []
+        favorite_total += len(favorites)
+
+        photos, variants = _photos(f"{options['seed']}:user:{index}", 1 if rng.random() < 0.6 else 0)
+        users.append({
+            "_id": ObjectId(_user_id(index)),
+            "firebase_uid": f"seed-user-{index}",
+            "username": f"user{index}",
+            "email": f"user{index}@example.com",
+            "profile_photo": photos[0] if photos else None,
+            "profile_photo_variants": variants[0] if variants else None,
+            "bio": rng.choice(_COMMENTS) if rng.random() < 0.3 else None,
+            "favorite_spots": [_spot_id(spot, n_spots) for spot in favorites],
+            "created_spots": [_spot_id(spot, n_spots) for spot in range(offsets[index], offsets[index + 1])],
+            "is_premium": rng.random() < 0.05,
+            "created_at": START,
+            "updated_at": START
+        })
+        if len(users) >= options["batch_size"]:
+            _insert(_worker["users"], users)
+
+    _insert(_worker["users"], users)
+    return chunk, favorite_total
+
+
+def creator_offsets(seed: int, n_users: int, n_spots: int, creator_share: float) -> array:
+    """
+    Spot index ranges per creator: user u created spots offsets[u] to offsets[u + 1] - 1.
+    A minority of users create spots, with power-law counts.
+    """
+    rng = random.Random(f"{seed}:creators")
+    weights = [rng.paretovariate(1.8) if rng.random() < creator_share else 0 for _ in range(n_users)]
+    total = sum(weights) or 1
+    offsets = array("Q", [0])
+    running = 0.0
+    for weight in weights:
+        running += weight
+        offsets.append(min(n_spots, round(n_spots * running / total)))
+    offsets[-1] = n_spots
+    return offsets
+
+
+def _report(label: str, done: int, total: int, started: float):
+    elapsed = time.perf_counter() - started
+    print(f"{label}: {done}/{total} in {elapsed:.1f}s ({done / max(elapsed, 1e-9):,.0f}/s)")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Generate a deterministic synthetic dataset")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--spots", type=int, default=1000000)
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument(
+        "--review-alpha", type=float, default=1.2, help="Pareto shape of spot popularity; lower is more skewed"
+    )
+    parser.add_argument("--max-reviews", type=int, default=5000, help="Reviews of the most popular spots")
+    parser.add_argument("--favorite-alpha", type=float, default=0.9, help="Pareto shape of favorite list sizes")
+    parser.add_argument("--max-favorites", type=int, default=5000)
+    parser.add_argument("--creator-share", type=float, default=0.2, help="Fraction of users who create spots")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Documents per insert_many")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--drop", action="store_true", help="Drop the existing collections first")
+    args = parser.parse_args()
+
+    if args.spots < 1 or args.users < 1:
+        sys.exit("--spots and --users must be positive")
+    if args.max_reviews >= 1 << 20:
+        sys.exit("--max-reviews must be below 1048576")  # Review _ids hold the review's number in 20 bits
+
+    mongodb_url = os.getenv("MONGODB_URL", "mongodb://mongo:27017/hammock_spots")
+    await connect_to_mongodb()
+    try:
+        models = [HammockSpot, User, Review, SpotCluster, SpotTombstone, Job, PhotoClaim]
+        if args.drop:
+            for model in models:
+                await model.get_motor_collection().drop()
+        elif any([
+            await model.get_motor_collection().estimated_document_count() for model in (HammockSpot, User, Review)
+        ]):
+            sys.exit("The database already has spots, users or reviews; pass --drop to replace them")
+        else:
+            # Loaded without secondary indexes; they are built once at the end
+            for model in models:
+                await model.get_motor_collection().drop_indexes()
+
+        options = {
+            "seed": args.seed,
+            "spots": args.spots,
+            "users": args.users,
+            "review_alpha": args.review_alpha,
+            "max_reviews": args.max_reviews,
+            "favorite_alpha": args.favorite_alpha,
+            "max_favorites": args.max_favorites,
+            "batch_size": args.batch_size,
+            "spot_collection": HammockSpot.get_motor_collection().name,
+            "review_collection": Review.get_motor_collection().name,
+            "user_collection": User.get_motor_collection().name,
+        }
+        offsets = creator_offsets(args.seed, args.users, args.spots, args.creator_share)
+        started = time.perf_counter()
+
+        # Spots and their reviews
+        popularity = array("d")
+        chunks = range(math.ceil(args.spots / SPOT_CHUNK))
+        review_total = 0
+        with ProcessPoolExecutor(
+            args.workers, initializer=_init_worker, initargs=(mongodb_url, options, offsets)
+        ) as pool:
+            for chunk, weights, reviews in pool.map(seed_spot_chunk, chunks):
+                popularity.extend(weights)
+                review_total += reviews
+                _report("Spots", min((chunk + 1) * SPOT_CHUNK, args.spots), args.spots, started)
+        print(f"Inserted {review_total} reviews.")
+
+        # Users, favoriting popular spots more often
+        popularity = array("d", accumulate(popularity))
+        chunks = range(math.ceil(args.users / USER_CHUNK))
+        favorite_total = 0
+        phase_started = time.perf_counter()
+        with ProcessPoolExecutor(
+            args.workers, initializer=_init_worker, initargs=(mongodb_url, options, offsets, popularity)
+        ) as pool:
+            for chunk, favorites in pool.map(seed_user_chunk, chunks):
+                favorite_total += favorites
+                _report("Users", min((chunk + 1) * USER_CHUNK, args.users), args.users, phase_started)
+        print(f"Inserted {favorite_total} favorites.")
+
+        phase_started = time.perf_counter()
+        await init_beanie(database=database.db, document_models=models)
+        print(f"Built indexes in {time.perf_counter() - phase_started:.1f}s.")
+
+        phase_started = time.perf_counter()
+        cells = await rebuild_clusters()
+        print(f"Rebuilt {cells} cluster cells in {time.perf_counter() - phase_started:.1f}s.")
+
+        print(
+            f"Seeded {args.spots} spots, {review_total} reviews and {args.users} users "
+            f"in {time.perf_counter() - started:.1f}s."
+        )
+    finally:
+        await close_mongodb_connection()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,77 @@
+# tests/test_cursor.py
+import base64
+import json
+from datetime import datetime
+import pytest
+from bson.objectid import ObjectId
+from fastapi import HTTPException
+from app.utils.helpers.cursor import (
+    NUMBER, NEXT_CURSOR_HEADER, encode_cursor, decode_cursor, build_page, next_cursor_headers
+)
+
+
+def _raw_cursor(payload) -> str:
+    """Cursor token of an arbitrary payload, as a client could craft it"""
+    raw = json.dumps(payload).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def test_round_trip_keeps_types():
+    oid = ObjectId()
+    created_at = datetime(2024, 5, 1, 12, 30, 15, 123000)
+    cursor = encode_cursor("recent", created_at, 4.25, oid)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor, "recent", (datetime, NUMBER, ObjectId)) == [created_at, 4.25, oid]
+
+
+def test_whole_float_decodes_as_number():
+    oid = ObjectId()
+    cursor = encode_cursor("rating", 4, oid)
+    assert decode_cursor(cursor, "rating", (NUMBER, ObjectId)) == [4, oid]
+
+
+@pytest.mark.parametrize("cursor", ["", "not a cursor", "!!!!", _raw_cursor([1, 2]), _raw_cursor({"k": "rating"})])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(HTTPException) as e:
+        decode_cursor(cursor, "rating", (NUMBER, ObjectId))
+    assert e.value.status_code == 400
+
+
+def test_cursor_of_other_ordering_is_rejected():
+    cursor = encode_cursor("distance", 12.5, ObjectId())
+    with pytest.raises(HTTPException) as e:
+        decode_cursor(cursor, "rating", (NUMBER, ObjectId))
+    assert e.value.status_code == 400
+    assert "sort order" in e.value.detail
+
+
+@pytest.mark.parametrize("values", [
+    [4.5],  # Too few values
+    [4.5, {"$oid": str(ObjectId())}, 1],  # Too many values
+    ["4.5", {"$oid": str(ObjectId())}],  # Wrong type
+    [{"$gt": 0}, {"$oid": str(ObjectId())}],  # Query operator smuggled in as a value
+    [4.5, str(ObjectId())],  # Untagged ObjectId
+])
+def test_cursor_with_wrong_values_is_rejected(values):
+    with pytest.raises(HTTPException) as e:
+        decode_cursor(_raw_cursor({"k": "rating", "v": values}), "rating", (NUMBER, ObjectId))
+    assert e.value.status_code == 400
+
+
+def test_build_page_with_more_results():
+    docs = [{"_id": ObjectId(), "avg_rating": 5 - i} for i in range(4)]
+    page, next_cursor = build_page(docs, 3, "rating", lambda doc: doc["avg_rating"])
+
+    assert page == docs[:3]
+    assert decode_cursor(next_cursor, "rating", (NUMBER, ObjectId)) == [3, docs[2]["_id"]]
+
+
+def test_build_page_on_last_page():
+    docs = [{"_id": ObjectId(), "avg_rating": 5 - i} for i in range(3)]
+    assert build_page(docs, 3, "rating", lambda doc: doc["avg_rating"]) == (docs, None)
+
+
+def test_next_cursor_headers():
+    assert next_cursor_headers("abc") == {NEXT_CURSOR_HEADER: "abc"}
+    assert next_cursor_headers(None) is None
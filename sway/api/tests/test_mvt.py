@@ -0,0 +1,92 @@
+# tests/test_mvt.py
+import mapbox_vector_tile
+from mapbox_vector_tile.Mapbox import vector_tile_pb2
+from app.utils.helpers.mvt import PointLayer, encode_tile
+
+
+def _decode(tile: bytes) -> dict:
+    return mapbox_vector_tile.decode(tile, default_options={"y_coord_down": True})
+
+
+def test_points_and_properties_decode():
+    layer = PointLayer("spots", 4096)
+    layer.add_point(10, 20, {
+        "id": "60d21b4667d0d8992e610c85",
+        "avg_rating": 4.5,
+        "point_count": 3,
+        "offset": -7,
+        "shade": True,
+        "name": "Lakeside grove",
+    })
+    layer.add_point(0, 4095, {"shade": False})
+
+    decoded = _decode(encode_tile([layer]))["spots"]
+    assert decoded["extent"] == 4096
+    assert decoded["version"] == 2
+    assert [f["geometry"] for f in decoded["features"]] == [
+        {"type": "Point", "coordinates": [10, 20]},
+        {"type": "Point", "coordinates": [0, 4095]},
+    ]
+    assert decoded["features"][0]["properties"] == {
+        "id": "60d21b4667d0d8992e610c85",
+        "avg_rating": 4.5,
+        "point_count": 3,
+        "offset": -7,
+        "shade": True,
+        "name": "Lakeside grove",
+    }
+    assert decoded["features"][1]["properties"] == {"shade": False}
+
+
+def test_points_in_the_buffer_keep_their_coordinates():
+    layer = PointLayer("spots", 4096)
+    layer.add_point(-64, 4160, {})
+    layer.add_point(-1, -1, {})
+
+    features = _decode(encode_tile([layer]))["spots"]["features"]
+    assert [f["geometry"]["coordinates"] for f in features] == [[-64, 4160], [-1, -1]]
+
+
+def test_none_properties_are_skipped():
+    layer = PointLayer("clusters", 4096)
+    layer.add_point(1, 2, {"point_count": 5, "id": None})
+
+    features = _decode(encode_tile([layer]))["clusters"]["features"]
+    assert features[0]["properties"] == {"point_count": 5}
+
+
+def test_keys_and_values_are_shared_but_types_kept_apart():
+    layer = PointLayer("spots", 4096)
+    layer.add_point(1, 1, {"shade": True, "point_count": 1, "avg_rating": 1.0})
+    layer.add_point(2, 2, {"shade": True, "point_count": 1, "avg_rating": 1.0})
+
+    tile = vector_tile_pb2.tile()
+    tile.ParseFromString(encode_tile([layer]))
+    raw = tile.layers[0]
+    assert list(raw.keys) == ["shade", "point_count", "avg_rating"]
+    # True, 1 and 1.0 compare equal in Python but are three different MVT values
+    assert len(raw.values) == 3
+    assert list(raw.features[0].tags) == list(raw.features[1].tags)
+
+    properties = [f["properties"] for f in _decode(tile.SerializeToString())["spots"]["features"]]
+    for value in properties:
+        assert value["shade"] is True
+        assert type(value["point_count"]) is int
+        assert type(value["avg_rating"]) is float
+
+
+def test_empty_layers_are_left_out():
+    spots = PointLayer("spots", 4096)
+    spots.add_point(1, 1, {"id": "a"})
+
+    assert set(_decode(encode_tile([spots, PointLayer("clusters", 4096)]))) == {"spots"}
+    assert encode_tile([PointLayer("spots", 4096)]) == b""
+
+
+def test_custom_extent():
+    layer = PointLayer("spots", 512)
+    layer.add_point(256, 511, {})
+
+    decoded = _decode(encode_tile([layer]))["spots"]
+    assert decoded["extent"] == 512
+    assert decoded["features"][0]["geometry"]["coordinates"] == [256, 511]
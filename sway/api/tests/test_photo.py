@@ -0,0 +1,55 @@
+# tests/test_photo.py
+import pytest
+from app.models.photo import PHOTO_SIZES, PhotoVariants, select_photo_urls
+
+BASE = "https://storage.googleapis.com/sway-app.appspot.com/photos"
+
+
+def _variants(name: str, sizes=("thumbnail", "medium", "full")) -> dict:
+    urls = {size: f"{BASE}/{name}_{size}.webp" for size in sizes}
+    return PhotoVariants(original=f"{BASE}/{name}.jpg", **urls).dict()
+
+
+@pytest.mark.parametrize("size", [s for s in PHOTO_SIZES if s != "original"])
+def test_selects_the_requested_size(size):
+    variants = [_variants("a"), _variants("b")]
+    photos = [v["original"] for v in variants]
+
+    assert select_photo_urls(photos, variants, size) == [f"{BASE}/a_{size}.webp", f"{BASE}/b_{size}.webp"]
+
+
+def test_original_size_returns_the_photos_unchanged():
+    variants = [_variants("a")]
+    photos = [variants[0]["original"]]
+    assert select_photo_urls(photos, variants, "original") is photos
+
+
+@pytest.mark.parametrize("variants", [None, []])
+def test_photos_without_variants(variants):
+    photos = [f"{BASE}/legacy.jpg"]
+    assert select_photo_urls(photos, variants, "thumbnail") == photos
+
+
+def test_falls_back_to_the_original_per_photo():
+    variants = [_variants("a"), _variants("b", sizes=("full",))]
+    photos = [f"{BASE}/a.jpg", f"{BASE}/b.jpg", f"{BASE}/legacy.jpg"]
+
+    assert select_photo_urls(photos, variants, "thumbnail") == [
+        f"{BASE}/a_thumbnail.webp",
+        f"{BASE}/b.jpg",  # No thumbnail was rendered
+        f"{BASE}/legacy.jpg",  # Uploaded before variants existed
+    ]
+
+
+def test_keeps_the_display_order_of_photos():
+    variants = [_variants("a"), _variants("b"), _variants("c")]
+    photos = [f"{BASE}/c.jpg", f"{BASE}/a.jpg", f"{BASE}/b.jpg"]
+
+    assert select_photo_urls(photos, variants, "medium") == [
+        f"{BASE}/c_medium.webp", f"{BASE}/a_medium.webp", f"{BASE}/b_medium.webp"
+    ]
+
+
+def test_variants_of_removed_photos_are_ignored():
+    variants = [_variants("a"), _variants("removed")]
+    assert select_photo_urls([f"{BASE}/a.jpg"], variants, "full") == [f"{BASE}/a_full.webp"]
@@ -0,0 +1,166 @@
+# tests/test_spot_import.py
+import asyncio
+import json
+import math
+import pytest
+from app.utils.helpers.geo import EARTH_RADIUS_METERS, haversine_meters
+from app.utils.helpers.spot_import import iter_csv_records, iter_geojson_records, _PointGrid
+
+# Chunk sizes from one byte (every token and multi-byte character split) to the whole input at once
+CHUNK_SIZES = [1, 2, 3, 7, 64, 1 << 20]
+
+
+async def _chunks(data: bytes, size: int):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+def _records(parser, data: bytes, size: int) -> list:
+    async def collect():
+        return [record async for record in parser(_chunks(data, size))]
+    return asyncio.run(collect())
+
+
+def _feature(name: str, lng: float, lat: float, **properties) -> dict:
+    return {
+        "type": "Feature",
+        "geometry": {"type": "Point", "coordinates": [lng, lat]},
+        "properties": {"name": name, **properties}
+    }
+
+
+# ---- GeoJSON ----
+
+@pytest.mark.parametrize("size", CHUNK_SIZES)
+def test_geojson_features_across_chunks(size):
+    features = [
+        _feature("Clairière près du lac", -122.4194155, 37.7749295, tree_types=["oak", "pine"]),
+        _feature("Birch hollow 🌲", 13.404954, 52.520008, amenities={"shade": True}),
+        _feature("Ridge", 151.2093, -33.8688, distance_between_trees=4.5),
+    ]
+    collection = {"type": "FeatureCollection", "name": "parks", "features": features, "crs": {"type": "name"}}
+    data = json.dumps(collection, ensure_ascii=False, indent=2).encode()
+
+    assert _records(iter_geojson_records, data, size) == list(enumerate(features, 1))
+
+
+@pytest.mark.parametrize("size", CHUNK_SIZES)
+def test_geojson_number_at_a_chunk_boundary(size):
+    data = b'{"features":[12345.678,9,-1.5e-3,2E+10]}'
+    assert _records(iter_geojson_records, data, size) == [(1, 12345.678), (2, 9), (3, -1.5e-3), (4, 2e10)]
+
+
+def test_geojson_with_byte_order_mark():
+    data = "\ufeff".encode() + json.dumps({"features": [_feature("A", 1, 2)]}).encode()
+    assert _records(iter_geojson_records, data, 2) == [(1, _feature("A", 1, 2))]
+
+
+def test_geojson_without_features():
+    assert _records(iter_geojson_records, b'{"type": "FeatureCollection", "features": []}', 4) == []
+    with pytest.raises(ValueError):
+        _records(iter_geojson_records, b'{"type": "FeatureCollection"}', 4)
+    with pytest.raises(ValueError):
+        _records(iter_geojson_records, b"{}", 4)
+
+
+@pytest.mark.parametrize("data", [b"", b"[]", b'{"features": [{"type": "Feature"}', b'{"features": [1 2]}'])
+def test_geojson_malformed(data):
+    with pytest.raises(ValueError):
+        _records(iter_geojson_records, data, 3)
+
+
+# ---- CSV ----
+
+@pytest.mark.parametrize("size", CHUNK_SIZES)
+def test_csv_rows_across_chunks(size):
+    data = (
+        "\ufeffName,Latitude,Longitude,Description\r\n"
+        'Oak grove,37.77,-122.41,"Shaded, quiet"\r\n'
+        "\r\n"
+        "Héron,48.85,2.35,\r\n"
+        "Pine,1,2,no newline at the end"
+    ).encode()
+
+    assert _records(iter_csv_records, data, size) == [
+        (1, {"name": "Oak grove", "latitude": "37.77", "longitude": "-122.41", "description": "Shaded, quiet"}),
+        (2, {"name": "Héron", "latitude": "48.85", "longitude": "2.35", "description": ""}),
+        (3, {"name": "Pine", "latitude": "1", "longitude": "2", "description": "no newline at the end"}),
+    ]
+
+
+@pytest.mark.parametrize("size", CHUNK_SIZES)
+def test_csv_multi_line_quoted_fields(size):
+    data = (
+        "name,description,latitude\n"
+        '"Oak ""grove""","first line\n\nthird line",1.5\n'
+        '"Two\nlines",,2\n'
+    ).encode()
+
+    assert _records(iter_csv_records, data, size) == [
+        (1, {"name": 'Oak "grove"', "description": "first line\n\nthird line", "latitude": "1.5"}),
+        (2, {"name": "Two\nlines", "description": "", "latitude": "2"}),
+    ]
+
+
+def test_csv_row_with_too_many_columns():
+    records = _records(iter_csv_records, b"name,latitude\nA,1,extra\nB,2\n", 5)
+
+    assert [row for row, _ in records] == [1, 2]
+    assert isinstance(records[0][1], ValueError)
+    assert records[1][1] == {"name": "B", "latitude": "2"}
+
+
+def test_csv_unterminated_quote():
+    records = _records(iter_csv_records, b'name,latitude\nA,1\n"B,2\nC,3\n', 4)
+
+    assert records[0] == (1, {"name": "A", "latitude": "1"})
+    assert records[1][0] == 2
+    assert isinstance(records[1][1], ValueError)
+
+
+# ---- Near-duplicate detection ----
+
+def _offset(lat: float, lng: float, north: float, east: float):
+    """Point the given meters north and east of (lat, lng)"""
+    return (
+        lat + math.degrees(north / EARTH_RADIUS_METERS),
+        lng + math.degrees(east / (EARTH_RADIUS_METERS * math.cos(math.radians(lat))))
+    )
+
+
+@pytest.mark.parametrize("lat,lng", [(37.77, -122.41), (0.0, 0.0), (-33.86, 151.2), (69.65, 18.95), (-0.00001, -0.00001)])
+@pytest.mark.parametrize("north,east", [(0, 0), (45, 0), (-45, 0), (0, 45), (0, -45), (30, -30), (-30, 30)])
+def test_point_grid_finds_points_within_radius(lat, lng, north, east):
+    grid = _PointGrid(50)
+    grid.add(lat, lng, "row 1")
+    other = _offset(lat, lng, north, east)
+
+    assert haversine_meters(lat, lng, *other) <= 50
+    assert grid.find(*other) == "row 1"
+
+
+@pytest.mark.parametrize("lat,lng", [(37.77, -122.41), (0.0, 0.0), (69.65, 18.95)])
+@pytest.mark.parametrize("north,east", [(60, 0), (0, -60), (40, 40), (0, 500)])
+def test_point_grid_ignores_points_outside_radius(lat, lng, north, east):
+    grid = _PointGrid(50)
+    grid.add(lat, lng, "row 1")
+
+    assert grid.find(*_offset(lat, lng, north, east)) is None
+
+
+def test_point_grid_across_cell_edges():
+    grid = _PointGrid(50)
+    edge = grid.cell * 1000  # A latitude exactly on a cell boundary
+    grid.add(edge - 1e-7, 10.0, "south")
+
+    assert grid.find(edge + 1e-7, 10.0) == "south"
+    assert grid._key(edge - 1e-7, 10.0) != grid._key(edge + 1e-7, 10.0)
+
+
+def test_point_grid_returns_a_match_among_many():
+    grid = _PointGrid(25)
+    for i in range(100):
+        grid.add(*_offset(52.5, 13.4, 0, i * 100), f"row {i + 1}")
+
+    assert grid.find(*_offset(52.5, 13.4, 10, 4210)) == "row 43"
+    assert grid.find(*_offset(52.5, 13.4, 0, 4250)) is None